@@ -4,11 +4,24 @@ Alex AI REST API
 Comprehensive API endpoints for all functionality
 """
 
-from flask import Flask, request, jsonify
+import atexit
+import os
+from datetime import datetime
+from flask import Flask, Response, request, jsonify, stream_with_context
 from job_search_system import AlexAIJobSearchSystem
 from crew_coordination_system import CrewCoordinationSystem
 from n8n_integration import N8NIntegration
 from supabase_integration import SupabaseMemoryIntegration
+from recommendations import RecommendationEngine
+from query_analytics import QueryAnalytics
+from cache_prewarm import CachePrewarmer, load_hot_queries, save_hot_queries, split_query_key
+from job_export import EXPORT_FORMATS, export_search
+from index_snapshot import IndexSnapshotter
+from shared_index import SharedIndexPublisher, SharedIndexReplica
+from tenant_indexes import TenantIndexManager, TenantQuotaExceeded
+from ranking_features import TreeEnsembleReranker
+from application_tracker import ApplicationTracker
+from llm_providers import AnthropicProvider, OpenAIProvider
 
 app = Flask(__name__)
 
@@ -17,27 +30,261 @@ job_search = AlexAIJobSearchSystem()
 crew_coord = CrewCoordinationSystem()
 n8n_integration = N8NIntegration()
 supabase_integration = SupabaseMemoryIntegration()
+# Resume tailoring calls this provider; without one it returns local match data only
+TAILORING_PROVIDERS = {'openai': OpenAIProvider, 'anthropic': AnthropicProvider}
+TAILORING_PROVIDER = os.environ.get('TAILORING_PROVIDER')
+if TAILORING_PROVIDER in TAILORING_PROVIDERS:
+    job_search.llm_provider = TAILORING_PROVIDERS[TAILORING_PROVIDER]()
+query_analytics = QueryAnalytics()
+application_tracker = ApplicationTracker(
+    os.environ.get('APPLICATIONS_DATABASE_URL') or os.environ.get('DATABASE_URL') or 'sqlite:///applications.sqlite3'
+)
+
+# With SHARED_INDEX_NAME set, one builder process publishes the index to
+# shared memory and pre-forked workers (SHARED_INDEX_ROLE=worker) read it
+# instead of each holding a copy; workers keep no local index state at all
+SHARED_INDEX_NAME = os.environ.get('SHARED_INDEX_NAME')
+SHARED_INDEX_ROLE = os.environ.get('SHARED_INDEX_ROLE', 'builder')
+SHARED_INDEX_WORKER = bool(SHARED_INDEX_NAME) and SHARED_INDEX_ROLE == 'worker'
+
+# Optional learning-to-rank model rescoring the top BM25 candidates
+RANKING_MODEL_PATH = os.environ.get('RANKING_MODEL_PATH')
+reranker = TreeEnsembleReranker.from_json(RANKING_MODEL_PATH) if RANKING_MODEL_PATH else None
+if reranker is not None and not SHARED_INDEX_WORKER:
+    job_search.set_reranker(reranker)
+
+# The builder starts from the latest index snapshot instead of re-ingesting
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', 'snapshots')
+snapshots = IndexSnapshotter(SNAPSHOT_DIR, keep=int(os.environ.get('SNAPSHOT_KEEP', '3')))
+if snapshots.latest() and not SHARED_INDEX_WORKER:
+    snapshots.restore(job_search)
+
+# Every index read below goes through search_backend
+search_backend = job_search
+if SHARED_INDEX_WORKER:
+    search_backend = SharedIndexReplica(SHARED_INDEX_NAME, reranker=reranker)
+elif SHARED_INDEX_NAME:
+    shared_index = SharedIndexPublisher(SHARED_INDEX_NAME).attach(job_search)
+    shared_index.publish(job_search)
+    atexit.register(shared_index.close)
+
+# Recommendations retrain in the background whenever new interactions arrive
+recommendations = RecommendationEngine(search_backend).start_training(
+    interval=float(os.environ.get('RECOMMENDATION_TRAIN_INTERVAL', '300'))
+)
+atexit.register(recommendations.stop_training)
+
+# Recruiting teams with private postings get isolated per-tenant indexes
+tenants = TenantIndexManager(
+    AlexAIJobSearchSystem,
+    snapshot_root=os.path.join(SNAPSHOT_DIR, 'tenants'),
+    memory_budget_bytes=int(os.environ.get('TENANT_MEMORY_BUDGET_MB', '512')) * 1024 * 1024,
+    max_concurrent_queries=int(os.environ.get('TENANT_MAX_CONCURRENT_QUERIES', '4'))
+)
+atexit.register(tenants.snapshot_all)
+
+# Hot queries survive restarts so a fresh worker can warm its search cache
+HOT_QUERIES_PATH = os.environ.get('HOT_QUERIES_PATH', 'hot_queries.json')
+PREWARM_TOP_N = int(os.environ.get('PREWARM_TOP_N', '200'))
+
+def hot_queries():
+    """Persisted plus live top queries, most frequent first"""
+    live = [split_query_key(query) for query, _ in query_analytics.top_queries(PREWARM_TOP_N)]
+    return list(dict.fromkeys(load_hot_queries(HOT_QUERIES_PATH) + live))
+
+prewarmer = CachePrewarmer(search_backend, hot_queries, top_n=PREWARM_TOP_N).attach().start()
+atexit.register(lambda: save_hot_queries(HOT_QUERIES_PATH, query_analytics.top_queries(PREWARM_TOP_N)))
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    # Report not-ready until the search cache is warm so the load balancer
+    # keeps traffic on workers that have already replayed the hot queries
+    ready = prewarmer.ready
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if ready else 'warming',
         'timestamp': datetime.now().isoformat(),
-        'version': '2.0.0'
-    })
+        'version': '2.0.0',
+        'prewarm': prewarmer.get_progress()
+    }), 200 if ready else 503
 
 @app.route('/api/v1/jobs/search', methods=['POST'])
 def search_jobs():
     """Job search endpoint"""
     data = request.get_json()
-    results = job_search.search_jobs(
+    user_id = data.get('user_id') or request.headers.get('X-User-Id')
+    query_analytics.record(
+        query=data.get('query'),
+        user_id=user_id,
+        location=data.get('location')
+    )
+    tenant_id = request.headers.get('X-Tenant-Id')
+    if tenant_id:
+        try:
+            results = tenants.search_jobs(
+                tenant_id,
+                query=data.get('query'),
+                location=data.get('location'),
+                filters=data.get('filters'),
+                user_id=user_id
+            )
+        except TenantQuotaExceeded as e:
+            return jsonify({'error': str(e), 'code': 'TENANT_QUOTA_EXCEEDED'}), 429
+        except ValueError as e:
+            return jsonify({'error': str(e), 'code': 'INVALID_TENANT'}), 400
+        return jsonify(results)
+    results = search_backend.search_jobs(
         query=data.get('query'),
         location=data.get('location'),
-        filters=data.get('filters')
+        filters=data.get('filters'),
+        user_id=user_id
     )
     return jsonify(results)
 
+@app.route('/api/v1/jobs/export', methods=['POST'])
+def export_jobs():
+    """Streaming export of every posting matching a search"""
+    data = request.get_json() or {}
+    export_format = data.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unknown export format: {export_format}", 'code': 'INVALID_FORMAT'}), 400
+    chunks = export_search(
+        search_backend,
+        query=data.get('query'),
+        location=data.get('location'),
+        filters=data.get('filters'),
+        export_format=export_format,
+        columns=data.get('columns'),
+        ranked=data.get('order') == 'relevance'
+    )
+    extension = 'csv' if export_format == 'csv' else 'ajcx'
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format], headers={
+        'Content-Disposition': f'attachment; filename="jobs.{extension}"'
+    })
+
+@app.route('/api/v1/resumes/tailor', methods=['POST'])
+def tailor_resume():
+    """Tailor a resume to a job; after an edit only the changed sections are regenerated"""
+    data = request.get_json() or {}
+    if not isinstance(data.get('job_description'), str) or not isinstance(data.get('resume'), dict):
+        return jsonify({'error': 'job_description and resume are required', 'code': 'INVALID_TAILORING'}), 400
+    result = job_search.tailor_resume(
+        data['job_description'],
+        data['resume'],
+        incremental=data.get('incremental', True)
+    )
+    return jsonify(result)
+
+@app.route('/api/v1/tenants/<tenant_id>/jobs', methods=['POST'])
+def ingest_tenant_jobs(tenant_id):
+    """Add postings to a tenant's private index"""
+    data = request.get_json() or {}
+    try:
+        result = tenants.ingest_jobs(tenant_id, data.get('jobs') or [])
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_TENANT'}), 400
+    return jsonify(result)
+
+@app.route('/api/v1/admin/tenants', methods=['GET'])
+def tenant_stats():
+    """Loaded tenants, evictions and quota rejections"""
+    return jsonify(tenants.get_stats())
+
+@app.route('/api/v1/admin/snapshots', methods=['POST'])
+def create_snapshot():
+    """Write a point-in-time snapshot of the job store and index"""
+    if SHARED_INDEX_WORKER:
+        return jsonify({'error': 'Snapshots are taken by the shared index builder', 'code': 'SHARED_INDEX_WORKER'}), 409
+    return jsonify(snapshots.snapshot(job_search))
+
+@app.route('/api/v1/admin/snapshots', methods=['GET'])
+def list_snapshots():
+    """Available index snapshots"""
+    return jsonify({
+        'latest': snapshots.latest(),
+        'snapshots': snapshots.list_snapshots(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/v1/admin/query-analytics', methods=['GET'])
+def query_analytics_report():
+    """Search traffic analytics endpoint"""
+    return jsonify(query_analytics.get_report(top=request.args.get('top', 10, type=int)))
+
+@app.route('/api/v1/jobs/recommended', methods=['GET'])
+def recommended_jobs():
+    """Personalized job recommendations endpoint"""
+    result = recommendations.recommend(
+        user_id=request.args.get('user_id'),
+        limit=request.args.get('limit', 10, type=int)
+    )
+    return jsonify(result)
+
+@app.route('/api/v1/interactions', methods=['POST'])
+def record_interaction():
+    """Record a job view, save or apply"""
+    data = request.get_json() or {}
+    # Validated up front so a bad event touches neither the recommender nor the tracker
+    if not data.get('user_id') or not data.get('job_id'):
+        return jsonify({'error': 'user_id and job_id are required', 'code': 'INVALID_EVENT'}), 400
+    try:
+        event = recommendations.record_interaction(
+            user_id=data.get('user_id'),
+            job_id=data.get('job_id'),
+            event=data.get('event')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_EVENT'}), 400
+    if not SHARED_INDEX_WORKER:
+        # Replica results are not personalized, so workers skip the embedding work
+        job_search.personalization.record_event(event['user_id'], event['job_id'], event['event'])
+    # An apply starts tracking; a repeat apply must not reset a later stage
+    if event['event'] == 'apply' and application_tracker.get_application(event['user_id'], event['job_id']) is None:
+        job = search_backend.get_job(event['job_id']) or {}
+        application_tracker.upsert([{'user_id': event['user_id'], 'job_id': event['job_id'], 'status': 'applied',
+                                     'company': job.get('company'), 'title': job.get('title')}])
+    return jsonify(event)
+
+@app.route('/api/v1/applications', methods=['POST'])
+def upsert_applications():
+    """Create or update tracked applications in bulk"""
+    data = request.get_json() or {}
+    try:
+        result = application_tracker.upsert(data.get('applications') or [])
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_APPLICATION'}), 400
+    return jsonify(result)
+
+@app.route('/api/v1/applications', methods=['GET'])
+def list_applications():
+    """A page of a user's or recruiter's applications, newest first"""
+    try:
+        result = application_tracker.list_applications(
+            user_id=request.args.get('user_id'),
+            recruiter_id=request.args.get('recruiter_id'),
+            status=request.args.getlist('status') or None,
+            limit=request.args.get('limit', 50, type=int),
+            cursor=request.args.get('cursor')
+        )
+        if request.args.get('counts'):
+            result['counts'] = application_tracker.status_counts(
+                user_id=request.args.get('user_id'), recruiter_id=request.args.get('recruiter_id')
+            )
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INVALID_QUERY'}), 400
+    return jsonify(result)
+
+@app.route('/api/v1/salaries/percentile', methods=['POST'])
+def salary_percentile():
+    """Salary percentile endpoint"""
+    data = request.get_json()
+    result = search_backend.salary_percentile(
+        title=data.get('title'),
+        location=data.get('location'),
+        salary=data.get('salary')
+    )
+    return jsonify(result)
+
 @app.route('/api/v1/crew/coordinate', methods=['POST'])
 def coordinate_crew():
     """Crew coordination endpoint"""
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Application Tracker
+SQL-backed record of the jobs each user applied to and the stage they reached
+"""
+
+import base64
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+
+from sqlalchemy import (Column, DateTime, Index, Integer, MetaData, String, Table, Text, UniqueConstraint,
+                        and_, create_engine, event, func, or_, select)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.pool import StaticPool
+
+APPLICATION_STATUSES = ('saved', 'applied', 'screening', 'interviewing', 'offer', 'hired', 'rejected',
+                        'withdrawn')
+
+# Rows per INSERT ... ON CONFLICT statement; keeps SQLite under its bound-parameter limit
+UPSERT_BATCH_SIZE = 500
+MAX_PAGE_SIZE = 500
+
+metadata = MetaData()
+
+applications = Table(
+    'applications', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('user_id', String(64), nullable=False),
+    Column('job_id', String(128), nullable=False),
+    Column('status', String(32), nullable=False),
+    Column('recruiter_id', String(64)),
+    Column('company', String(255)),
+    Column('title', String(255)),
+    Column('notes', Text),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+    UniqueConstraint('user_id', 'job_id', name='uq_applications_user_job'),
+    # "One user, one status, newest first" is read straight from the index; the
+    # primary key rides along as the pagination tie-breaker
+    Index('ix_applications_user_status_updated', 'user_id', 'status', 'updated_at'),
+    # Recruiter dashboards list every status, so status stays out of the key
+    # and a page is a short walk down the index instead of a sort of them all
+    Index('ix_applications_recruiter_updated', 'recruiter_id', 'updated_at'),
+)
+
+_UPDATABLE = ('status', 'recruiter_id', 'company', 'title', 'notes', 'updated_at')
+
+
+def _timestamp(value: Union[str, datetime]) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    # Stored naive in server-local time, like every other timestamp in the system
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def _encode_cursor(updated_at: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{updated_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        updated_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(updated_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class ApplicationTracker:
+    """Applications keyed by (user, job), with bulk upserts and keyset pagination.
+
+    Any SQLAlchemy URL works; upserts use the native ``ON CONFLICT`` of
+    SQLite and PostgreSQL. An incoming row only replaces a stored one when
+    its ``updated_at`` is not older, so replayed or out-of-order imports
+    never roll a status back. Listings page by (updated_at, id) cursors
+    rather than OFFSET, so page 200 of a 10k-row dashboard costs the same
+    as page 1.
+    """
+
+    def __init__(self, url: str = 'sqlite:///applications.sqlite3', **engine_options):
+        self.url = url
+        if url.startswith('sqlite'):
+            engine_options.setdefault('connect_args', {'check_same_thread': False})
+            if ':memory:' in url or url in ('sqlite://', 'sqlite:///'):
+                # One shared connection, or every pooled connection gets its own empty database
+                engine_options.setdefault('poolclass', StaticPool)
+        self.engine = create_engine(url, **engine_options)
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', self._configure_sqlite)
+        metadata.create_all(self.engine)
+
+    @staticmethod
+    def _configure_sqlite(connection, _record):
+        cursor = connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+    def _insert(self):
+        if self.engine.dialect.name == 'postgresql':
+            return postgresql.insert(applications)
+        if self.engine.dialect.name == 'sqlite':
+            return sqlite.insert(applications)
+        raise NotImplementedError(f"Upserts are not supported on {self.engine.dialect.name}")
+
+    @staticmethod
+    def _row(record: Dict[str, Any], now: datetime) -> Tuple[Dict[str, Any], frozenset]:
+        """Full insert row for a record, plus the columns it actually sets"""
+        if not record.get('user_id') or not record.get('job_id'):
+            raise ValueError("Applications need a user_id and a job_id")
+        status = record.get('status') or 'applied'
+        if status not in APPLICATION_STATUSES:
+            raise ValueError(f"Unknown application status: {status}")
+        row = {
+            'user_id': str(record['user_id']),
+            'job_id': str(record['job_id']),
+            'status': status,
+            'recruiter_id': record.get('recruiter_id'),
+            'company': record.get('company'),
+            'title': record.get('title'),
+            'notes': record.get('notes'),
+            'created_at': now,
+            'updated_at': _timestamp(record.get('updated_at')) if record.get('updated_at') else now,
+        }
+        # Missing keys keep their stored values; the defaults above only apply to new rows
+        present = frozenset(name for name in _UPDATABLE if name in record) | {'updated_at'}
+        return row, present
+
+    def upsert(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert or update many applications in batched statements.
+
+        Only the fields a record carries are updated on an existing
+        application, so ``{'user_id', 'job_id', 'notes'}`` changes the notes
+        and nothing else.
+        """
+        now = datetime.now()
+        latest: Dict[tuple, Tuple[Dict[str, Any], frozenset]] = {}
+        for record in records:
+            row, present = self._row(record, now)
+            key = (row['user_id'], row['job_id'])
+            # PostgreSQL rejects one statement touching a row twice, so fold
+            # repeats of a key into one row, newer fields winning
+            if key in latest:
+                stored, stored_present = latest[key]
+                older, newer = (stored, row) if row['updated_at'] >= stored['updated_at'] else (row, stored)
+                newer_present = present if newer is row else stored_present
+                row = dict(older, **{name: newer[name] for name in newer_present})
+                present = stored_present | present
+            latest[key] = (row, present)
+
+        # One statement per distinct set of updated columns
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row, present in latest.values():
+            groups.setdefault(present, []).append(row)
+        with self.engine.begin() as connection:
+            for present, rows in groups.items():
+                insert = self._insert()
+                statement = insert.on_conflict_do_update(
+                    index_elements=['user_id', 'job_id'],
+                    set_={name: insert.excluded[name] for name in _UPDATABLE if name in present},
+                    where=insert.excluded.updated_at >= applications.c.updated_at
+                )
+                for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                    connection.execute(statement, rows[start:start + UPSERT_BATCH_SIZE])
+        return {
+            'upserted': len(latest),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def get_application(self, user_id: str, job_id: str) -> Optional[Dict[str, Any]]:
+        """One user's application to one job"""
+        query = select(applications).where(applications.c.user_id == user_id, applications.c.job_id == job_id)
+        with self.engine.connect() as connection:
+            row = connection.execute(query).mappings().first()
+        return self._serialize(row) if row else None
+
+    @staticmethod
+    def _serialize(row) -> Dict[str, Any]:
+        application = dict(row)
+        application['created_at'] = application['created_at'].isoformat()
+        application['updated_at'] = application['updated_at'].isoformat()
+        return application
+
+    @staticmethod
+    def _owner_filter(user_id: str = None, recruiter_id: str = None) -> list:
+        if not user_id and not recruiter_id:
+            raise ValueError("Listing applications needs a user_id or a recruiter_id")
+        conditions = []
+        if user_id:
+            conditions.append(applications.c.user_id == user_id)
+        if recruiter_id:
+            conditions.append(applications.c.recruiter_id == recruiter_id)
+        return conditions
+
+    def list_applications(self, user_id: str = None, recruiter_id: str = None,
+                          status: Union[str, List[str]] = None, limit: int = 50,
+                          cursor: str = None) -> Dict[str, Any]:
+        """A page of applications, newest first, for a user or a recruiter.
+
+        Pass the returned ``next_cursor`` back to fetch the following page;
+        it is None on the last page.
+        """
+        conditions = self._owner_filter(user_id, recruiter_id)
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            conditions.append(applications.c.status.in_(statuses))
+        if cursor:
+            updated_at, row_id = _decode_cursor(cursor)
+            conditions.append(or_(
+                applications.c.updated_at < updated_at,
+                and_(applications.c.updated_at == updated_at, applications.c.id < row_id)
+            ))
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = (select(applications).where(*conditions)
+                 .order_by(applications.c.updated_at.desc(), applications.c.id.desc())
+                 .limit(limit + 1))
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).mappings().all()
+        page = rows[:limit]
+        next_cursor = _encode_cursor(page[-1]['updated_at'], page[-1]['id']) if len(rows) > limit else None
+        return {
+            'applications': [self._serialize(row) for row in page],
+            'next_cursor': next_cursor,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def status_counts(self, user_id: str = None, recruiter_id: str = None) -> Dict[str, int]:
+        """Applications per status for a user or a recruiter"""
+        query = (select(applications.c.status, func.count())
+                 .where(*self._owner_filter(user_id, recruiter_id))
+                 .group_by(applications.c.status))
+        with self.engine.connect() as connection:
+            return {status: count for status, count in connection.execute(query)}
+
+    def close(self):
+        """Release pooled connections"""
+        self.engine.dispose()
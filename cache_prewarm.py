@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Search Cache Prewarming
+Replays hot historical queries before a worker reports ready
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+HotQuery = Tuple[str, Optional[str]]
+
+
+def save_hot_queries(path: str, queries: List[Tuple[str, int]]):
+    """Persist (query key, count) pairs from QueryAnalytics.top_queries"""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, delete=False, suffix='.tmp') as handle:
+        json.dump([{'query': query, 'count': count} for query, count in queries], handle)
+    os.replace(handle.name, path)
+
+
+def load_hot_queries(path: str) -> List[HotQuery]:
+    """(query, location) pairs saved by ``save_hot_queries``; missing file means none"""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path) as handle:
+        entries = json.load(handle)
+    return [split_query_key(entry['query']) for entry in entries]
+
+
+def split_query_key(key: str) -> HotQuery:
+    """Undo QueryAnalytics' 'query @ location' key format"""
+    query, separator, location = key.partition(' @ ')
+    return query, (location if separator else None)
+
+
+class CachePrewarmer:
+    """Warms the search cache in a background thread.
+
+    ``state`` moves pending -> warming -> ready. Health checks should report
+    not-ready until the first warm-up completes so load balancers only route
+    traffic to warm workers. After an index refresh the hot queries are
+    replayed again; ``gate_on_refresh`` controls whether that re-warm also
+    takes the worker out of rotation.
+    """
+
+    def __init__(self, system, query_source: Callable[[], List[HotQuery]], top_n: int = 200,
+                 gate_on_refresh: bool = False):
+        self.system = system
+        self.query_source = query_source
+        self.top_n = top_n
+        self.gate_on_refresh = gate_on_refresh
+        self.state = 'pending'
+        self.ready = False
+        self.completed = 0
+        self.total = 0
+        self.errors = 0
+        self.started_at = None
+        self.finished_at = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._rerun = False
+
+    def start(self) -> 'CachePrewarmer':
+        """Begin warming in the background; returns immediately"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._rerun = True
+                return self
+            self._thread = threading.Thread(target=self._run, name='cache-prewarm', daemon=True)
+            self._thread.start()
+        return self
+
+    def attach(self) -> 'CachePrewarmer':
+        """Re-warm automatically after every index refresh"""
+        self.system.on_index_refresh(lambda _system: self._on_refresh())
+        return self
+
+    def _on_refresh(self):
+        if self.gate_on_refresh:
+            self.ready = False
+        self.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the current warm-up finishes"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.ready
+
+    def _run(self):
+        while True:
+            self._warm()
+            with self._lock:
+                if not self._rerun:
+                    self._thread = None
+                    return
+                self._rerun = False
+
+    def _warm(self):
+        self.state = 'warming'
+        self.started_at = time.time()
+        try:
+            queries = list(self.query_source())[:self.top_n]
+        except Exception:
+            queries = []
+            self.errors += 1
+        self.total = len(queries)
+        self.completed = 0
+        for query, location in queries:
+            try:
+                self.system.search_jobs(query, location=location)
+            except Exception:
+                self.errors += 1
+            self.completed += 1
+        self.finished_at = time.time()
+        self.state = 'ready'
+        self.ready = True
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Progress for /health and dashboards"""
+        return {
+            'state': self.state,
+            'ready': self.ready,
+            'completed': self.completed,
+            'total': self.total,
+            'percent': round(100.0 * self.completed / self.total, 1) if self.total else (100.0 if self.ready else 0.0),
+            'errors': self.errors,
+            'duration_seconds': round(self.finished_at - self.started_at, 3)
+            if self.finished_at and self.started_at and self.finished_at >= self.started_at else None,
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Company Entity Resolution
+Collapses spelling variants of company names into interned company ids
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Any, Optional
+
+LEGAL_SUFFIXES = frozenset([
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'llp', 'lp',
+    'ltd', 'limited', 'plc', 'gmbh', 'ag', 'sa', 'sas', 'bv', 'nv', 'pty', 'oy', 'ab',
+])
+
+# Filter spellings remembered by lookup(); cleared whenever a company is added
+LOOKUP_CACHE_SIZE = 4096
+
+_NON_ALNUM = re.compile(r"[^a-z0-9&]+")
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+
+def normalize_company(name: str) -> str:
+    """Blocking key: lowercase, ASCII-folded, punctuation and legal suffixes removed"""
+    text = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii').lower()
+    tokens = [t for t in _NON_ALNUM.sub(' ', text.replace('&', ' & ')).split() if t]
+    if tokens and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def soundex(text: str) -> str:
+    """American Soundex of the letters in ``text``"""
+    letters = [c for c in text.lower() if c.isalpha()]
+    if not letters:
+        return text[:4]
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def jaro_winkler(left: str, right: str, prefix_scale: float = 0.1) -> float:
+    """Jaro-Winkler similarity in [0, 1]"""
+    if left == right:
+        return 1.0
+    if not left or not right:
+        return 0.0
+    window = max(len(left), len(right)) // 2 - 1
+    left_matched = [False] * len(left)
+    right_matched = [False] * len(right)
+    matches = 0
+    for i, char in enumerate(left):
+        for j in range(max(0, i - window), min(len(right), i + window + 1)):
+            if not right_matched[j] and right[j] == char:
+                left_matched[i] = right_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    transpositions, j = 0, 0
+    for i, char in enumerate(left):
+        if left_matched[i]:
+            while not right_matched[j]:
+                j += 1
+            if char != right[j]:
+                transpositions += 1
+            j += 1
+    jaro = (matches / len(left) + matches / len(right) + (matches - transpositions / 2) / matches) / 3
+    prefix = 0
+    for a, b in zip(left[:4], right[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+class CompanyResolver:
+    """Incremental company resolution with blocking.
+
+    Each new name is normalized; an exact key match reuses the existing id.
+    Otherwise it is compared only against canonical keys in its block
+    (Soundex code plus compact length, and the adjacent lengths), so work
+    per name is bounded by block size rather than the number of companies.
+    A full block spills into sub-blocks keyed by the last two characters;
+    names that still do not fit are counted in ``block_overflows`` and are
+    only ever matched exactly.
+    """
+
+    def __init__(self, threshold: float = 0.93, max_block_size: int = 64):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.names: List[str] = []
+        self.keys: List[str] = []
+        self._by_raw: Dict[str, int] = {}
+        self._by_key: Dict[str, int] = {}
+        self._blocks: Dict[tuple, List[int]] = {}
+        self._lookups: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self.comparisons = 0
+        self.block_overflows = 0
+
+    @staticmethod
+    def _block_key(key: str) -> tuple:
+        compact = key.replace(' ', '')
+        return soundex(compact), len(compact)
+
+    def _place(self, company_id: int, key: str):
+        block_key = self._block_key(key)
+        for candidate in (block_key, block_key + (key.replace(' ', '')[-2:],)):
+            block = self._blocks.setdefault(candidate, [])
+            if len(block) < self.max_block_size:
+                block.append(company_id)
+                return
+        self.block_overflows += 1
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Interned company id for a raw company name"""
+        if not name:
+            return None
+        company_id = self._by_raw.get(name)
+        if company_id is not None:
+            return company_id
+        key = normalize_company(name)
+        with self._lock:
+            company_id = self._by_key.get(key)
+            if company_id is None:
+                company_id = self._match_block(key)
+            if company_id is None:
+                company_id = len(self.names)
+                self.names.append(name.strip())
+                self.keys.append(key)
+                self._place(company_id, key)
+                # A name that matched nothing before may match the new company
+                self._lookups.clear()
+            self._by_key[key] = company_id
+            self._by_raw[name] = company_id
+        return company_id
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Company id a name resolves to, without interning it; None if it matches no known company.
+
+        For read paths such as search filters, where arbitrary user input
+        must not grow or reshape the company table.
+        """
+        if not name:
+            return None
+        company_id = self._by_raw.get(name)
+        if company_id is not None:
+            return company_id
+        if name in self._lookups:
+            return self._lookups[name]
+        key = normalize_company(name)
+        with self._lock:
+            company_id = self._by_key.get(key)
+            if company_id is None:
+                company_id = self._match_block(key)
+            if len(self._lookups) >= LOOKUP_CACHE_SIZE:
+                self._lookups.clear()
+            self._lookups[name] = company_id
+        return company_id
+
+    def _match_block(self, key: str) -> Optional[int]:
+        best_id, best_score = None, self.threshold
+        code, length = self._block_key(key)
+        tail = key.replace(' ', '')[-2:]
+        # A single typo moves the length by at most one, so scan neighbouring blocks too
+        for neighbour in (length, length - 1, length + 1):
+            for block_key in ((code, neighbour), (code, neighbour, tail)):
+                for candidate in self._blocks.get(block_key, ()):
+                    self.comparisons += 1
+                    score = jaro_winkler(key, self.keys[candidate])
+                    if score >= best_score:
+                        best_id, best_score = candidate, score
+        return best_id
+
+    def resolve_many(self, names: List[str]) -> List[Optional[int]]:
+        """Resolve a batch of names"""
+        return [self.resolve(name) for name in names]
+
+    def canonical_name(self, company_id: int) -> Optional[str]:
+        """Display name (first spelling seen) for a company id"""
+        return self.names[company_id] if company_id is not None and company_id < len(self.names) else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable resolver state"""
+        with self._lock:
+            return {
+                'threshold': self.threshold,
+                'max_block_size': self.max_block_size,
+                'names': list(self.names),
+                'keys': list(self.keys),
+                'by_raw': dict(self._by_raw),
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompanyResolver':
+        """Rebuild a resolver produced by ``to_dict``; blocks are re-derived from keys"""
+        resolver = cls(data['threshold'], data['max_block_size'])
+        resolver.names = list(data['names'])
+        resolver.keys = list(data['keys'])
+        resolver._by_raw = dict(data['by_raw'])
+        for company_id, key in enumerate(resolver.keys):
+            resolver._by_key.setdefault(key, company_id)
+            resolver._place(company_id, key)
+        for name, company_id in resolver._by_raw.items():
+            resolver._by_key.setdefault(normalize_company(name), company_id)
+        return resolver
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Resolution counters"""
+        return {
+            'companies': len(self.names),
+            'spellings': len(self._by_raw),
+            'blocks': len(self._blocks),
+            'comparisons': self.comparisons,
+            'block_overflows': self.block_overflows
+        }
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Cover Letter Generation
+Batched cover letters that share per-resume prompt prefixes and cached resume summaries
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from llm_providers import LLMProvider, TransientLLMError, estimate_tokens
+from tailoring_cache import resume_hash, tailoring_cache_key
+from tailoring_pipeline import RateLimiter, backoff_delay
+
+# Bump whenever the cover letter prompt changes so cached letters are not reused
+COVER_LETTER_PROMPT_VERSION = "1"
+
+# Everything that depends only on the resume comes first, so every letter for
+# one candidate starts with the same tokens and providers can reuse the prefix
+COVER_LETTER_PREFIX = """You are an expert career writer. Write a concise, specific cover letter (under 350 words) from the candidate below to the hiring team for the job that follows.
+Keep every claim truthful and grounded in the candidate summary. Respond with the letter text only.
+
+Candidate summary:
+{resume_summary}
+"""
+
+COVER_LETTER_JOB = """
+Job: {title} at {company}
+
+Job description:
+{job_description}
+"""
+
+SUMMARY_ROLES = 3
+SUMMARY_SKILLS = 15
+
+
+def summarize_resume(resume_data: Dict) -> str:
+    """Compact candidate summary: headline, top skills and most recent roles"""
+    lines = []
+    if resume_data.get('name'):
+        lines.append(f"Name: {resume_data['name']}")
+    if resume_data.get('summary'):
+        lines.append(f"Profile: {' '.join(str(resume_data['summary']).split())}")
+    skills = [str(skill) for skill in resume_data.get('skills') or []][:SUMMARY_SKILLS]
+    if skills:
+        lines.append(f"Skills: {', '.join(skills)}")
+    for role in (resume_data.get('experience') or [])[:SUMMARY_ROLES]:
+        if isinstance(role, dict):
+            heading = ' at '.join(part for part in (role.get('title'), role.get('company')) if part)
+            detail = ' '.join(str(role.get('description') or '').split())
+            lines.append(f"- {heading}: {detail}" if detail else f"- {heading}")
+        else:
+            lines.append(f"- {role}")
+    return '\n'.join(lines)
+
+
+class CoverLetterPipeline:
+    """Generates cover letters for many (job, resume) pairs in few provider calls.
+
+    Each resume is summarized once and its prompt prefix (instructions plus
+    summary) is rendered and token-counted once, then reused for every job
+    it is paired with. Pending letters are grouped by resume so shared
+    prefixes sit next to each other, and sent ``max_batch_size`` prompts at
+    a time through the provider's batch call, capped at ``max_batch_tokens``
+    estimated prompt tokens per batch. Batches respect the provider's rate
+    limit. When a batch call fails, its prompts are retried one by one with
+    the same jittered backoff as BatchTailoringPipeline, so one bad prompt
+    or transient error only fails the letters it affects. Finished letters
+    go to the system's tailoring cache when it has one.
+    """
+
+    def __init__(self, system, provider: LLMProvider = None, max_batch_size: int = 16,
+                 max_batch_tokens: int = 32000, cache_size: int = 10000, max_retries: int = 4,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        self.system = system
+        self.provider = provider or system.llm_provider
+        if self.provider is None:
+            raise ValueError("CoverLetterPipeline requires an LLM provider")
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.cache_size = cache_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiter = RateLimiter(self.provider.requests_per_second) if self.provider.requests_per_second else None
+        # resume hash -> (rendered prefix, its token count)
+        self._prefixes: 'OrderedDict[str, Tuple[str, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'requested': 0,
+            'generated': 0,
+            'failed': 0,
+            'cache_hits': 0,
+            'summary_hits': 0,
+            'summary_misses': 0,
+            'batches': 0,
+            'retries': 0,
+            'prompt_tokens': 0,
+            'shared_prefix_tokens': 0,
+        }
+
+    def prefix(self, resume_data: Dict, key: str = None) -> Tuple[str, int]:
+        """Rendered prompt prefix for a resume and its token count, cached per resume"""
+        key = key or resume_hash(resume_data)
+        with self._lock:
+            cached = self._prefixes.get(key)
+            if cached is not None:
+                self._prefixes.move_to_end(key)
+                self.stats['summary_hits'] += 1
+                return cached
+            self.stats['summary_misses'] += 1
+        text = COVER_LETTER_PREFIX.format(resume_summary=summarize_resume(resume_data))
+        entry = (text, estimate_tokens(text))
+        with self._lock:
+            self._prefixes[key] = entry
+            while len(self._prefixes) > self.cache_size:
+                self._prefixes.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def job_section(job_description: str, company: str = None, title: str = None) -> str:
+        """The per-job part of the prompt"""
+        return COVER_LETTER_JOB.format(title=title or 'the open role', company=company or 'the company',
+                                       job_description=(job_description or '').strip())
+
+    def build_prompt(self, job_description: str, resume_data: Dict, company: str = None,
+                     title: str = None) -> str:
+        """Full cover letter prompt for one pair"""
+        return self.prefix(resume_data)[0] + self.job_section(job_description, company, title)
+
+    def _cache_key(self, item: Dict[str, Any]) -> str:
+        job_text = json.dumps([item.get('company'), item.get('title'), item['job_description']])
+        return tailoring_cache_key(self.provider.model, f"cover-letter-{COVER_LETTER_PROMPT_VERSION}",
+                                   job_text, item['resume_data'])
+
+    def _lookup(self, key: str) -> Optional[str]:
+        cached = self.system.tailoring_cache.get(key)
+        return cached.get('cover_letter') if cached else None
+
+    def _store(self, key: Optional[str], letter: str):
+        if key is not None:
+            self.system.tailoring_cache.put(key, {'cover_letter': letter})
+
+    def _batches(self, pending: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        batches, batch, batch_tokens = [], [], 0
+        for item in pending:
+            tokens = item['prefix_tokens'] + item['job_tokens']
+            if batch and (len(batch) >= self.max_batch_size or batch_tokens + tokens > self.max_batch_tokens):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(item)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _throttle(self, count: int):
+        if self._limiter is not None:
+            self._limiter.acquire(count)
+
+    def _complete_one(self, prompt: str) -> Union[str, Exception]:
+        attempt = 0
+        while True:
+            self._throttle(1)
+            try:
+                return self.provider.complete(prompt)
+            except TransientLLMError as e:
+                if attempt >= self.max_retries:
+                    return e
+            except Exception as e:
+                return e
+            time.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+            attempt += 1
+            self.stats['retries'] += 1
+
+    def _complete_batch(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        """Completion or error per prompt; a failed batch call falls back to single calls"""
+        self._throttle(len(prompts))
+        try:
+            return self.provider.complete_batch(prompts)
+        except Exception:
+            # The batch call does not say which prompt failed
+            return [self._complete_one(prompt) for prompt in prompts]
+
+    def generate(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cover letters for {'job_description', 'resume_data', 'company', 'title'} requests, in order.
+
+        Failures are reported per letter, not raised.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        # prompt -> indexes of identical requests waiting on it
+        waiting: Dict[str, List[int]] = {}
+        pending = []
+        for index, item in enumerate(requests):
+            self.stats['requested'] += 1
+            key = self._cache_key(item) if self.system.tailoring_cache is not None else None
+            letter = self._lookup(key) if key else None
+            result = {
+                'company': item.get('company'),
+                'title': item.get('title'),
+                'job_description': item['job_description'],
+                'provider': self.provider.name,
+            }
+            if letter is not None:
+                self.stats['cache_hits'] += 1
+                results[index] = dict(result, cover_letter=letter, status='cached')
+                continue
+            results[index] = result
+            resume_key = resume_hash(item['resume_data'])
+            prefix, prefix_tokens = self.prefix(item['resume_data'], resume_key)
+            job_section = self.job_section(item['job_description'], item.get('company'), item.get('title'))
+            prompt = prefix + job_section
+            if prompt in waiting:
+                waiting[prompt].append(index)
+                continue
+            waiting[prompt] = [index]
+            pending.append({'prompt': prompt, 'resume_key': resume_key, 'cache_key': key,
+                            'prefix_tokens': prefix_tokens, 'job_tokens': estimate_tokens(job_section)})
+
+        # Stable sort keeps request order within each resume's group
+        pending.sort(key=lambda item: item['resume_key'])
+        for batch in self._batches(pending):
+            self.stats['batches'] += 1
+            self.stats['prompt_tokens'] += sum(item['prefix_tokens'] + item['job_tokens'] for item in batch)
+            prefixes = {}
+            for item in batch:
+                prefixes.setdefault(item['resume_key'], []).append(item['prefix_tokens'])
+            self.stats['shared_prefix_tokens'] += sum(sum(tokens[1:]) for tokens in prefixes.values())
+            completions = self._complete_batch([item['prompt'] for item in batch])
+            for item, completion in zip(batch, completions):
+                if isinstance(completion, Exception):
+                    for index in waiting[item['prompt']]:
+                        self.stats['failed'] += 1
+                        results[index].update({'status': 'failed', 'error': str(completion)})
+                    continue
+                letter = (completion or '').strip()
+                self._store(item['cache_key'], letter)
+                for index in waiting[item['prompt']]:
+                    self.stats['generated'] += 1
+                    results[index].update({'cover_letter': letter, 'status': 'generated'})
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request, batching and prefix-sharing counters"""
+        with self._lock:
+            cached_summaries = len(self._prefixes)
+        return dict(self.stats, cached_summaries=cached_summaries, timestamp=datetime.now().isoformat())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Job Description Compaction
+Strips boilerplate and trims job descriptions to a token budget before they reach an LLM prompt
+"""
+
+import hashlib
+import json
+import re
+import threading
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from job_normalization import SKILL_SYNONYMS, TermNormalizer, get_normalizer, tokenize
+from llm_providers import estimate_tokens
+
+# Bump whenever the compaction rules change; it is part of the tailoring cache key
+COMPACTION_VERSION = "2"
+
+# Sentences containing any of these phrases carry nothing a tailored resume
+# can use, unless they also mention a skill or requirement. Phrases are
+# multi-word on purpose: "dental" alone would gut a posting for a dental
+# hygienist.
+BOILERPLATE_PHRASES = {
+    'equal_opportunity': [
+        'equal opportunity employer', 'equal employment opportunity', 'affirmative action',
+        'without regard to race', 'regardless of race', 'sexual orientation', 'gender identity',
+        'national origin', 'protected veteran', 'veteran status', 'genetic information',
+        'reasonable accommodation', 'reasonable accommodations', 'e-verify', 'pay transparency',
+        'arrest and conviction records', 'criminal histories', 'background check', 'drug screen',
+    ],
+    'benefits': [
+        '401 k', '401k match', 'health insurance', 'medical dental', 'dental and vision', 'vision insurance',
+        'life insurance', 'disability insurance', 'paid time off', 'unlimited pto', 'generous pto',
+        'parental leave', 'family leave', 'paid holidays', 'wellness stipend', 'commuter benefits',
+        'employee stock purchase', 'flexible spending', 'tuition reimbursement', 'learning stipend',
+        'unlimited vacation', 'free lunch', 'catered lunches', 'gym membership', 'competitive salary',
+        'competitive compensation', 'comprehensive benefits', 'competitive benefits', 'benefits package',
+    ],
+    'application': [
+        'recruitment agencies', 'recruiting agencies', 'unsolicited resumes', 'privacy notice',
+        'privacy policy', 'applicant privacy', 'click apply', 'apply now', 'to apply please',
+        'we look forward to hearing from you', 'visa sponsorship is not available',
+    ],
+}
+
+# Words marking a sentence as a requirement or responsibility
+REQUIREMENT_CUES = frozenset([
+    'require', 'required', 'requirement', 'must', 'experience', 'proficient', 'proficiency',
+    'responsible', 'responsibility', 'qualification', 'degree', 'year', 'knowledge', 'skill',
+    'ability', 'familiarity', 'expertise', 'design', 'build', 'lead', 'own', 'develop',
+])
+
+SKILL_WEIGHT = 3.0
+RESUME_TERM_WEIGHT = 2.0
+CUE_WEIGHT = 1.0
+DEFAULT_TOKEN_BUDGET = 600
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9•*-])|\s*\n+\s*|\s+[•·]\s+")
+_BULLET_PREFIX = re.compile(r"^[•·*\-–]+\s*")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences and bullet lines of a job description, in order"""
+    sentences = []
+    for piece in _SENTENCE_PATTERN.split(text or ''):
+        piece = _BULLET_PREFIX.sub('', piece.strip())
+        if piece:
+            sentences.append(piece)
+    return sentences
+
+
+def _is_header(sentence: str) -> bool:
+    return sentence.endswith(':') and len(sentence.split()) <= 4
+
+
+class PhraseMatcher:
+    """Token-level trie over phrases, compiled once; matching is one left-to-right pass"""
+
+    def __init__(self, phrases: Dict[str, Iterable[str]]):
+        self._root = {}
+        for label, variants in phrases.items():
+            for phrase in variants:
+                node = self._root
+                for token in tokenize(phrase):
+                    node = node.setdefault(token, {})
+                node[None] = label
+
+    def find(self, tokens: List[str]) -> Optional[str]:
+        """Label of the first phrase occurring in ``tokens``, or None"""
+        root = self._root
+        for start, token in enumerate(tokens):
+            node = root.get(token)
+            cursor = start + 1
+            while node is not None:
+                if None in node:
+                    return node[None]
+                if cursor == len(tokens):
+                    break
+                node = node.get(tokens[cursor])
+                cursor += 1
+        return None
+
+
+class DescriptionCompactor:
+    """Shrinks job descriptions for LLM prompts.
+
+    Sentences matching a boilerplate phrase (EEO statements, benefits
+    lists, application instructions) are dropped unless they mention a
+    skill or requirement ("Must pass a background check" stays). The rest
+    are scored by
+    skill mentions, requirement wording and, when a resume is given, overlap
+    with the resume's terms; the best are kept, in their original order,
+    until ``token_budget`` estimated tokens are used.
+    """
+
+    def __init__(self, normalizer: TermNormalizer = None, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 boilerplate: Dict[str, Iterable[str]] = None):
+        self.normalizer = normalizer or get_normalizer()
+        self.token_budget = token_budget
+        boilerplate = boilerplate or BOILERPLATE_PHRASES
+        self.matcher = PhraseMatcher(boilerplate)
+        self._boilerplate_digest = hashlib.sha256(json.dumps(
+            {label: sorted(phrases) for label, phrases in boilerplate.items()}, sort_keys=True
+        ).encode('utf-8')).hexdigest()[:16]
+        self.skills = frozenset(SKILL_SYNONYMS)
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'original_tokens': 0, 'compacted_tokens': 0, 'boilerplate_sentences': 0}
+
+    @property
+    def fingerprint(self) -> str:
+        """Rules version, budget and boilerplate set; prompts differ whenever this does"""
+        return f"{COMPACTION_VERSION}:{self.token_budget}:{self._boilerplate_digest}"
+
+    def _hits(self, terms: List[str]) -> Tuple[int, int]:
+        """(skill mentions, requirement cue words) among canonical terms"""
+        text = ' %s ' % ' '.join(terms)
+        skills = sum(1 for skill in self.skills if f' {skill} ' in text)
+        return skills, sum(1 for term in terms if term in REQUIREMENT_CUES)
+
+    def is_boilerplate(self, sentence: str) -> bool:
+        """Matches a boilerplate phrase and mentions no skill or requirement"""
+        if self.matcher.find(tokenize(sentence)) is None:
+            return False
+        return self._hits(self.normalizer.canonical_terms(sentence)) == (0, 0)
+
+    def score(self, sentence: str, resume_terms: Set[str] = frozenset()) -> float:
+        """Relevance of one sentence to resume tailoring"""
+        terms = self.normalizer.canonical_terms(sentence)
+        if not terms:
+            return 0.0
+        skills, cues = self._hits(terms)
+        overlap = len(resume_terms.intersection(terms))
+        return SKILL_WEIGHT * skills + CUE_WEIGHT * min(cues, 3) + RESUME_TERM_WEIGHT * overlap
+
+    @staticmethod
+    def _select(scored: List[Tuple[int, str, int, float]], budget: int) -> List[int]:
+        headers = {index: tokens for index, sentence, tokens, _ in scored if _is_header(sentence)}
+        kept, used = set(), 0
+        # Highest score first; earlier sentences win ties
+        for index, _, tokens, _ in sorted(scored, key=lambda item: (-item[3], item[0])):
+            if index not in headers and used + tokens <= budget:
+                kept.add(index)
+                used += tokens
+        # A section heading survives only above a kept line of its own section
+        for index, tokens in headers.items():
+            if index + 1 in kept and used + tokens <= budget:
+                kept.add(index)
+                used += tokens
+        return sorted(kept)
+
+    @staticmethod
+    def _truncate(sentence: str, budget: int) -> str:
+        words, used = [], 0
+        for word in sentence.split():
+            used += estimate_tokens(word)
+            if used > budget:
+                break
+            words.append(word)
+        return ' '.join(words)
+
+    def compact(self, job_description: str, resume_terms: Iterable[str] = (),
+                token_budget: int = None) -> Dict[str, Any]:
+        """Compacted description plus token accounting for one prompt"""
+        budget = self.token_budget if token_budget is None else token_budget
+        text = (job_description or '').strip()
+        original_tokens = estimate_tokens(text)
+        boilerplate = 0
+        if original_tokens <= budget and self.matcher.find(tokenize(text)) is None:
+            compacted, dropped = text, 0
+        else:
+            resume_terms = set(resume_terms)
+            scored = []
+            sentences = split_sentences(text)
+            for index, sentence in enumerate(sentences):
+                if self.is_boilerplate(sentence):
+                    boilerplate += 1
+                    continue
+                scored.append((index, sentence, estimate_tokens(sentence), self.score(sentence, resume_terms)))
+            kept = self._select(scored, budget)
+            compacted = '\n'.join(sentences[index] for index in kept)
+            if not kept and scored:
+                # Every sentence alone is over budget: keep the head of the best one
+                compacted = self._truncate(max(scored, key=lambda item: (item[3], -item[0]))[1], budget)
+            dropped = len(scored) - len(kept)
+        compacted_tokens = estimate_tokens(compacted)
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['original_tokens'] += original_tokens
+            self.stats['compacted_tokens'] += compacted_tokens
+            self.stats['boilerplate_sentences'] += boilerplate
+        return {
+            'text': compacted,
+            'original_tokens': original_tokens,
+            'compacted_tokens': compacted_tokens,
+            'tokens_saved': original_tokens - compacted_tokens,
+            'boilerplate_sentences': boilerplate,
+            'dropped_sentences': dropped,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cumulative token savings"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['tokens_saved'] = stats['original_tokens'] - stats['compacted_tokens']
+        return stats
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Index Snapshots
+Atomic, checksummed point-in-time dumps of the job store and search index
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from company_resolution import CompanyResolver
+from ranking_features import FeatureStore
+from salary_normalization import SalaryRangeIndex
+from salary_statistics import SalarySketchStore
+
+# Bump when the snapshot layout changes; restoring an older layout then fails
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+LATEST = 'LATEST'
+SNAPSHOT_PREFIX = 'snapshot-'
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, incompatible or corrupt"""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_file(path: str, payload: bytes):
+    with open(path, 'wb') as handle:
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _fsync_directory(path: str):
+    try:
+        descriptor = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+class IndexSnapshotter:
+    """Writes and restores versioned snapshots under ``root``.
+
+    Each snapshot is a directory ``snapshot-<generation>-<millis>`` holding
+    the pickled job store, the pickled index and a manifest with SHA-256
+    checksums. It is written to a temporary directory and renamed into
+    place, then ``LATEST`` is atomically repointed, so readers only ever
+    see complete snapshots. State is serialized under the system's index
+    lock, giving a consistent point-in-time view while ingest continues.
+    """
+
+    def __init__(self, root: str, keep: int = 3):
+        self.root = root
+        self.keep = keep
+        os.makedirs(root, exist_ok=True)
+
+    def _capture(self, system) -> Dict[str, bytes]:
+        with system.index_lock:
+            store = {
+                'job_database': system.job_database,
+                'job_ids': system.job_ids,
+            }
+            index = {
+                'job_index': system.job_index,
+                'doc_lengths': system.doc_lengths,
+                'total_terms': system.total_terms,
+                'companies': system.companies.to_dict(),
+                'salary_sketches': system.salary_sketches.to_dict(),
+            }
+            generation = system.index_generation
+            return {
+                'store.pkl': pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL),
+                'index.pkl': pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL),
+                'generation': generation,
+                'documents': len(system.job_database),
+            }
+
+    def snapshot(self, system) -> Dict[str, Any]:
+        """Write a new snapshot and make it the latest"""
+        started = time.time()
+        captured = self._capture(system)
+        generation = captured.pop('generation')
+        documents = captured.pop('documents')
+        name = f"{SNAPSHOT_PREFIX}{generation:012d}-{int(started * 1000)}"
+
+        staging = tempfile.mkdtemp(prefix='.tmp-', dir=self.root)
+        try:
+            files = {}
+            for filename, payload in captured.items():
+                path = os.path.join(staging, filename)
+                _write_file(path, payload)
+                files[filename] = {'sha256': hashlib.sha256(payload).hexdigest(), 'bytes': len(payload)}
+            manifest = {
+                'format_version': SNAPSHOT_FORMAT_VERSION,
+                'generation': generation,
+                'documents': documents,
+                'created_at': datetime.now().isoformat(),
+                'files': files,
+            }
+            _write_file(os.path.join(staging, MANIFEST), json.dumps(manifest, indent=2).encode('utf-8'))
+            _fsync_directory(staging)
+            os.rename(staging, os.path.join(self.root, name))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._point_latest(name)
+        self.prune()
+        return {
+            'snapshot': name,
+            'generation': generation,
+            'documents': documents,
+            'bytes': sum(entry['bytes'] for entry in files.values()),
+            'seconds': round(time.time() - started, 3),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _point_latest(self, name: str):
+        with tempfile.NamedTemporaryFile('w', dir=self.root, delete=False, prefix='.tmp-') as handle:
+            handle.write(name)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(handle.name, os.path.join(self.root, LATEST))
+        _fsync_directory(self.root)
+
+    def list_snapshots(self) -> List[str]:
+        """Complete snapshot directories, oldest first"""
+        names = [name for name in os.listdir(self.root)
+                 if name.startswith(SNAPSHOT_PREFIX)
+                 and os.path.exists(os.path.join(self.root, name, MANIFEST))]
+        return sorted(names)
+
+    def latest(self) -> Optional[str]:
+        """Name of the snapshot ``LATEST`` points at, or the newest on disk"""
+        pointer = os.path.join(self.root, LATEST)
+        if os.path.exists(pointer):
+            with open(pointer) as handle:
+                name = handle.read().strip()
+            if os.path.exists(os.path.join(self.root, name, MANIFEST)):
+                return name
+        snapshots = self.list_snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def prune(self):
+        """Delete all but the newest ``keep`` snapshots"""
+        latest = self.latest()
+        for name in self.list_snapshots()[:-self.keep or None]:
+            if name != latest:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def _load_manifest(self, name: str) -> Dict[str, Any]:
+        with open(os.path.join(self.root, name, MANIFEST)) as handle:
+            manifest = json.load(handle)
+        if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"Snapshot {name} has unsupported format {manifest.get('format_version')}")
+        return manifest
+
+    def _read(self, name: str, filename: str, entry: Dict[str, Any], verify: bool) -> Any:
+        path = os.path.join(self.root, name, filename)
+        with open(path, 'rb') as handle:
+            payload = handle.read()
+        if len(payload) != entry['bytes'] or (verify and hashlib.sha256(payload).hexdigest() != entry['sha256']):
+            raise SnapshotError(f"Checksum mismatch in {name}/{filename}")
+        return pickle.loads(payload)
+
+    def verify(self, name: str = None) -> bool:
+        """Check every file of a snapshot against its manifest"""
+        name = name or self.latest()
+        if name is None:
+            return False
+        manifest = self._load_manifest(name)
+        return all(_sha256(os.path.join(self.root, name, filename)) == entry['sha256']
+                   for filename, entry in manifest['files'].items())
+
+    def restore(self, system, name: str = None, verify: bool = True) -> Dict[str, Any]:
+        """Replace the system's job store and index with a snapshot"""
+        started = time.time()
+        name = name or self.latest()
+        if name is None:
+            raise SnapshotError(f"No snapshot found in {self.root}")
+        manifest = self._load_manifest(name)
+        store = self._read(name, 'store.pkl', manifest['files']['store.pkl'], verify)
+        index = self._read(name, 'index.pkl', manifest['files']['index.pkl'], verify)
+
+        with system.index_lock:
+            system.job_database = store['job_database']
+            system.job_ids = store['job_ids']
+            system.job_index = index['job_index']
+            system.doc_lengths = index['doc_lengths']
+            system.total_terms = index['total_terms']
+            system.companies = CompanyResolver.from_dict(index['companies'])
+            system.salary_sketches = SalarySketchStore.from_dict(index['salary_sketches'], system.normalizer)
+            # Bitsets are re-encoded so they agree with this worker's vocabulary
+            system.job_skill_bits = [system.skill_vocabulary.bitset(job['canonical_skills'])
+                                     for job in system.job_database]
+            system.features = FeatureStore(max(len(system.job_database), 1))
+            system.salary_index = SalaryRangeIndex()
+            for doc_id, job in enumerate(system.job_database):
+                salary = system._posting_salary(job)
+                system.features.append(doc_id, job, salary)
+                if salary is not None and 'salary_min_usd' in job:
+                    system.salary_index.add(doc_id, job['salary_min_usd'], job['salary_max_usd'])
+            # Embeddings were computed from the replaced job store
+            system.personalization.reset()
+            # Never reuse a generation the search cache may already hold results for
+            system.index_generation = max(system.index_generation + 1, manifest['generation'])
+        system.notify_index_refresh()
+        return {
+            'snapshot': name,
+            'generation': system.index_generation,
+            'documents': len(system.job_database),
+            'verified': verify,
+            'seconds': round(time.time() - started, 3),
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Job Export
+Streams search results and job snapshots as chunked CSV or a columnar binary format
+"""
+
+import argparse
+import csv
+import io
+import json
+import struct
+import sys
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+
+import numpy as np
+
+DEFAULT_COLUMNS = [
+    'id', 'title', 'company', 'company_id', 'location', 'remote',
+    'salary_min_usd', 'salary_max_usd', 'salary_min', 'salary_max', 'canonical_title', 'canonical_skills',
+    'score',
+]
+# Exported as float64 (NaN when missing); everything else is text
+NUMERIC_COLUMNS = frozenset(['company_id', 'salary', 'salary_min', 'salary_max', 'salary_min_usd', 'salary_max_usd',
+                             'score'])
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'columnar': 'application/octet-stream',
+}
+# Columnar stream layout: MAGIC, then per row group a little-endian uint32
+# header length, a JSON header and the column buffers it describes; a zero
+# header length ends the stream.
+COLUMNAR_MAGIC = b'AJCX1\n'
+ROWS_PER_CHUNK = 5000
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ';'.join(str(item) for item in value)
+    return str(value)
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return float('nan')
+    return float(value)
+
+
+def export_rows(matches: Iterable[Tuple[Dict[str, Any], float]],
+                columns: List[str] = None) -> Iterator[List[Any]]:
+    """Project (posting, score) pairs onto export columns, one row at a time"""
+    columns = columns or DEFAULT_COLUMNS
+    for job, score in matches:
+        yield [round(score, 4) if column == 'score' else job.get(column) for column in columns]
+
+
+def _chunks(rows: Iterable[List[Any]], size: int) -> Iterator[List[List[Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(rows: Iterable[List[Any]], columns: List[str] = None,
+               rows_per_chunk: int = ROWS_PER_CHUNK) -> Iterator[bytes]:
+    """CSV as a sequence of byte chunks; only one chunk is buffered at a time"""
+    columns = columns or DEFAULT_COLUMNS
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in _chunks(rows, rows_per_chunk):
+        writer.writerows([_text(value) for value in row] for row in chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _encode_column(name: str, values: List[Any]) -> Tuple[Dict[str, Any], List[bytes]]:
+    if name in NUMERIC_COLUMNS:
+        data = np.fromiter((_number(v) for v in values), dtype='<f8', count=len(values)).tobytes()
+        return {'name': name, 'type': 'f8', 'sizes': [len(data)]}, [data]
+    encoded = [_text(v).encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    blob = b''.join(encoded)
+    offsets_bytes = offsets.tobytes()
+    return {'name': name, 'type': 'utf8', 'sizes': [len(offsets_bytes), len(blob)]}, [offsets_bytes, blob]
+
+
+def stream_columnar(rows: Iterable[List[Any]], columns: List[str] = None,
+                    rows_per_chunk: int = ROWS_PER_CHUNK) -> Iterator[bytes]:
+    """Row groups of column-major buffers: float64 arrays for numeric columns,
+    uint32 offsets plus a UTF-8 blob for text"""
+    columns = columns or DEFAULT_COLUMNS
+    yield COLUMNAR_MAGIC
+    for chunk in _chunks(rows, rows_per_chunk):
+        descriptors, buffers = [], []
+        for index, name in enumerate(columns):
+            descriptor, column_buffers = _encode_column(name, [row[index] for row in chunk])
+            descriptors.append(descriptor)
+            buffers.extend(column_buffers)
+        header = json.dumps({'rows': len(chunk), 'columns': descriptors}).encode('utf-8')
+        yield struct.pack('<I', len(header)) + header + b''.join(buffers)
+    yield struct.pack('<I', 0)
+
+
+def read_columnar(stream) -> Iterator[Dict[str, Any]]:
+    """Decode a columnar export back into row dicts, one row group at a time"""
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar job export")
+    while True:
+        (header_length,) = struct.unpack('<I', stream.read(4))
+        if not header_length:
+            return
+        header = json.loads(stream.read(header_length))
+        names, values = [], []
+        for column in header['columns']:
+            names.append(column['name'])
+            if column['type'] == 'f8':
+                data = np.frombuffer(stream.read(column['sizes'][0]), dtype='<f8')
+                values.append([None if np.isnan(v) else float(v) for v in data])
+            else:
+                offsets = np.frombuffer(stream.read(column['sizes'][0]), dtype='<u4')
+                blob = stream.read(column['sizes'][1])
+                values.append([blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+                               for i in range(header['rows'])])
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+
+def export_search(system, query: str = None, location: str = None, filters: Dict = None,
+                  export_format: str = 'csv', columns: List[str] = None, ranked: bool = False,
+                  rows_per_chunk: int = ROWS_PER_CHUNK) -> Iterator[bytes]:
+    """Stream every posting matching a search (all postings for an empty query)"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    columns = columns or DEFAULT_COLUMNS
+    rows = export_rows(system.iter_search(query, location, filters, ranked=ranked), columns)
+    encoder = stream_csv if export_format == 'csv' else stream_columnar
+    return encoder(rows, columns, rows_per_chunk)
+
+
+def _read_postings(path: str) -> Iterator[Dict[str, Any]]:
+    """Postings from a JSON Lines file (or a JSON array)"""
+    with open(path) as handle:
+        first = handle.read(1)
+        handle.seek(0)
+        if first == '[':
+            yield from json.load(handle)
+            return
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line export: load postings, search, stream to a file or stdout"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', required=True, help='postings as JSON Lines or a JSON array')
+    parser.add_argument('--query', default='')
+    parser.add_argument('--location')
+    parser.add_argument('--filters', default='{}', help='JSON object, as in /api/v1/jobs/search')
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+    parser.add_argument('--columns', help='comma-separated column names')
+    parser.add_argument('--ranked', action='store_true', help='order by relevance instead of index order')
+    parser.add_argument('--output', '-o', help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    from job_search_system import AlexAIJobSearchSystem
+    system = AlexAIJobSearchSystem()
+    for posting in _read_postings(args.jobs):
+        system.add_job(posting)
+
+    chunks = export_search(
+        system, args.query, args.location, json.loads(args.filters), args.format,
+        args.columns.split(',') if args.columns else None, args.ranked
+    )
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Job Title and Skill Normalization
+Canonicalizes titles, skills and queries so ingestion and search agree on terms
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, Optional
+
+from text_analysis import Analyzer
+
+# Canonical phrase -> variants. Every variant is rewritten to its canonical
+# phrase, so the index only ever holds the canonical spelling.
+TITLE_SYNONYMS = {
+    'senior': ['sr', 'snr'],
+    'junior': ['jr', 'jnr'],
+    'principal': ['princ'],
+    'lead': ['tech lead', 'team lead'],
+    'manager': ['mgr', 'mngr'],
+    'engineer': ['eng', 'engr'],
+    'developer': ['dev'],
+    'software engineer': ['swe', 'sde', 'software development engineer'],
+    'data scientist': ['ds'],
+    'machine learning engineer': ['mle', 'ml engineer'],
+    'site reliability engineer': ['sre'],
+    'product manager': ['pm'],
+    'vice president': ['vp'],
+    'frontend': ['front end', 'front-end'],
+    'backend': ['back end', 'back-end'],
+    'full stack': ['fullstack', 'full-stack'],
+}
+
+SKILL_SYNONYMS = {
+    'javascript': ['js', 'ecmascript'],
+    'typescript': ['ts'],
+    'python': ['py', 'python3'],
+    'golang': ['go lang'],
+    'kubernetes': ['k8s'],
+    'postgresql': ['postgres', 'psql'],
+    'react': ['react.js', 'reactjs'],
+    'nodejs': ['node.js', 'node js'],
+    'machine learning': ['ml'],
+    'artificial intelligence': ['ai'],
+    'amazon web services': ['aws'],
+    'google cloud platform': ['gcp'],
+    'continuous integration': ['ci'],
+}
+
+# Location spellings -> canonical metro area used for salary statistics
+METRO_ALIASES = {
+    'new york': ['nyc', 'new york city', 'manhattan', 'brooklyn', 'ny'],
+    'san francisco': ['sf', 'san francisco bay area', 'bay area', 'oakland'],
+    'san jose': ['silicon valley', 'palo alto', 'mountain view', 'sunnyvale'],
+    'los angeles': ['la', 'santa monica'],
+    'seattle': ['bellevue', 'redmond'],
+    'austin': ['atx'],
+    'washington': ['washington dc', 'dc', 'arlington'],
+    'boston': ['cambridge'],
+    'remote': ['anywhere', 'work from home', 'wfh'],
+}
+
+# Trailing level suffixes ("Engineer III", "Analyst 2") are only rewritten when
+# they follow one of these role nouns, so "Python 3" stays a skill mention.
+ROLE_NOUNS = frozenset([
+    'engineer', 'developer', 'scientist', 'analyst', 'manager', 'designer',
+    'architect', 'administrator', 'consultant', 'specialist', 'programmer',
+])
+
+TITLE_LEVELS = {
+    'i': 'junior', '1': 'junior',
+    'ii': 'mid', '2': 'mid',
+    'iii': 'senior', '3': 'senior',
+    'iv': 'staff', '4': 'staff',
+    'v': 'principal', '5': 'principal',
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.+#-][a-z0-9+#]*)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lowercased text into raw tokens, keeping c++, c#, node.js intact"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        token = token.rstrip('.-')
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+class SynonymAutomaton:
+    """Token-level trie compiled once from a synonym table.
+
+    Rewriting is a single left-to-right pass with greedy longest match, so
+    the cost is linear in the number of tokens regardless of table size.
+    """
+
+    def __init__(self, synonyms: Dict[str, List[str]], tokenizer: Callable[[str], List[str]] = tokenize):
+        self._root = {}
+        for canonical, variants in synonyms.items():
+            replacement = tuple(tokenizer(canonical))
+            for phrase in [canonical] + list(variants):
+                self._add(tuple(tokenizer(phrase)), replacement)
+
+    def _add(self, phrase: Tuple[str, ...], replacement: Tuple[str, ...]):
+        node = self._root
+        for token in phrase:
+            node = node.setdefault(token, {})
+        node[None] = replacement
+
+    def rewrite(self, tokens: List[str]) -> List[str]:
+        """Rewrite every known phrase in ``tokens`` to its canonical form"""
+        output = []
+        position = 0
+        count = len(tokens)
+        while position < count:
+            node = self._root
+            match = None
+            match_end = position
+            cursor = position
+            while cursor < count:
+                node = node.get(tokens[cursor])
+                if node is None:
+                    break
+                cursor += 1
+                if None in node:
+                    match = node[None]
+                    match_end = cursor
+            if match is None:
+                output.append(tokens[position])
+                position += 1
+            else:
+                output.extend(match)
+                position = match_end
+        return output
+
+
+class TermNormalizer:
+    """Canonicalizes titles, skills and free-text queries"""
+
+    def __init__(self, title_synonyms: Dict[str, List[str]] = None,
+                 skill_synonyms: Dict[str, List[str]] = None,
+                 cache_size: int = 65536, analyzer: Analyzer = None):
+        title_synonyms = title_synonyms or TITLE_SYNONYMS
+        skill_synonyms = skill_synonyms or SKILL_SYNONYMS
+        # Synonym spellings are never stemmed, so "kubernetes" or "postgres"
+        # keep matching their table entries
+        protected = {token for table in (title_synonyms, skill_synonyms)
+                     for canonical, variants in table.items()
+                     for phrase in [canonical] + list(variants) for token in tokenize(phrase)}
+        self.analyzer = analyzer or Analyzer(protected=protected, cache_size=cache_size)
+        # Phrases go through the same analyzer as text, so stemming and stop
+        # words can never make a variant unreachable
+        self.title_automaton = SynonymAutomaton(title_synonyms, self.analyzer.analyze)
+        self.skill_automaton = SynonymAutomaton(skill_synonyms, self.analyzer.analyze)
+        # Per-instance LRU caches: titles, skills and queries repeat heavily
+        # across postings and requests, so most calls never touch the tries.
+        self.normalize_title = lru_cache(maxsize=cache_size)(self._normalize_title)
+        self.normalize_skill = lru_cache(maxsize=cache_size)(self._normalize_skill)
+        self.canonical_terms = lru_cache(maxsize=cache_size)(self._canonical_terms)
+        self.normalize_location = lru_cache(maxsize=cache_size)(self._normalize_location)
+        self._metros = {}
+        for metro, aliases in METRO_ALIASES.items():
+            for alias in [metro] + aliases:
+                self._metros[' '.join(tokenize(alias))] = metro
+
+    def _apply_level_suffix(self, tokens: List[str]) -> List[str]:
+        if len(tokens) >= 2 and tokens[-1] in TITLE_LEVELS and tokens[-2] in ROLE_NOUNS:
+            level = TITLE_LEVELS[tokens[-1]]
+            return [level] + tokens[:-1]
+        return tokens
+
+    def _canonical_tokens(self, text: str) -> List[str]:
+        tokens = self.skill_automaton.rewrite(self.analyzer.analyze(text))
+        return self._apply_level_suffix(self.title_automaton.rewrite(tokens))
+
+    def _normalize_title(self, title: str) -> str:
+        """Canonical title string, e.g. 'SWE III' -> 'senior software engineer'"""
+        tokens = self._canonical_tokens(title or '')
+        # Drop a duplicated level word ("Sr. Senior Engineer") while keeping order
+        seen = set()
+        deduped = []
+        for token in tokens:
+            if token in TITLE_LEVELS.values() and token in seen:
+                continue
+            seen.add(token)
+            deduped.append(token)
+        return ' '.join(deduped)
+
+    def _normalize_skill(self, skill: str) -> str:
+        """Canonical skill name, e.g. 'K8s' -> 'kubernetes'"""
+        return ' '.join(self.skill_automaton.rewrite(self.analyzer.analyze(skill or '')))
+
+    def _canonical_terms(self, text: str) -> Tuple[str, ...]:
+        """Canonical index/query terms for free text"""
+        return tuple(self._canonical_tokens(text or ''))
+
+    def _normalize_location(self, location: str) -> str:
+        """Canonical metro, e.g. 'Brooklyn, NY' -> 'new york'"""
+        city = (location or '').split(',')[0]
+        key = ' '.join(tokenize(city))
+        return self._metros.get(key, key)
+
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """LRU statistics for each normalization cache"""
+        stats = {}
+        for name in ('normalize_title', 'normalize_skill', 'canonical_terms', 'normalize_location'):
+            info = getattr(self, name).cache_info()
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+            }
+        stats['analyzer_terms'] = self.analyzer.cache_info()
+        return stats
+
+
+_default_normalizer: Optional[TermNormalizer] = None
+
+
+def get_normalizer() -> TermNormalizer:
+    """Shared process-wide normalizer"""
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = TermNormalizer()
+    return _default_normalizer
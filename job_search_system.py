@@ -5,39 +5,540 @@ Intelligent job matching and resume tailoring
 """
 
 import json
+import math
+import threading
 import requests
-from typing import Dict, List, Any
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 
+from job_normalization import SKILL_SYNONYMS, TermNormalizer, get_normalizer
+from llm_providers import LLMProvider
+from tailoring_cache import TailoringCache, resume_hash, tailoring_cache_key
+from semantic_cache import SemanticTailoringCache
+from resume_templates import ResumeTemplate, TemplateEngine, default_templates
+from resume_profiles import ResumeProfileCache, SkillVocabulary
+from search_cache import SearchResultCache
+from company_resolution import CompanyResolver
+from salary_statistics import SalarySketchStore
+from salary_normalization import SalaryRangeIndex, normalize_postings
+from description_compaction import DescriptionCompactor
+from personalization import PersonalizationReranker
+from ranking_features import FeatureStore, rerank_head, salary_percentiles
+from section_tailoring import IncrementalTailor
+
+# Bump whenever TAILORING_PROMPT (or what is substituted into it) changes so cached completions are not reused
+PROMPT_TEMPLATE_VERSION = "2"
+
+TAILORING_PROMPT = """You are an expert resume writer. Rewrite the resume below so it targets the job description.
+Keep every claim truthful. Respond with a JSON object mapping section names (summary, experience, skills) to rewritten text.
+
+Job description:
+{job_description}
+
+Resume (JSON):
+{resume}
+"""
+
+def search_key(terms: List[str], location: str, filters: Dict) -> tuple:
+    """Cache key shared by every spelling of the same canonical search"""
+    return (tuple(terms), (location or '').lower(), json.dumps(filters, sort_keys=True, default=str))
+
+
+def matches_filters(job: Dict, location: str, filters: Dict, companies: CompanyResolver,
+                    normalizer: TermNormalizer) -> bool:
+    """Whether a stored posting passes a search's location and filters"""
+    if location and location.lower() not in (job.get('location') or '').lower():
+        return False
+    if 'remote' in filters and bool(job.get('remote')) != bool(filters['remote']):
+        return False
+    if filters.get('company'):
+        # Lookup only: filter text must never add spellings to the resolver
+        company_id = companies.lookup(filters['company'])
+        if company_id is None or company_id != job.get('company_id'):
+            return False
+    # Salary bounds are annual USD; postings without a salary never match them
+    low, high = job.get('salary_min_usd'), job.get('salary_max_usd')
+    if filters.get('min_salary') is not None and (high is None or high < filters['min_salary']):
+        return False
+    if filters.get('max_salary') is not None and (low is None or low > filters['max_salary']):
+        return False
+    required_skills = {normalizer.normalize_skill(s) for s in filters.get('skills') or []}
+    if required_skills and not required_skills.issubset(job['canonical_skills']):
+        return False
+    return True
+
+
+def salary_percentile_report(salary_sketches: SalarySketchStore, title: str, location: str,
+                             salary: float) -> Dict[str, Any]:
+    """Where a salary falls among postings for the same title and metro"""
+    canonical_title, metro = salary_sketches.key(title, location)
+    sketch = salary_sketches.get(title, location)
+    return {
+        'title': canonical_title,
+        'metro': metro,
+        'salary': salary,
+        'percentile': salary_sketches.percentile(title, location, salary),
+        'sample_size': int(sketch.count) if sketch else 0,
+        'median': round(sketch.quantile(0.5), 2) if sketch else None,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
 class AlexAIJobSearchSystem:
-    def __init__(self):
+    # BM25 parameters for ranking postings against a parsed query
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    # Title terms count this many times toward a posting's term frequency
+    TITLE_WEIGHT = 2
+    # Ranked results kept per cached search; deeper pages bypass the cache
+    CACHED_RESULTS = 200
+    # BM25 candidates rescored by the learning-to-rank reranker, if one is set
+    RERANK_DEPTH = 100
+
+    def __init__(self, normalizer: TermNormalizer = None, llm_provider: LLMProvider = None,
+                 tailoring_cache: TailoringCache = None,
+                 semantic_cache: SemanticTailoringCache = None,
+                 resume_profiles: ResumeProfileCache = None,
+                 compactor: DescriptionCompactor = None):
         self.version = "2.0.0"
         self.job_database = []
-        self.resume_templates = {}
-        
-    def search_jobs(self, query: str, location: str = None, filters: Dict = None) -> Dict[str, Any]:
-        """Search for job opportunities"""
-        # This will be implemented with actual job search logic
+        self.resume_templates = default_templates()
+        self.template_engine = TemplateEngine(self.resume_templates)
+        self.normalizer = normalizer or get_normalizer()
+        # posting id -> doc id
+        self.job_ids = {}
+        # canonical term -> {doc_id: term frequency}
+        self.job_index = {}
+        self.doc_lengths = []
+        self.total_terms = 0
+        # Bumped on every index change; cached searches from older generations are dropped
+        self.index_generation = 0
+        # Held while the index changes so snapshots see a consistent state
+        self.index_lock = threading.RLock()
+        self.search_cache = SearchResultCache()
+        self._refresh_listeners: List[Callable[['AlexAIJobSearchSystem'], None]] = []
+        self.salary_sketches = SalarySketchStore(self.normalizer)
+        self.salary_index = SalaryRangeIndex()
+        self.companies = CompanyResolver()
+        self.features = FeatureStore()
+        self.reranker = None
+        self.llm_provider = llm_provider
+        self.tailoring_cache = tailoring_cache
+        self.semantic_cache = semantic_cache
+        # Per-provider section tailors for incremental re-tailoring of edited resumes
+        self._section_tailors: Dict[tuple, IncrementalTailor] = {}
+        self.skill_vocabulary = resume_profiles.vocabulary if resume_profiles else SkillVocabulary()
+        self.job_skill_bits = []
+        self.resume_profiles = resume_profiles or ResumeProfileCache(
+            self.normalizer, vocabulary=self.skill_vocabulary
+        )
+        self.personalization = PersonalizationReranker(self).attach()
+        # Trims boilerplate and low-relevance sentences from job descriptions in tailoring prompts
+        self.compactor = compactor or DescriptionCompactor(self.normalizer)
+
+    def _posting_terms(self, job: Dict) -> List[str]:
+        """Canonical terms indexed for a posting"""
+        terms = []
+        title_terms = job['canonical_title'].split()
+        for _ in range(self.TITLE_WEIGHT):
+            terms.extend(title_terms)
+        for skill in job['canonical_skills']:
+            terms.extend(skill.split())
+        terms.extend(self.normalizer.canonical_terms(job.get('description') or ''))
+        return terms
+
+    @staticmethod
+    def _posting_salary(job: Dict) -> float:
+        """Annual salary for a posting, or None if it carries none"""
+        low, high = job.get('salary_min_usd'), job.get('salary_max_usd')
+        if low is not None and high is not None:
+            return (low + high) / 2
+        salary = job.get('salary')
+        if isinstance(salary, (int, float)):
+            return float(salary)
+        low, high = job.get('salary_min'), job.get('salary_max')
+        if isinstance(low, (int, float)) and isinstance(high, (int, float)):
+            return (low + high) / 2
+        return None
+
+    def add_job(self, job: Dict[str, Any]) -> int:
+        """Canonicalize and index a single posting, returning its doc id"""
+        return self._index_posting(normalize_postings([job])[0])
+
+    def _index_posting(self, stored: Dict[str, Any]) -> int:
+        """Index a salary-normalized copy of a posting"""
+        stored['canonical_title'] = self.normalizer.normalize_title(stored.get('title') or '')
+        stored['company_id'] = self.companies.resolve(stored.get('company'))
+        stored['canonical_skills'] = sorted({
+            self.normalizer.normalize_skill(skill) for skill in stored.get('skills') or []
+        })
+
+        terms = self._posting_terms(stored)
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        skill_bits = self.skill_vocabulary.bitset(stored['canonical_skills'])
+        salary = self._posting_salary(stored)
+
+        with self.index_lock:
+            doc_id = len(self.job_database)
+            stored.setdefault('id', f"job_{doc_id}")
+            for term, frequency in frequencies.items():
+                self.job_index.setdefault(term, {})[doc_id] = frequency
+            if salary is not None:
+                self.salary_sketches.update(stored.get('title'), stored.get('location'), salary)
+            self.features.append(doc_id, stored, salary)
+            if salary is not None and 'salary_min_usd' in stored:
+                self.salary_index.add(doc_id, stored['salary_min_usd'], stored['salary_max_usd'])
+            self.job_database.append(stored)
+            self.job_ids[stored['id']] = doc_id
+            self.job_skill_bits.append(skill_bits)
+            self.doc_lengths.append(len(terms))
+            self.total_terms += len(terms)
+            self.index_generation += 1
+        return doc_id
+
+    def on_index_refresh(self, listener: Callable[['AlexAIJobSearchSystem'], None]):
+        """Register a callback run after each batch of index changes"""
+        self._refresh_listeners.append(listener)
+
+    def notify_index_refresh(self):
+        """Tell listeners (e.g. cache prewarming) the index changed"""
+        for listener in self._refresh_listeners:
+            listener(self)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Stored posting by id"""
+        doc_id = self.job_ids.get(job_id)
+        return self.job_database[doc_id] if doc_id is not None else None
+
+    def ingest_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ingest a batch of postings"""
+        # Salaries are parsed for the whole batch at once rather than per posting
+        doc_ids = [self._index_posting(job) for job in normalize_postings(jobs)]
+        self.notify_index_refresh()
+        return {
+            'ingested': len(doc_ids),
+            'total_jobs': len(self.job_database),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def parse_query(self, query: str) -> List[str]:
+        """Canonical, de-duplicated query terms"""
+        seen = set()
+        terms = []
+        for term in self.normalizer.canonical_terms(query or ''):
+            if term not in seen:
+                seen.add(term)
+                terms.append(term)
+        return terms
+
+    def _score_terms(self, terms: List[str]) -> Dict[int, float]:
+        """BM25 scores for every posting containing at least one term"""
+        scores = {}
+        doc_count = len(self.job_database)
+        if not doc_count:
+            return scores
+        average_length = self.total_terms / doc_count
+        for term in terms:
+            postings = self.job_index.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                length_norm = 1 - self.BM25_B + self.BM25_B * self.doc_lengths[doc_id] / average_length
+                weight = frequency * (self.BM25_K1 + 1) / (frequency + self.BM25_K1 * length_norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+        return scores
+
+    def _matches_filters(self, job: Dict, location: str, filters: Dict) -> bool:
+        return matches_filters(job, location, filters, self.companies, self.normalizer)
+
+    def search_key(self, terms: List[str], location: str, filters: Dict) -> tuple:
+        """Cache key shared by every spelling of the same canonical search"""
+        return search_key(terms, location, filters)
+
+    def set_reranker(self, reranker):
+        """Rescore the top BM25 candidates with a LinearReranker or TreeEnsembleReranker (None disables)"""
+        with self.index_lock:
+            self.reranker = reranker
+            # Cached orderings came from the previous ranker
+            self.index_generation += 1
+
+    def _salary_percentiles(self, doc_ids: List[int]) -> np.ndarray:
+        """Percentile of each posting's salary in its (title, metro) sketch as it stands now"""
+        return salary_percentiles(self.features, self.salary_sketches, self.job_database.__getitem__, doc_ids)
+
+    def _rerank(self, terms: List[str], ranked: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
+        return rerank_head(self.reranker, self.features, self.salary_sketches, self.job_database.__getitem__,
+                           ranked, terms, self.RERANK_DEPTH)
+
+    def _rank(self, terms: List[str], location: str, filters: Dict) -> List[Tuple[int, float]]:
+        if terms:
+            scores = self._score_terms(terms)
+            candidates = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        elif filters.get('min_salary') is not None or filters.get('max_salary') is not None:
+            # Narrow a browse by salary band from the range index instead of scanning every posting
+            candidates = [(int(doc_id), 0.0) for doc_id in
+                          self.salary_index.overlapping(filters.get('min_salary'), filters.get('max_salary'))]
+        else:
+            candidates = [(doc_id, 0.0) for doc_id in range(len(self.job_database))]
+        ranked = [(doc_id, score) for doc_id, score in candidates
+                  if self._matches_filters(self.job_database[doc_id], location, filters)]
+        if self.reranker is not None and terms and ranked:
+            ranked = self._rerank(terms, ranked)
+        return ranked
+
+    def search_jobs(self, query: str, location: str = None, filters: Dict = None,
+                    limit: int = 20, user_id: str = None) -> Dict[str, Any]:
+        """Search for job opportunities, personalized for ``user_id`` when it has history"""
+        filters = filters or {}
+        terms = self.parse_query(query)
+        key = self.search_key(terms, location, filters)
+        cached = self.search_cache.get(key, self.index_generation) if limit <= self.CACHED_RESULTS else None
+        if cached is not None:
+            ranked, total_count = cached
+        else:
+            ranked = self._rank(terms, location, filters)
+            total_count = len(ranked)
+            if limit <= self.CACHED_RESULTS:
+                self.search_cache.put(key, self.index_generation, ranked[:self.CACHED_RESULTS], total_count)
+
+        # Empty when the user has no history or the head is not embedded yet
+        head = self.personalization.rerank(user_id, ranked) if user_id else []
+        personalized = bool(head)
+        if personalized:
+            page = [dict(self.job_database[doc_id], score=round(score, 4),
+                         personalized_score=round(blended, 4)) for doc_id, score, blended in head[:limit]]
+            page += [dict(self.job_database[doc_id], score=round(score, 4))
+                     for doc_id, score in ranked[len(head):limit]]
+        else:
+            page = [dict(self.job_database[doc_id], score=round(score, 4)) for doc_id, score in ranked[:limit]]
+
         results = {
             'query': query,
+            'parsed_query': terms,
             'location': location,
-            'filters': filters or {},
-            'results': [],
-            'total_count': 0,
+            'filters': filters,
+            'results': page,
+            'total_count': total_count,
+            'personalized': personalized,
             'timestamp': datetime.now().isoformat()
         }
-        
+
         return results
-    
-    def tailor_resume(self, job_description: str, resume_data: Dict) -> Dict[str, Any]:
-        """Tailor resume for specific job"""
-        # This will be implemented with AI-powered resume tailoring
+
+    def iter_search(self, query: str, location: str = None, filters: Dict = None,
+                    ranked: bool = True) -> Iterator[Tuple[Dict[str, Any], float]]:
+        """Lazily yield (posting, score) for every match.
+
+        ``ranked`` orders by score, which holds one (doc id, score) pair per
+        match; ``ranked=False`` walks the index in doc order in constant
+        memory, for bulk exports where order does not matter.
+        """
+        filters = filters or {}
+        terms = self.parse_query(query)
+        if ranked:
+            for doc_id, score in self._rank(terms, location, filters):
+                yield self.job_database[doc_id], score
+            return
+
+        doc_count = len(self.job_database)
+        postings = [self.job_index[term] for term in terms if term in self.job_index]
+        if terms and not postings:
+            return
+        average_length = self.total_terms / doc_count if doc_count else 0.0
+        idfs = [math.log(1 + (doc_count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+        for doc_id in range(doc_count):
+            score = 0.0
+            if postings:
+                length_norm = 1 - self.BM25_B + self.BM25_B * self.doc_lengths[doc_id] / average_length
+                matched = False
+                for term_postings, idf in zip(postings, idfs):
+                    frequency = term_postings.get(doc_id)
+                    if frequency:
+                        matched = True
+                        score += idf * frequency * (self.BM25_K1 + 1) / (frequency + self.BM25_K1 * length_norm)
+                if not matched:
+                    continue
+            job = self.job_database[doc_id]
+            if self._matches_filters(job, location, filters):
+                yield job, score
+
+    def salary_percentile(self, title: str, location: str, salary: float) -> Dict[str, Any]:
+        """Where a salary falls among postings for the same title and metro"""
+        return salary_percentile_report(self.salary_sketches, title, location, salary)
+
+    def match_resume_to_jobs(self, resume_data: Dict, limit: int = 20,
+                             query_terms: int = 30) -> List[Dict[str, Any]]:
+        """Rank postings for a resume by text relevance and skill overlap"""
+        profile = self.resume_profiles.get(resume_data)
+        scores = self._score_terms(profile.top_terms(query_terms))
+        best = max(scores.values()) if scores else 0.0
+        skill_count = bin(profile.skill_bits).count('1')
+        candidates = set(scores)
+        if profile.skill_bits:
+            candidates.update(doc_id for doc_id, bits in enumerate(self.job_skill_bits)
+                              if bits & profile.skill_bits)
+
+        matches = []
+        for doc_id in candidates:
+            job_bits = self.job_skill_bits[doc_id]
+            shared = bin(job_bits & profile.skill_bits).count('1')
+            required = bin(job_bits).count('1')
+            overlap = shared / required if required else (1.0 if not skill_count else 0.0)
+            text = scores.get(doc_id, 0.0) / best if best else 0.0
+            matches.append((0.5 * text + 0.5 * overlap, doc_id, overlap))
+        matches.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            dict(self.job_database[doc_id], match_score=round(score, 4), skill_overlap=round(overlap, 4))
+            for score, doc_id, overlap in matches[:limit]
+        ]
+
+    def match_resumes(self, resumes: List[Dict], limit: int = 20) -> List[List[Dict[str, Any]]]:
+        """Batch matching; each distinct resume is featurized once"""
+        return [self.match_resume_to_jobs(resume, limit) for resume in resumes]
+
+    def compact_job_description(self, job_description: str, resume_data: Dict) -> Dict[str, Any]:
+        """Job description as it goes into a tailoring prompt, with the tokens compaction saved"""
+        return self.compactor.compact(job_description, self.resume_profiles.get(resume_data).terms)
+
+    def build_tailoring_prompt(self, job_description: str, resume_data: Dict,
+                               compaction: Dict[str, Any] = None) -> str:
+        """Render the LLM prompt for tailoring a resume to a job"""
+        compaction = compaction or self.compact_job_description(job_description, resume_data)
+        return TAILORING_PROMPT.format(
+            job_description=compaction['text'],
+            resume=json.dumps(resume_data, sort_keys=True, indent=2, default=str)
+        )
+
+    @staticmethod
+    def parse_tailored_sections(completion: str) -> Dict[str, str]:
+        """Parse an LLM completion into {section: text}"""
+        try:
+            sections = json.loads(completion)
+        except (TypeError, ValueError):
+            sections = None
+        if isinstance(sections, dict):
+            return {str(name): str(text) for name, text in sections.items()}
+        return {'summary': (completion or '').strip()}
+
+    def _skill_match(self, job_description: str, resume_data: Dict) -> Dict[str, Any]:
+        """Local skill overlap between a resume and a job description"""
+        job_text = ' %s ' % ' '.join(self.normalizer.canonical_terms(job_description or ''))
+        resume_skills = self.resume_profiles.get(resume_data).skills
+        matched = sorted(s for s in resume_skills if f' {s} ' in job_text)
+        missing = sorted(s for s in SKILL_SYNONYMS
+                         if f' {s} ' in job_text and s not in resume_skills)
+        return {
+            'matched': matched,
+            'missing': missing,
+            'score': round(len(matched) / len(resume_skills), 4) if resume_skills else 0.0
+        }
+
+    def compose_tailored_resume(self, job_description: str, resume_data: Dict,
+                                tailored_sections: Dict[str, str] = None) -> Dict[str, Any]:
+        """Assemble the tailoring result from locally computed match data"""
+        match = self._skill_match(job_description, resume_data)
+        recommendations = [f"Highlight {skill} experience" for skill in match['matched']]
+        recommendations += [f"Consider adding {skill} if you have it" for skill in match['missing']]
         tailored_resume = {
             'original_resume': resume_data,
             'job_description': job_description,
-            'tailored_sections': {},
-            'match_score': 0.0,
-            'recommendations': []
+            'tailored_sections': tailored_sections or {},
+            'match_score': match['score'],
+            'recommendations': recommendations
         }
-        
+
         return tailored_resume
+
+    @property
+    def tailoring_version(self) -> str:
+        """Prompt template and compaction settings; cached completions are keyed by it"""
+        return f"{PROMPT_TEMPLATE_VERSION}:{self.compactor.fingerprint}"
+
+    def lookup_tailoring(self, job_description: str, resume_data: Dict,
+                         provider: LLMProvider) -> Optional[Dict[str, str]]:
+        """Previously tailored sections for this request, if cached"""
+        if self.tailoring_cache is None and self.semantic_cache is None:
+            return None
+        key = tailoring_cache_key(provider.model, self.tailoring_version, job_description, resume_data)
+        if self.tailoring_cache is not None:
+            sections = self.tailoring_cache.get(key)
+            if sections is not None:
+                return sections
+        if self.semantic_cache is not None:
+            partition = (provider.model, self.tailoring_version, resume_hash(resume_data))
+            return self.semantic_cache.lookup(partition, job_description, request_key=key)
+        return None
+
+    def store_tailoring(self, job_description: str, resume_data: Dict,
+                        provider: LLMProvider, tailored_sections: Dict[str, str]):
+        """Remember tailored sections for identical and near-duplicate future requests"""
+        if self.tailoring_cache is None and self.semantic_cache is None:
+            return
+        key = tailoring_cache_key(provider.model, self.tailoring_version, job_description, resume_data)
+        if self.tailoring_cache is not None:
+            self.tailoring_cache.put(key, tailored_sections)
+        if self.semantic_cache is not None:
+            partition = (provider.model, self.tailoring_version, resume_hash(resume_data))
+            self.semantic_cache.put(partition, job_description, tailored_sections, request_key=key)
+
+    def release_tailoring(self, job_description: str, resume_data: Dict, provider: LLMProvider):
+        """Drop state held for a tailoring request once it finishes, successfully or not"""
+        if self.semantic_cache is not None:
+            self.semantic_cache.discard(
+                tailoring_cache_key(provider.model, self.tailoring_version, job_description, resume_data)
+            )
+
+    def section_tailor(self, provider: LLMProvider = None) -> IncrementalTailor:
+        """The IncrementalTailor for a provider, sharing the tailoring cache"""
+        provider = provider or self.llm_provider
+        key = (provider.name, provider.model)
+        tailor = self._section_tailors.get(key)
+        if tailor is None:
+            tailor = self._section_tailors.setdefault(key, IncrementalTailor(self, provider, self.tailoring_cache))
+        return tailor
+
+    def tailor_resume(self, job_description: str, resume_data: Dict,
+                      provider: LLMProvider = None, incremental: bool = False) -> Dict[str, Any]:
+        """Tailor resume for specific job.
+
+        ``incremental`` re-tailors only the sections and experience entries
+        whose inputs changed since a previous call, for repeated edits of
+        the same resume against the same job.
+        """
+        provider = provider or self.llm_provider
+        tailored_sections = {}
+        compaction = None
+        if provider is not None and incremental:
+            return self.section_tailor(provider).tailor(job_description, resume_data)
+        if provider is not None:
+            tailored_sections = self.lookup_tailoring(job_description, resume_data, provider)
+            if tailored_sections is None:
+                compaction = self.compact_job_description(job_description, resume_data)
+                try:
+                    completion = provider.complete(self.build_tailoring_prompt(job_description, resume_data,
+                                                                               compaction))
+                    tailored_sections = self.parse_tailored_sections(completion)
+                    self.store_tailoring(job_description, resume_data, provider, tailored_sections)
+                finally:
+                    self.release_tailoring(job_description, resume_data, provider)
+        result = self.compose_tailored_resume(job_description, resume_data, tailored_sections)
+        if compaction is not None:
+            result['prompt_tokens_saved'] = compaction['tokens_saved']
+        return result
+
+    def register_resume_template(self, name: str, source: str, output_format: str = 'markdown',
+                                 version: str = None) -> ResumeTemplate:
+        """Add or replace a resume template; it is compiled on first render"""
+        return self.template_engine.register(ResumeTemplate(name, source, output_format, version))
+
+    def render_resume(self, tailored_resume: Dict[str, Any], template: str = 'markdown') -> str:
+        """Render a tailored resume with a named template"""
+        return self.template_engine.render(template, tailored_resume)
+
+    def render_resumes(self, tailored_resumes: List[Dict[str, Any]], template: str = 'markdown') -> List[str]:
+        """Render many tailored resumes with one compiled template"""
+        return self.template_engine.render_many(template, tailored_resumes)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Search Personalization
+Cached per-user preference vectors and a lightweight rerank of top search results
+"""
+
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from recommendations import EVENT_WEIGHTS
+from semantic_cache import HashingEmbedder
+
+
+def posting_text(job: Dict[str, Any]) -> str:
+    """Text a posting is embedded from: title, skills and company"""
+    return ' '.join([job.get('canonical_title') or job.get('title') or '',
+                     ' '.join(job.get('canonical_skills') or []),
+                     job.get('company') or ''])
+
+
+class PersonalizationReranker:
+    """Reranks the head of a result list toward each user's history.
+
+    A user's preference vector is an exponentially decayed, event-weighted
+    sum of the embeddings of postings they viewed, saved or applied to.
+    Events are folded in by a background thread, so recording never blocks
+    a request; ``flush`` waits for pending updates. Nothing runs until the
+    first event is recorded; from then on posting embeddings are computed
+    off the request path after each index refresh, so a rerank is one
+    ``depth x dim`` matrix-vector product. Searches that reach postings not
+    embedded yet skip personalization until the background catches up. At
+    most ``max_users`` vectors are kept, evicting the least recently updated.
+    """
+
+    def __init__(self, system, embedder: HashingEmbedder = None, depth: int = 50,
+                 weight: float = 0.3, decay: float = 0.95, event_weights: Dict[str, float] = None,
+                 max_users: int = 100000):
+        self.system = system
+        self.embedder = embedder or HashingEmbedder(normalizer=system.normalizer)
+        self.depth = depth
+        self.weight = weight
+        self.decay = decay
+        self.event_weights = event_weights or EVENT_WEIGHTS
+        self.max_users = max_users
+        self.user_vectors: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._job_vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._embedded = 0
+        self._embed_lock = threading.Lock()
+        # Set while a catch-up embed requested by a search is queued
+        self._catch_up_queued = False
+        self._queue: 'queue.Queue[Optional[Tuple[str, Any]]]' = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # Set by the first recorded event; until then refreshes embed nothing
+        self._active = False
+        self.updates = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def attach(self) -> 'PersonalizationReranker':
+        """Embed new postings in the background after every index refresh, once any user has history"""
+        self.system.on_index_refresh(self._on_refresh)
+        return self
+
+    def _on_refresh(self, _system):
+        if self._active:
+            self._submit(('embed', None))
+
+    def reset(self):
+        """Forget posting embeddings after the job store is replaced (e.g. a snapshot restore)"""
+        with self._embed_lock:
+            # Lowered first so lock-free readers never trust the emptied array
+            self._embedded = 0
+            self._job_vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+
+    def _submit(self, task: Tuple[str, Any]):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='personalization', daemon=True)
+                self._worker.start()
+        self._queue.put(task)
+
+    def _run(self):
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == 'embed':
+                    self._embed_new_postings()
+                else:
+                    self._apply_event(*payload)
+            except Exception as e:
+                # One bad posting or event must not stop the worker; surfaced in get_stats
+                self.errors += 1
+                self.last_error = f"{kind}: {e}"
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until queued events and embeddings are applied"""
+        self._queue.join()
+
+    def _embed_new_postings(self):
+        self._catch_up_queued = False
+        with self._embed_lock:
+            jobs = self.system.job_database
+            count = len(jobs)
+            if count <= self._embedded:
+                return
+            if count > self._job_vectors.shape[0]:
+                grown = np.zeros((max(count, 2 * self._job_vectors.shape[0]), self.embedder.dim),
+                                 dtype=np.float32)
+                grown[:self._embedded] = self._job_vectors[:self._embedded]
+                self._job_vectors = grown
+            for doc_id in range(self._embedded, count):
+                self._job_vectors[doc_id] = self.embedder.embed(posting_text(jobs[doc_id]))
+            self._embedded = count
+
+    def _vectors(self, doc_ids: List[int]) -> np.ndarray:
+        # Background only: catches up inline, which a search must never do
+        if doc_ids and max(doc_ids) >= self._embedded:
+            self._embed_new_postings()
+        return self._job_vectors[doc_ids]
+
+    def _embedded_vectors(self, doc_ids: List[int]) -> Optional[np.ndarray]:
+        """Vectors for ``doc_ids`` if all are embedded, else None after queueing a catch-up"""
+        embedded = self._embedded
+        vectors = self._job_vectors
+        if max(doc_ids) < min(embedded, vectors.shape[0]):
+            return vectors[doc_ids]
+        if not self._catch_up_queued:
+            self._catch_up_queued = True
+            self._submit(('embed', None))
+        return None
+
+    def record_event(self, user_id: str, job_id: str, event: str):
+        """Queue an interaction to fold into the user's vector"""
+        if not user_id or event not in self.event_weights:
+            return
+        self._active = True
+        self._submit(('event', (user_id, job_id, self.event_weights[event])))
+
+    def _apply_event(self, user_id: str, job_id: str, weight: float):
+        doc_id = self.system.job_ids.get(job_id)
+        if doc_id is None:
+            return
+        job_vector = self._vectors([doc_id])[0]
+        previous = self.user_vectors.get(user_id)
+        vector = weight * job_vector if previous is None else self.decay * previous + weight * job_vector
+        norm = np.linalg.norm(vector)
+        # Readers only ever see a complete vector: the dict slot is swapped, never mutated
+        self.user_vectors[user_id] = (vector / norm).astype(np.float32) if norm else vector
+        self.user_vectors.move_to_end(user_id)
+        while len(self.user_vectors) > self.max_users:
+            self.user_vectors.popitem(last=False)
+        self.updates += 1
+
+    def has_user(self, user_id: str) -> bool:
+        """True once a user has at least one applied interaction"""
+        return user_id in self.user_vectors
+
+    def rerank(self, user_id: str, ranked: List[Tuple[int, float]]) -> List[Tuple[int, float, float]]:
+        """Blend text relevance with user affinity over the top ``depth`` results.
+
+        Returns (doc id, text score, blended score) for the reranked head;
+        callers keep the tail in its original order. Returns an empty list,
+        meaning "not personalized", when the user has no vector or the head
+        holds postings the background has not embedded yet.
+        """
+        user_vector = self.user_vectors.get(user_id)
+        head = ranked[:self.depth]
+        if user_vector is None or not head:
+            return []
+        doc_ids = [doc_id for doc_id, _ in head]
+        job_vectors = self._embedded_vectors(doc_ids)
+        if job_vectors is None:
+            return []
+        text = np.fromiter((score for _, score in head), dtype=np.float64, count=len(head))
+        # Min-max, since learning-to-rank scores need not be positive
+        spread = text.max() - text.min()
+        text = (text - text.min()) / spread if spread > 0 else np.ones_like(text)
+        affinity = np.clip(job_vectors @ user_vector, 0.0, None)
+        blended = (1 - self.weight) * text + self.weight * affinity
+        order = np.argsort(-blended, kind='stable')
+        return [(doc_ids[i], head[i][1], float(blended[i])) for i in order]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Users with vectors, applied updates and embedding progress"""
+        return {
+            'users': len(self.user_vectors),
+            'updates': self.updates,
+            'pending': self._queue.qsize(),
+            'embedded_postings': self._embedded,
+            'errors': self.errors,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Query Log Analytics
+Fixed-memory sketches over search traffic: count-min, heavy hitters, HyperLogLog
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+
+def _hash64(value: str, seed: int = 0) -> int:
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8, salt=seed.to_bytes(8, 'little')).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class CountMinSketch:
+    """Count-min sketch: frequency estimates with one-sided error"""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, item: str) -> List[int]:
+        # Kirsch-Mitzenmacher double hashing from one 64-bit digest
+        value = _hash64(item)
+        low, high = value & 0xFFFFFFFF, value >> 32
+        return [(low + row * high) % self.width for row in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Count ``item`` and return its updated estimate"""
+        columns = self._columns(item)
+        rows = np.arange(self.depth)
+        self.table[rows, columns] += count
+        self.total += count
+        return int(self.table[rows, columns].min())
+
+    def estimate(self, item: str) -> int:
+        """Upper-bound estimate of how often ``item`` was added"""
+        return int(self.table[np.arange(self.depth), self._columns(item)].min())
+
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        """Add another sketch with the same dimensions"""
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class HeavyHitters:
+    """Top-k items by count-min estimate, held in a bounded candidate set"""
+
+    def __init__(self, capacity: int = 100, sketch: CountMinSketch = None):
+        self.capacity = capacity
+        self.sketch = sketch or CountMinSketch()
+        self.candidates: Dict[str, int] = {}
+
+    def add(self, item: str):
+        """Count an item and keep it if it ranks among the heaviest"""
+        estimate = self.sketch.add(item)
+        if item in self.candidates or len(self.candidates) < self.capacity:
+            self.candidates[item] = estimate
+            return
+        smallest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest]:
+            del self.candidates[smallest]
+            self.candidates[item] = estimate
+
+    def top(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Heaviest items with their estimated counts"""
+        ranked = sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:count]
+
+
+class HyperLogLog:
+    """Distinct-count estimator using 2**precision one-byte registers"""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, item: str):
+        """Observe an item"""
+        value = _hash64(item, seed=1)
+        index = value >> (64 - self.precision)
+        remaining = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct items"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Union with another sketch of the same precision"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+
+class _Window:
+    """Sketches for one time window"""
+
+    def __init__(self, start: float, width: int, depth: int, top_k: int, precision: int):
+        self.start = start
+        self.queries = HeavyHitters(top_k, CountMinSketch(width, depth))
+        self.distinct_users = HyperLogLog(precision)
+        self.distinct_queries = HyperLogLog(precision)
+        self.requests = 0
+
+
+class QueryAnalytics:
+    """Search traffic analytics in constant memory.
+
+    Traffic is bucketed into fixed windows; only the current window and the
+    ``retained_windows`` before it are kept, plus all-time sketches, so
+    memory does not grow with traffic volume.
+    """
+
+    def __init__(self, window_seconds: int = 3600, retained_windows: int = 24,
+                 width: int = 2048, depth: int = 4, top_k: int = 100, precision: int = 12):
+        self.window_seconds = window_seconds
+        self.retained_windows = retained_windows
+        self._sketch_args = (width, depth, top_k, precision)
+        self.all_time = _Window(time.time(), *self._sketch_args)
+        self.windows: List[_Window] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Case- and whitespace-insensitive query key"""
+        return ' '.join((query or '').lower().split())
+
+    def _current_window(self, now: float) -> _Window:
+        start = now - now % self.window_seconds
+        if not self.windows or self.windows[-1].start != start:
+            self.windows.append(_Window(start, *self._sketch_args))
+            del self.windows[:-(self.retained_windows + 1)]
+        return self.windows[-1]
+
+    def record(self, query: str, user_id: str = None, location: str = None, now: float = None):
+        """Record one search request"""
+        key = self.normalize_query(query)
+        if location:
+            key = f"{key} @ {self.normalize_query(location)}"
+        with self._lock:
+            for window in (self.all_time, self._current_window(now or time.time())):
+                window.requests += 1
+                window.queries.add(key)
+                window.distinct_queries.add(key)
+                if user_id:
+                    window.distinct_users.add(str(user_id))
+
+    def top_queries(self, count: int = 10) -> List[Tuple[str, int]]:
+        """All-time most frequent queries with estimated counts"""
+        with self._lock:
+            return self.all_time.queries.top(count)
+
+    def _describe(self, window: _Window, count: int) -> Dict[str, Any]:
+        return {
+            'start': datetime.fromtimestamp(window.start).isoformat(),
+            'requests': window.requests,
+            'distinct_users': window.distinct_users.count(),
+            'distinct_queries': window.distinct_queries.count(),
+            'top_queries': [{'query': q, 'count': c} for q, c in window.queries.top(count)]
+        }
+
+    def get_report(self, top: int = 10) -> Dict[str, Any]:
+        """Admin summary of all-time and per-window traffic"""
+        with self._lock:
+            return {
+                'all_time': self._describe(self.all_time, top),
+                'windows': [self._describe(window, top) for window in reversed(self.windows)],
+                'window_seconds': self.window_seconds,
+                'memory_bytes': self.memory_bytes(),
+                'timestamp': datetime.now().isoformat()
+            }
+
+    def memory_bytes(self) -> int:
+        """Approximate sketch memory, bounded by configuration"""
+        def window_bytes(window: _Window) -> int:
+            return (window.queries.sketch.table.nbytes + window.distinct_users.registers.nbytes
+                    + window.distinct_queries.registers.nbytes)
+        return window_bytes(self.all_time) + sum(window_bytes(w) for w in self.windows)
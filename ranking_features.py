@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Learning-to-Rank Features
+Per-posting feature columns maintained at ingest and vectorized rerankers over the top-k
+"""
+
+import json
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Column order of the matrix handed to rerankers
+FEATURE_NAMES = [
+    'bm25',
+    'title_match',
+    'recency',
+    'salary_log',
+    'salary_percentile',
+    'company_rating',
+    'company_postings_log',
+    'remote',
+    'skill_count',
+]
+
+# Hand-tuned starting point until a trained model is available
+DEFAULT_LINEAR_WEIGHTS = {
+    'bm25': 1.0,
+    'title_match': 0.8,
+    'recency': 0.4,
+    'salary_percentile': 0.1,
+    'company_rating': 0.05,
+    'company_postings_log': 0.02,
+}
+
+RECENCY_HALF_LIFE_DAYS = 14.0
+
+
+def _timestamp(value: Any) -> float:
+    """Epoch seconds for an ISO date/datetime string or a number, else NaN"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+class FeatureStore:
+    """Column-per-feature arrays indexed by doc id.
+
+    Query-independent features are written once at ingest; query-time
+    features (recency, company volume, title match) are derived from these
+    columns with array operations over the candidate slice only. Salary
+    percentiles depend on every posting ingested so far, so they are
+    supplied at scoring time rather than frozen here.
+    """
+
+    COLUMNS = ('posted_at', 'salary', 'company_rating', 'company_id', 'remote', 'skill_count')
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.columns = {name: np.full(capacity, np.nan, dtype=np.float64) for name in self.COLUMNS}
+        self.title_terms: List[frozenset] = []
+        self.company_postings = np.zeros(64, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], company_postings: np.ndarray,
+                     title_terms: Sequence[frozenset]) -> 'FeatureStore':
+        """Read-only store over existing arrays, e.g. ones mapped from shared memory"""
+        store = cls(capacity=0)
+        store.columns = dict(columns)
+        store.company_postings = company_postings
+        store.title_terms = title_terms
+        store.size = len(columns['posted_at'])
+        return store
+
+    def _grow(self, size: int):
+        capacity = len(self.columns['posted_at'])
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for name, column in self.columns.items():
+            grown = np.full(capacity, np.nan, dtype=np.float64)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def append(self, doc_id: int, job: Dict[str, Any], salary: Optional[float] = None):
+        """Record the features of a newly indexed posting"""
+        with self._lock:
+            self._grow(doc_id + 1)
+            row = {
+                'posted_at': _timestamp(job.get('posted_at')),
+                'salary': salary if salary is not None else math.nan,
+                'company_rating': float(job['company_rating'])
+                if isinstance(job.get('company_rating'), (int, float)) else math.nan,
+                'company_id': job['company_id'] if job.get('company_id') is not None else math.nan,
+                'remote': 1.0 if job.get('remote') else 0.0,
+                'skill_count': float(len(job.get('canonical_skills') or [])),
+            }
+            for name, value in row.items():
+                self.columns[name][doc_id] = value
+            while len(self.title_terms) <= doc_id:
+                self.title_terms.append(frozenset())
+            self.title_terms[doc_id] = frozenset((job.get('canonical_title') or '').split())
+            company_id = job.get('company_id')
+            if company_id is not None:
+                if company_id >= len(self.company_postings):
+                    grown = np.zeros(max(company_id + 1, 2 * len(self.company_postings)), dtype=np.int64)
+                    grown[:len(self.company_postings)] = self.company_postings
+                    self.company_postings = grown
+                self.company_postings[company_id] += 1
+            self.size = max(self.size, doc_id + 1)
+
+    def matrix(self, doc_ids: Sequence[int], text_scores: Sequence[float], query_terms: Sequence[str],
+               now: float = None, salary_percentiles: Sequence[float] = None) -> np.ndarray:
+        """(len(doc_ids), len(FEATURE_NAMES)) feature matrix for a candidate set.
+
+        ``salary_percentiles`` (0-100, NaN when unknown) come from the
+        current salary sketches; without them the feature is neutral.
+        """
+        ids = np.asarray(doc_ids, dtype=np.int64)
+        now = now or time.time()
+        columns = {name: column[ids] for name, column in self.columns.items()}
+        terms = set(query_terms)
+        title_match = np.fromiter(
+            (len(terms & self.title_terms[i]) / len(terms) if terms else 0.0 for i in doc_ids),
+            dtype=np.float64, count=len(doc_ids)
+        )
+        age_days = np.maximum(now - columns['posted_at'], 0.0) / 86400.0
+        recency = np.where(np.isnan(age_days), 0.5, np.power(0.5, age_days / RECENCY_HALF_LIFE_DAYS))
+        company_ids = columns['company_id']
+        known = ~np.isnan(company_ids)
+        postings = np.zeros(len(ids))
+        postings[known] = self.company_postings[company_ids[known].astype(np.int64)]
+        features = np.column_stack([
+            np.asarray(text_scores, dtype=np.float64),
+            title_match,
+            recency,
+            np.log1p(np.nan_to_num(columns['salary'], nan=0.0)),
+            np.full(len(ids), 50.0) / 100.0 if salary_percentiles is None
+            else np.nan_to_num(np.asarray(salary_percentiles, dtype=np.float64), nan=50.0) / 100.0,
+            np.nan_to_num(columns['company_rating'], nan=3.0),
+            np.log1p(postings),
+            columns['remote'],
+            columns['skill_count'],
+        ])
+        return features
+
+
+class LinearReranker:
+    """Weighted sum of features; unspecified features get weight 0"""
+
+    def __init__(self, weights: Dict[str, float] = None, bias: float = 0.0):
+        weights = DEFAULT_LINEAR_WEIGHTS if weights is None else weights
+        unknown = set(weights) - set(FEATURE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown ranking features: {sorted(unknown)}")
+        self.weights = np.array([weights.get(name, 0.0) for name in FEATURE_NAMES])
+        self.bias = bias
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """One score per row"""
+        return features @ self.weights + self.bias
+
+
+class TreeEnsembleReranker:
+    """Sum of regression trees, evaluated level by level over all rows at once.
+
+    Each tree is a list of nodes; split nodes are ``{"feature": name,
+    "threshold": t, "left": i, "right": j}`` (rows with value <= t go left)
+    and leaves are ``{"value": v}``. Node 0 is the root.
+    """
+
+    def __init__(self, trees: List[List[Dict[str, Any]]], base_score: float = 0.0,
+                 learning_rate: float = 1.0):
+        self.base_score = base_score
+        self.learning_rate = learning_rate
+        self.trees = [self._compile(tree) for tree in trees]
+
+    @staticmethod
+    def _compile(tree: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        size = len(tree)
+        compiled = {
+            'feature': np.zeros(size, dtype=np.int64),
+            'threshold': np.zeros(size),
+            'left': np.arange(size),
+            'right': np.arange(size),
+            'value': np.zeros(size),
+        }
+        for index, node in enumerate(tree):
+            if 'value' in node:
+                compiled['value'][index] = node['value']
+                continue
+            if node['feature'] not in FEATURE_NAMES:
+                raise ValueError(f"Unknown ranking feature: {node['feature']}")
+            compiled['feature'][index] = FEATURE_NAMES.index(node['feature'])
+            compiled['threshold'][index] = node['threshold']
+            compiled['left'][index] = node['left']
+            compiled['right'][index] = node['right']
+        # Leaves point at themselves, so iterating to the maximum depth is safe
+        compiled['depth'] = TreeEnsembleReranker._depth(tree)
+        return compiled
+
+    @staticmethod
+    def _depth(tree: List[Dict[str, Any]], index: int = 0) -> int:
+        node = tree[index]
+        if 'value' in node:
+            return 0
+        return 1 + max(TreeEnsembleReranker._depth(tree, node['left']),
+                       TreeEnsembleReranker._depth(tree, node['right']))
+
+    @classmethod
+    def from_json(cls, path: str) -> 'TreeEnsembleReranker':
+        """Load ``{"trees": [...], "base_score": b, "learning_rate": r}``"""
+        with open(path) as handle:
+            model = json.load(handle)
+        return cls(model['trees'], model.get('base_score', 0.0), model.get('learning_rate', 1.0))
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """One score per row"""
+        rows = np.arange(features.shape[0])
+        total = np.full(features.shape[0], self.base_score)
+        for tree in self.trees:
+            node = np.zeros(features.shape[0], dtype=np.int64)
+            for _ in range(tree['depth']):
+                values = features[rows, tree['feature'][node]]
+                node = np.where(values <= tree['threshold'][node], tree['left'][node], tree['right'][node])
+            total += self.learning_rate * tree['value'][node]
+        return total
+
+
+def salary_percentiles(features: FeatureStore, salary_sketches, job_at: Callable[[int], Dict[str, Any]],
+                       doc_ids: List[int]) -> np.ndarray:
+    """Percentile of each posting's salary in its (title, metro) sketch as it stands now"""
+    salaries = features.columns['salary'][np.asarray(doc_ids, dtype=np.int64)]
+    percentiles = np.full(len(doc_ids), np.nan)
+    for i, doc_id in enumerate(doc_ids):
+        if not np.isnan(salaries[i]):
+            job = job_at(doc_id)
+            percentile = salary_sketches.percentile(job.get('title'), job.get('location'), salaries[i])
+            if percentile is not None:
+                percentiles[i] = percentile
+    return percentiles
+
+
+def rerank_head(reranker, features: FeatureStore, salary_sketches, job_at: Callable[[int], Dict[str, Any]],
+                ranked: List[Tuple[int, float]], terms: List[str], depth: int) -> List[Tuple[int, float]]:
+    """Rescore the top ``depth`` of a BM25 ranking in place"""
+    head = ranked[:depth]
+    doc_ids = [doc_id for doc_id, _ in head]
+    matrix = features.matrix(doc_ids, [score for _, score in head], terms,
+                             salary_percentiles=salary_percentiles(features, salary_sketches, job_at, doc_ids))
+    scores = reranker.score(matrix)
+    if len(ranked) > len(head):
+        # Model scores and the tail's BM25 scores are on different scales;
+        # lift the head so scores never increase down the result list
+        scores = scores + max(0.0, ranked[len(head)][1] - float(scores.min()))
+    order = np.argsort(-scores, kind='stable')
+    ranked[:len(head)] = [(doc_ids[i], float(scores[i])) for i in order]
+    return ranked
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Job Recommendation Engine
+Implicit-feedback matrix factorization (ALS) over views, saves and applies
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+# Confidence contributed by each interaction type
+EVENT_WEIGHTS = {
+    'view': 1.0,
+    'save': 3.0,
+    'apply': 5.0,
+}
+
+
+class InteractionLog:
+    """Aggregated user x job interaction strengths.
+
+    Only the summed weight per (user, job) is kept, so memory grows with
+    the number of distinct pairs rather than raw events.
+    """
+
+    def __init__(self, event_weights: Dict[str, float] = None):
+        self.event_weights = event_weights or EVENT_WEIGHTS
+        self.user_ids: Dict[str, int] = {}
+        self.job_ids: Dict[str, int] = {}
+        self.job_keys: List[str] = []
+        self.user_items: List[Dict[int, float]] = []
+        self.item_users: List[Dict[int, float]] = []
+        # Running total weight per job, so popularity never rescans interactions
+        self.job_weights: List[float] = []
+        self.applied: List[Set[int]] = []
+        self.dirty_users: Set[int] = set()
+        # Events per user, so training can tell who changed while it ran
+        self.user_versions: List[int] = []
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def _user(self, user_id: str) -> int:
+        index = self.user_ids.get(user_id)
+        if index is None:
+            index = self.user_ids[user_id] = len(self.user_items)
+            self.user_items.append({})
+            self.applied.append(set())
+            self.user_versions.append(0)
+        return index
+
+    def _job(self, job_id: str) -> int:
+        index = self.job_ids.get(job_id)
+        if index is None:
+            index = self.job_ids[job_id] = len(self.job_keys)
+            self.job_keys.append(job_id)
+            self.item_users.append({})
+            self.job_weights.append(0.0)
+        return index
+
+    def record(self, user_id: str, job_id: str, event: str) -> Dict[str, Any]:
+        """Record one interaction event"""
+        if not user_id or not job_id:
+            raise ValueError("Interactions need a user_id and a job_id")
+        if event not in self.event_weights:
+            raise ValueError(f"Unknown interaction event: {event}")
+        weight = self.event_weights[event]
+        with self._lock:
+            user, job = self._user(user_id), self._job(job_id)
+            self.user_items[user][job] = self.user_items[user].get(job, 0.0) + weight
+            self.item_users[job][user] = self.item_users[job].get(user, 0.0) + weight
+            self.job_weights[job] += weight
+            if event == 'apply':
+                self.applied[user].add(job)
+            self.dirty_users.add(user)
+            self.user_versions[user] += 1
+            self.events += 1
+        return {
+            'user_id': user_id,
+            'job_id': job_id,
+            'event': event,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def popularity(self) -> np.ndarray:
+        """Total interaction weight per job"""
+        with self._lock:
+            return np.array(self.job_weights, dtype=np.float64)
+
+    def snapshot(self) -> 'InteractionLog':
+        """Consistent copy of the interaction matrix for training while events keep arriving"""
+        copy = InteractionLog(self.event_weights)
+        with self._lock:
+            copy.user_items = [dict(items) for items in self.user_items]
+            copy.item_users = [dict(users) for users in self.item_users]
+            copy.dirty_users = set(self.dirty_users)
+            copy.user_versions = list(self.user_versions)
+            copy.events = self.events
+        return copy
+
+
+class ImplicitALS:
+    """Hu, Koren & Volinsky implicit ALS written against NumPy.
+
+    Confidence is ``1 + alpha * weight``; each half-step solves a small
+    ``factors x factors`` system per row using the precomputed Gram matrix
+    of the opposite side, so cost is linear in the number of interactions.
+    """
+
+    def __init__(self, factors: int = 32, regularization: float = 0.1, alpha: float = 10.0,
+                 iterations: int = 10, seed: int = 42):
+        self.factors = factors
+        self.regularization = regularization
+        self.alpha = alpha
+        self.iterations = iterations
+        self.random = np.random.default_rng(seed)
+        self.user_factors = np.zeros((0, factors))
+        self.item_factors = np.zeros((0, factors))
+
+    def _grow(self, matrix: np.ndarray, rows: int) -> np.ndarray:
+        if matrix.shape[0] >= rows:
+            return matrix
+        extra = self.random.normal(0, 0.01, (rows - matrix.shape[0], self.factors))
+        return np.vstack([matrix, extra])
+
+    def _solve(self, fixed: np.ndarray, gram: np.ndarray, row: Dict[int, float]) -> np.ndarray:
+        regularized = gram + self.regularization * np.eye(self.factors)
+        if not row:
+            return np.zeros(self.factors)
+        indices = np.fromiter(row.keys(), dtype=np.int64, count=len(row))
+        confidence = 1.0 + self.alpha * np.fromiter(row.values(), dtype=np.float64, count=len(row))
+        vectors = fixed[indices]
+        a = regularized + (vectors.T * (confidence - 1.0)) @ vectors
+        b = vectors.T @ confidence
+        return np.linalg.solve(a, b)
+
+    def _sweep(self, target: np.ndarray, fixed: np.ndarray, rows: List[Dict[int, float]],
+               only: Optional[Set[int]] = None):
+        gram = fixed.T @ fixed
+        for index in (only if only is not None else range(len(rows))):
+            target[index] = self._solve(fixed, gram, rows[index])
+
+    def factorize(self, log: InteractionLog, iterations: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """New (user, item) factors warm-started from copies of the current ones; ``self`` is not modified"""
+        user_factors = self._grow(self.user_factors.copy(), len(log.user_items))
+        item_factors = self._grow(self.item_factors.copy(), len(log.item_users))
+        for _ in range(iterations or self.iterations):
+            self._sweep(user_factors, item_factors, log.user_items)
+            self._sweep(item_factors, user_factors, log.item_users)
+        return user_factors, item_factors
+
+    def fit(self, log: InteractionLog, iterations: int = None) -> 'ImplicitALS':
+        """Alternate user and item solves, warm-starting from current factors"""
+        self.user_factors, self.item_factors = self.factorize(log, iterations)
+        return self
+
+    def fold_in_users(self, log: InteractionLog, users: Set[int]):
+        """Recompute only ``users`` against fixed item factors"""
+        self.user_factors = self._grow(self.user_factors, len(log.user_items))
+        self.item_factors = self._grow(self.item_factors, len(log.item_users))
+        self._sweep(self.user_factors, self.item_factors, log.user_items, only=users)
+
+
+class RecommendationEngine:
+    """Personalized "jobs for you" over the interaction log.
+
+    ``train`` runs warm-started ALS sweeps, either on demand or from the
+    background loop ``start_training`` runs. The sweeps run on copies and
+    the finished factor arrays are swapped in whole, so requests never wait
+    for a training or see a half-updated model. Between full trainings, users
+    with new interactions are folded in lazily on their next request, so a
+    recommendation is one dot product against the item factors plus an
+    ``argpartition`` top-k. Jobs a user applied to are never recommended
+    back to them, personalized or not.
+    """
+
+    def __init__(self, system=None, log: InteractionLog = None, model: ImplicitALS = None):
+        self.system = system
+        self.log = log or InteractionLog()
+        self.model = model or ImplicitALS()
+        self.trained_at = None
+        self.trained_events = 0
+        self.training_errors = 0
+        # Popularity scores as of the last training (or first cold-start request)
+        self._popularity: Optional[np.ndarray] = None
+        self._popularity_events = 0
+        self._lock = threading.Lock()
+        # Users folded in since the last swap; a finished training may predate their events
+        self._folded: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_interaction(self, user_id: str, job_id: str, event: str) -> Dict[str, Any]:
+        """Log a view, save or apply"""
+        return self.log.record(user_id, job_id, event)
+
+    def train(self, iterations: int = None) -> Dict[str, Any]:
+        """Full (warm-started) factorization over all interactions"""
+        started = time.time()
+        snapshot = self.log.snapshot()
+        # The slow part runs without the lock, so fold-ins and recommendations continue
+        user_factors, item_factors = self.model.factorize(snapshot, iterations)
+        with self._lock:
+            self.model.user_factors, self.model.item_factors = user_factors, item_factors
+            with self.log._lock:
+                # Anyone whose events postdate the snapshot is folded in again on next use
+                trained = snapshot.user_versions
+                self.log.dirty_users = {
+                    user for user in self.log.dirty_users | self._folded
+                    if user >= len(trained) or self.log.user_versions[user] != trained[user]
+                }
+            self._folded = set()
+            self.trained_at = time.time()
+            self.trained_events = snapshot.events
+            self._popularity = self.log.popularity()
+            self._popularity_events = snapshot.events
+        return {
+            'users': len(self.log.user_items),
+            'jobs': len(self.log.item_users),
+            'events': self.log.events,
+            'seconds': round(time.time() - started, 3)
+        }
+
+    def start_training(self, interval: float = 300.0, min_new_events: int = 1) -> 'RecommendationEngine':
+        """Retrain in a background thread every ``interval`` seconds once new events arrive"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._train_loop, args=(interval, min_new_events),
+                                        name='recommendation-training', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop_training(self):
+        """Stop the background training loop"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _train_loop(self, interval: float, min_new_events: int):
+        while True:
+            if self.log.events - self.trained_events >= min_new_events:
+                try:
+                    self.train()
+                except Exception:
+                    self.training_errors += 1
+            if self._stop.wait(interval):
+                return
+
+    def _user_vector(self, user: int) -> np.ndarray:
+        with self._lock:
+            if user in self.log.dirty_users or user >= self.model.user_factors.shape[0]:
+                with self.log._lock:
+                    self.model.fold_in_users(self.log, {user})
+                    self.log.dirty_users.discard(user)
+                self._folded.add(user)
+            return self.model.user_factors[user].copy()
+
+    def _popular_scores(self) -> np.ndarray:
+        # Refreshed by each training; without a training loop, whenever events arrived
+        if self._popularity is None or (self._thread is None and self._popularity_events != self.log.events):
+            self._popularity_events = self.log.events
+            self._popularity = self.log.popularity()
+        return self._popularity
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Training freshness for dashboards"""
+        return {
+            'users': len(self.log.user_items),
+            'jobs': len(self.log.job_keys),
+            'events': self.log.events,
+            'events_since_training': self.log.events - self.trained_events,
+            'trained_at': datetime.fromtimestamp(self.trained_at).isoformat() if self.trained_at else None,
+            'training_errors': self.training_errors,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _job_payload(self, job_id: str) -> Dict[str, Any]:
+        if self.system is not None:
+            job = self.system.get_job(job_id)
+            if job is not None:
+                return dict(job)
+        return {'id': job_id}
+
+    def recommend(self, user_id: str, limit: int = 10, exclude_applied: bool = True) -> Dict[str, Any]:
+        """Top-k jobs for a user, falling back to popularity for unknown users"""
+        user = self.log.user_ids.get(user_id)
+        # Trainings replace the array rather than mutating it, so one read is consistent
+        item_factors = self.model.item_factors
+        item_count = min(len(self.log.job_keys), item_factors.shape[0])
+        if user is None or item_count == 0:
+            scores = self._popular_scores()
+            strategy = 'popular'
+        else:
+            scores = item_factors[:item_count] @ self._user_vector(user)
+            strategy = 'personalized'
+        excluded = 0
+        if exclude_applied and user is not None and self.log.applied[user]:
+            with self.log._lock:
+                applied = [job for job in self.log.applied[user] if job < len(scores)]
+            scores = scores.copy()
+            scores[applied] = -np.inf
+            excluded = len(applied)
+
+        # Excluded jobs can land in the top-k, so look that much deeper
+        count = min(limit + excluded, len(scores))
+        if count <= 0:
+            top = np.array([], dtype=np.int64)
+        else:
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+        recommendations = []
+        for index in top:
+            if not np.isfinite(scores[index]):
+                continue
+            if len(recommendations) >= limit:
+                break
+            job = self._job_payload(self.log.job_keys[index])
+            job['recommendation_score'] = round(float(scores[index]), 4)
+            recommendations.append(job)
+        return {
+            'user_id': user_id,
+            'strategy': strategy,
+            'results': recommendations,
+            'total_count': len(recommendations),
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Resume Parser
+Turns raw text and DOCX uploads into resume_data for tailor_resume
+"""
+
+import hashlib
+import io
+import os
+import re
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Iterable, Tuple, Optional
+from xml.etree import ElementTree
+
+from job_normalization import SKILL_SYNONYMS, get_normalizer
+
+SECTION_HEADINGS = {
+    'summary': ['summary', 'profile', 'professional summary', 'objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history'],
+    'education': ['education', 'academic background'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'technologies'],
+    'projects': ['projects', 'selected projects'],
+    'certifications': ['certifications', 'licenses', 'certificates'],
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+_MONTHS = {m: i for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+_DATE = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{4}|\d{1,2}/\d{4}|\d{4})"
+_DATE_RANGE_PATTERN = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to)\s*(?P<end>{_DATE}|present|current|now)", re.I
+)
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_ROLE_SPLIT_PATTERN = re.compile(r"\s+[-–—|@]\s+|,\s+")
+_BULLET_PATTERN = re.compile(r"^\s*[-*•●▪]\s*")
+_SKILL_SPLIT_PATTERN = re.compile(r"[,;|•·/]|\s{2,}")
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def content_hash(content: bytes) -> str:
+    """Cache key for an uploaded document"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def extract_text(content: bytes, filename: str = '') -> str:
+    """Plain text from a DOCX or text upload"""
+    if filename.lower().endswith('.docx') or content[:2] == b'PK':
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            root = ElementTree.fromstring(archive.read('word/document.xml'))
+        paragraphs = []
+        for paragraph in root.iter(f'{_WORD_NAMESPACE}p'):
+            paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{_WORD_NAMESPACE}t')))
+        return '\n'.join(paragraphs)
+    return content.decode('utf-8', errors='replace')
+
+
+def _normalize_date(text: str) -> str:
+    text = text.strip().lower().rstrip('.')
+    if text in ('present', 'current', 'now'):
+        return 'present'
+    if '/' in text:
+        month, year = text.split('/')
+        return f"{int(year):04d}-{int(month):02d}"
+    parts = text.split()
+    if len(parts) == 2:
+        return f"{int(parts[1]):04d}-{_MONTHS.get(parts[0][:3], 1):02d}"
+    return text
+
+
+def _split_sections(lines: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    header, sections, current = [], {}, None
+    for line in lines:
+        key = line.strip().strip(':').lower()
+        if key in _HEADING_LOOKUP and len(key) < 40:
+            current = _HEADING_LOOKUP[key]
+            sections.setdefault(current, [])
+        elif current is None:
+            header.append(line)
+        else:
+            sections[current].append(line)
+    return header, sections
+
+
+def _parse_experience(lines: List[str]) -> List[Dict[str, Any]]:
+    entries = []
+    for line in lines:
+        dates = _DATE_RANGE_PATTERN.search(line)
+        if dates and not _BULLET_PATTERN.match(line):
+            heading = (line[:dates.start()] + line[dates.end():]).strip(' ,|()-–—\t')
+            if ' at ' in heading:
+                title, _, company = heading.partition(' at ')
+            else:
+                parts = _ROLE_SPLIT_PATTERN.split(heading, maxsplit=1)
+                title, company = parts[0], parts[1] if len(parts) > 1 else ''
+            entries.append({
+                'title': title.strip(),
+                'company': company.strip(),
+                'start': _normalize_date(dates.group('start')),
+                'end': _normalize_date(dates.group('end')),
+                'description': ''
+            })
+        elif entries and line.strip():
+            bullet = _BULLET_PATTERN.sub('', line).strip()
+            separator = '\n' if entries[-1]['description'] else ''
+            entries[-1]['description'] += separator + bullet
+    return entries
+
+
+def _parse_skills(lines: List[str], text: str) -> List[str]:
+    normalizer = get_normalizer()
+    skills = []
+    for line in lines:
+        for item in _SKILL_SPLIT_PATTERN.split(_BULLET_PATTERN.sub('', line)):
+            item = item.split(':')[-1].strip()
+            if item and len(item) <= 40:
+                skills.append(normalizer.normalize_skill(item))
+    # Known skills mentioned anywhere else in the document
+    terms = ' %s ' % ' '.join(normalizer.canonical_terms(text))
+    skills.extend(skill for skill in SKILL_SYNONYMS if f' {skill} ' in terms)
+    return list(OrderedDict.fromkeys(s for s in skills if s))
+
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """Structured resume_data from plain resume text"""
+    lines = [line.rstrip() for line in text.splitlines()]
+    header, sections = _split_sections(lines)
+    header_lines = [line.strip() for line in header if line.strip()]
+    email = _EMAIL_PATTERN.search(text)
+    phone = _PHONE_PATTERN.search('\n'.join(header_lines))
+    experience = _parse_experience(sections.get('experience', []))
+    normalizer = get_normalizer()
+    return {
+        'name': header_lines[0] if header_lines else '',
+        'email': email.group(0) if email else None,
+        'phone': phone.group(0).strip() if phone else None,
+        'summary': ' '.join(line.strip() for line in sections.get('summary', []) if line.strip()),
+        'skills': _parse_skills(sections.get('skills', []), text),
+        'experience': experience,
+        'titles': list(OrderedDict.fromkeys(
+            normalizer.normalize_title(entry['title']) for entry in experience if entry['title']
+        )),
+        'education': [line.strip() for line in sections.get('education', []) if line.strip()],
+        'sections': {name: '\n'.join(body).strip() for name, body in sections.items()},
+    }
+
+
+def parse_resume(content: bytes, filename: str = '') -> Dict[str, Any]:
+    """Structured resume_data from an uploaded file"""
+    return parse_resume_text(extract_text(content, filename))
+
+
+def _parse_chunk(chunk: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+    results = []
+    for filename, content in chunk:
+        try:
+            results.append(parse_resume(content, filename))
+        except Exception as e:
+            results.append({'error': f"{type(e).__name__}: {e}", 'filename': filename})
+    return results
+
+
+class ResumeParsingPipeline:
+    """Parses resumes over a process pool with a bounded work queue.
+
+    At most ``max_pending`` chunks are queued at once, so a large backfill
+    streams through memory instead of materializing every future. Parsed
+    results are cached by content hash, so re-uploads skip the pool.
+    """
+
+    def __init__(self, max_workers: int = None, chunk_size: int = 32,
+                 max_pending: int = None, cache_size: int = 100000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.max_workers * 2
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.stats = {'parsed': 0, 'cache_hits': 0, 'errors': 0}
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: str, result: Dict[str, Any]):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _chunks(self, documents: Iterable[Tuple[str, bytes]], keys: List[str],
+                results: Dict[str, Dict[str, Any]]):
+        chunk, chunk_keys = [], []
+        for filename, content in documents:
+            key = content_hash(content)
+            keys.append(key)
+            if key in results:
+                self.stats['cache_hits'] += 1
+                continue
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                results[key] = cached
+                continue
+            # Placeholder so duplicates later in the same batch are not resubmitted
+            results[key] = None
+            chunk.append((filename, content))
+            chunk_keys.append(key)
+            if len(chunk) >= self.chunk_size:
+                yield chunk, chunk_keys
+                chunk, chunk_keys = [], []
+        if chunk:
+            yield chunk, chunk_keys
+
+    def _store(self, chunk_keys: List[str], parsed: List[Dict[str, Any]],
+               results: Dict[str, Dict[str, Any]]):
+        for key, result in zip(chunk_keys, parsed):
+            self.stats['parsed'] += 1
+            if 'error' in result:
+                self.stats['errors'] += 1
+            else:
+                self._cache_put(key, result)
+            results[key] = result
+
+    def parse_many(self, documents: Iterable[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        """Parse (filename, content) pairs, returning resume_data in input order"""
+        keys: List[str] = []
+        results: Dict[str, Dict[str, Any]] = {}
+        chunks = self._chunks(documents, keys, results)
+        if self.max_workers == 1:
+            for chunk, chunk_keys in chunks:
+                self._store(chunk_keys, _parse_chunk(chunk), results)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                pending = {}
+                for chunk, chunk_keys in chunks:
+                    if len(pending) >= self.max_pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._store(pending.pop(future), future.result(), results)
+                    pending[pool.submit(_parse_chunk, chunk)] = chunk_keys
+                for future in list(pending):
+                    self._store(pending.pop(future), future.result(), results)
+        return [results[key] for key in keys]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Resume Profile Cache
+Precomputed term vectors, embeddings and skill bitsets per resume
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, Iterable
+
+import numpy as np
+
+from job_normalization import TermNormalizer, get_normalizer
+from semantic_cache import HashingEmbedder
+from tailoring_cache import resume_hash
+
+
+class SkillVocabulary:
+    """Assigns each canonical skill a stable bit position"""
+
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bitset(self, skills: Iterable[str]) -> int:
+        """Integer bitset for a collection of canonical skills"""
+        value = 0
+        for skill in skills:
+            bit = self.bits.get(skill)
+            if bit is None:
+                with self._lock:
+                    bit = self.bits.setdefault(skill, len(self.bits))
+            value |= 1 << bit
+        return value
+
+
+class ResumeProfile:
+    """Featurized view of one resume"""
+
+    __slots__ = ('key', 'terms', 'embedding', 'skills', 'skill_bits')
+
+    def __init__(self, key: str, terms: Dict[str, int], embedding: np.ndarray,
+                 skills: frozenset, skill_bits: int):
+        self.key = key
+        self.terms = terms
+        self.embedding = embedding
+        self.skills = skills
+        self.skill_bits = skill_bits
+
+    def top_terms(self, count: int = 30) -> List[str]:
+        """Most frequent terms, used as a search query for the resume"""
+        return [term for term, _ in Counter(self.terms).most_common(count)]
+
+
+def resume_text(resume_data: Dict) -> str:
+    """Flattened text of the resume fields that describe the candidate"""
+    parts = [resume_data.get('summary') or '']
+    parts.extend(resume_data.get('titles') or [])
+    for role in resume_data.get('experience') or []:
+        if isinstance(role, dict):
+            parts.extend([role.get('title') or '', role.get('description') or ''])
+        else:
+            parts.append(str(role))
+    parts.extend(resume_data.get('skills') or [])
+    return '\n'.join(str(part) for part in parts)
+
+
+class ResumeProfileCache:
+    """LRU cache of resume profiles keyed by a stable hash of resume_data.
+
+    ``path`` enables persistence: ``save`` writes the cache atomically, and a
+    new cache pointed at the same file loads it.
+    """
+
+    def __init__(self, normalizer: TermNormalizer = None, embedder: HashingEmbedder = None,
+                 vocabulary: SkillVocabulary = None, max_entries: int = 100000, path: str = None):
+        self.normalizer = normalizer or get_normalizer()
+        self.embedder = embedder or HashingEmbedder(normalizer=self.normalizer)
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self.max_entries = max_entries
+        self.path = path
+        self._profiles: 'OrderedDict[str, ResumeProfile]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def build(self, resume_data: Dict, key: str = None) -> ResumeProfile:
+        """Featurize a resume without caching it"""
+        text = resume_text(resume_data)
+        skills = frozenset(
+            s for s in (self.normalizer.normalize_skill(skill) for skill in resume_data.get('skills') or []) if s
+        )
+        return ResumeProfile(
+            key=key or resume_hash(resume_data),
+            terms=dict(Counter(self.normalizer.canonical_terms(text))),
+            embedding=self.embedder.embed(text),
+            skills=skills,
+            skill_bits=self.vocabulary.bitset(skills),
+        )
+
+    def get(self, resume_data: Dict) -> ResumeProfile:
+        """Cached profile for ``resume_data``, featurizing it on first use"""
+        key = resume_hash(resume_data)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+        profile = self.build(resume_data, key)
+        with self._lock:
+            self._profiles[key] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def save(self, path: str = None):
+        """Persist profiles with an atomic rename"""
+        path = path or self.path
+        if not path:
+            raise ValueError("No persistence path configured")
+        with self._lock:
+            payload = {
+                'profiles': [(p.key, p.terms, p.embedding, p.skills) for p in self._profiles.values()],
+            }
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(handle.name, path)
+
+    def load(self, path: str):
+        """Load profiles written by ``save``"""
+        with open(path, 'rb') as handle:
+            payload = pickle.load(handle)
+        with self._lock:
+            for key, terms, embedding, skills in payload['profiles']:
+                # Bitsets are re-encoded so they agree with this vocabulary
+                self._profiles[key] = ResumeProfile(key, terms, embedding, skills,
+                                                    self.vocabulary.bitset(skills))
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self._profiles),
+            'skills_known': len(self.vocabulary.bits)
+        }
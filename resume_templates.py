@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Resume Template Engine
+Compiles resume templates once into Python render functions
+"""
+
+import hashlib
+import html
+import re
+from typing import Dict, List, Any, Callable
+
+_TAG_PATTERN = re.compile(r"(\{\{.*?\}\}|\{%.*?%\})", re.S)
+# Segments may not start with an underscore, so templates cannot name compiler internals
+_NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*(\.[A-Za-z0-9][A-Za-z0-9_]*)*$")
+
+FILTERS = {
+    'join': lambda value: ', '.join(str(v) for v in value) if isinstance(value, (list, tuple)) else value,
+    'upper': lambda value: str(value).upper(),
+    'lower': lambda value: str(value).lower(),
+    'title': lambda value: str(value).title(),
+}
+
+ESCAPERS = {
+    'markdown': lambda value: '' if value is None else str(value),
+    'html': lambda value: '' if value is None else html.escape(str(value)),
+}
+
+
+class TemplateSyntaxError(Exception):
+    """Raised when a template cannot be compiled"""
+
+
+def _get(value, key):
+    # Only dict keys and list indexes; attribute access would expose __class__ and friends
+    if isinstance(value, dict):
+        return value.get(key)
+    if isinstance(value, (list, tuple)) and key.isdigit():
+        index = int(key)
+        return value[index] if index < len(value) else None
+    return None
+
+
+def _iterate(value):
+    if not value:
+        return ()
+    if isinstance(value, dict):
+        return value.items()
+    return value
+
+
+class ResumeTemplate:
+    """Template source plus metadata; the version defaults to a content hash"""
+
+    def __init__(self, name: str, source: str, output_format: str = 'markdown', version: str = None):
+        if output_format not in ESCAPERS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.name = name
+        self.source = source
+        self.output_format = output_format
+        self.version = version or hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+
+
+class _Compiler:
+    """Translates template source into the body of a Python function"""
+
+    def __init__(self, template: ResumeTemplate):
+        self.template = template
+        self.lines = []
+        self.indent = 1
+        self.scopes: List[Dict[str, str]] = [{}]
+        self.blocks: List[str] = []
+        self.counter = 0
+
+    def emit(self, line: str):
+        self.lines.append('    ' * self.indent + line)
+
+    def expression(self, text: str) -> str:
+        parts = [part.strip() for part in text.split('|')]
+        name, filters = parts[0], parts[1:]
+        if not _NAME_PATTERN.match(name):
+            raise TemplateSyntaxError(f"{self.template.name}: invalid expression '{text}'")
+        head, *rest = name.split('.')
+        local = None
+        for scope in reversed(self.scopes):
+            if head in scope:
+                local = scope[head]
+                break
+        code = local or f"_get(ctx, {head!r})"
+        for segment in rest:
+            code = f"_get({code}, {segment!r})"
+        for filter_name in filters:
+            if filter_name not in FILTERS:
+                raise TemplateSyntaxError(f"{self.template.name}: unknown filter '{filter_name}'")
+            code = f"_filters[{filter_name!r}]({code})"
+        return code
+
+    def statement(self, text: str):
+        words = text.split()
+        keyword = words[0] if words else ''
+        if keyword == 'for' and len(words) == 4 and words[2] == 'in':
+            self.counter += 1
+            variable = f"_loop{self.counter}"
+            self.emit(f"for {variable} in _iterate({self.expression(words[3])}):")
+            self.indent += 1
+            self.scopes.append({words[1]: variable})
+            self.blocks.append('for')
+        elif keyword == 'endfor':
+            self._close('for')
+            self.scopes.pop()
+        elif keyword == 'if' and len(words) == 2:
+            self.emit(f"if {self.expression(words[1])}:")
+            self.indent += 1
+            self.blocks.append('if')
+        elif keyword == 'else':
+            if self.blocks and self.blocks[-1] == 'else':
+                raise TemplateSyntaxError(f"{self.template.name}: duplicate 'else'")
+            if not self.blocks or self.blocks[-1] != 'if':
+                raise TemplateSyntaxError(f"{self.template.name}: 'else' outside 'if'")
+            self.blocks[-1] = 'else'
+            self.emit('pass')
+            self.indent -= 1
+            self.emit('else:')
+            self.indent += 1
+        elif keyword == 'endif':
+            self._close('if')
+        else:
+            raise TemplateSyntaxError(f"{self.template.name}: unknown tag '{text}'")
+
+    def _close(self, block: str):
+        opened = self.blocks.pop() if self.blocks else None
+        if (opened if opened != 'else' else 'if') != block:
+            raise TemplateSyntaxError(f"{self.template.name}: unexpected 'end{block}'")
+        self.emit('pass')
+        self.indent -= 1
+
+    def compile(self) -> str:
+        for token in _TAG_PATTERN.split(self.template.source):
+            if token.startswith('{{'):
+                self.emit(f"_append(_escape({self.expression(token[2:-2].strip())}))")
+            elif token.startswith('{%'):
+                self.statement(token[2:-2].strip())
+            elif token:
+                self.emit(f"_append({token!r})")
+        if self.blocks:
+            block = 'if' if self.blocks[-1] == 'else' else self.blocks[-1]
+            raise TemplateSyntaxError(f"{self.template.name}: unclosed '{block}'")
+        body = '\n'.join(self.lines)
+        return f"def render(ctx):\n    _out = []\n    _append = _out.append\n{body}\n    return ''.join(_out)\n"
+
+
+class TemplateEngine:
+    """Compiles templates once per (name, version) and renders in bulk"""
+
+    def __init__(self, templates: Dict[str, ResumeTemplate] = None):
+        self.templates: Dict[str, ResumeTemplate] = templates if templates is not None else {}
+        self._compiled: Dict[tuple, Callable[[Dict[str, Any]], str]] = {}
+        self.compilations = 0
+
+    def register(self, template: ResumeTemplate) -> ResumeTemplate:
+        """Add or replace a template; a new version is compiled on next use"""
+        self.templates[template.name] = template
+        return template
+
+    def compiled(self, name: str) -> Callable[[Dict[str, Any]], str]:
+        """Render function for the current version of a template"""
+        template = self.templates[name]
+        key = (template.name, template.version)
+        render = self._compiled.get(key)
+        if render is None:
+            namespace = {
+                '_get': _get,
+                '_iterate': _iterate,
+                '_filters': FILTERS,
+                '_escape': ESCAPERS[template.output_format],
+            }
+            source = _Compiler(template).compile()
+            exec(compile(source, f"<template {template.name}@{template.version}>", 'exec'), namespace)
+            render = self._compiled[key] = namespace['render']
+            self.compilations += 1
+        return render
+
+    def render(self, name: str, context: Dict[str, Any]) -> str:
+        """Render a single context"""
+        return self.compiled(name)(context)
+
+    def render_many(self, name: str, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Render many contexts with one compiled function"""
+        render = self.compiled(name)
+        return [render(context) for context in contexts]
+
+
+MARKDOWN_RESUME = """# {{ original_resume.name }}
+{% if original_resume.email %}{{ original_resume.email }}
+{% endif %}
+## Summary
+{% if tailored_sections.summary %}{{ tailored_sections.summary }}{% else %}{{ original_resume.summary }}{% endif %}
+
+## Experience
+{% if tailored_sections.experience %}{{ tailored_sections.experience }}
+{% else %}{% for role in original_resume.experience %}
+### {{ role.title }} - {{ role.company }}
+{{ role.description }}
+{% endfor %}{% endif %}
+## Skills
+{% if tailored_sections.skills %}{{ tailored_sections.skills }}{% else %}{{ original_resume.skills|join }}{% endif %}
+"""
+
+HTML_RESUME = """<article class="resume">
+<h1>{{ original_resume.name }}</h1>
+{% if original_resume.email %}<p class="contact">{{ original_resume.email }}</p>
+{% endif %}<section><h2>Summary</h2>
+<p>{% if tailored_sections.summary %}{{ tailored_sections.summary }}{% else %}{{ original_resume.summary }}{% endif %}</p>
+</section>
+<section><h2>Experience</h2>
+{% if tailored_sections.experience %}<p>{{ tailored_sections.experience }}</p>
+{% else %}{% for role in original_resume.experience %}<h3>{{ role.title }} - {{ role.company }}</h3>
+<p>{{ role.description }}</p>
+{% endfor %}{% endif %}</section>
+<section><h2>Skills</h2>
+<p>{% if tailored_sections.skills %}{{ tailored_sections.skills }}{% else %}{{ original_resume.skills|join }}{% endif %}</p>
+</section>
+</article>
+"""
+
+
+def default_templates() -> Dict[str, ResumeTemplate]:
+    """Built-in Markdown and HTML resume templates"""
+    return {
+        'markdown': ResumeTemplate('markdown', MARKDOWN_RESUME, 'markdown'),
+        'html': ResumeTemplate('html', HTML_RESUME, 'html'),
+    }
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Salary Normalization
+Batch parsing of free-text salaries and conversion to annual USD, plus a salary range index
+"""
+
+import re
+import threading
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Bundled conversion table (units of USD per unit of currency); refresh together with RATES_AS_OF
+RATES_AS_OF = '2025-01-01'
+CURRENCY_RATES_TO_USD = {
+    'USD': 1.0,
+    'EUR': 1.04,
+    'GBP': 1.25,
+    'CAD': 0.70,
+    'AUD': 0.62,
+    'CHF': 1.10,
+    'SGD': 0.73,
+    'INR': 0.0117,
+    'JPY': 0.0064,
+}
+CURRENCY_SYMBOLS = {'$': 'USD', 'US$': 'USD', 'C$': 'CAD', 'CA$': 'CAD', 'A$': 'AUD', 'AU$': 'AUD',
+                    'S$': 'SGD', '€': 'EUR', '£': 'GBP', '₹': 'INR', '¥': 'JPY'}
+
+# Multipliers to an annual figure, assuming full-time hours
+PERIODS_PER_YEAR = {'hour': 2080.0, 'day': 260.0, 'week': 52.0, 'month': 12.0, 'year': 1.0}
+_PERIOD_ALIASES = {
+    'hour': 'hour', 'hr': 'hour', 'h': 'hour', 'hourly': 'hour',
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'wk': 'week', 'weekly': 'week',
+    'month': 'month', 'mo': 'month', 'monthly': 'month',
+    'year': 'year', 'yr': 'year', 'annum': 'year', 'annual': 'year', 'annually': 'year', 'yearly': 'year',
+}
+# Adverbs that may follow an amount without "/", "per" or "a"
+_PERIOD_ADVERBS = ('hourly', 'daily', 'weekly', 'monthly', 'annually', 'annual', 'yearly')
+# Without an explicit period, amounts below this are ambiguous (hourly, daily, thousands) and left unnormalized
+ANNUAL_FLOOR = 300.0
+
+_CURRENCIES = list(CURRENCY_RATES_TO_USD)
+_CURRENCY_INDEX = {code: i for i, code in enumerate(_CURRENCIES)}
+_PERIODS = list(PERIODS_PER_YEAR)
+_PERIOD_INDEX = {period: i for i, period in enumerate(_PERIODS)}
+_RATES = np.array([CURRENCY_RATES_TO_USD[code] for code in _CURRENCIES])
+_PERIOD_FACTORS = np.array([PERIODS_PER_YEAR[period] for period in _PERIODS])
+
+_SYMBOL = '|'.join(re.escape(s) for s in sorted(CURRENCY_SYMBOLS, key=len, reverse=True))
+# Whitespace that never crosses into the next row of a batch
+_SPACE = r"[^\S\n]*"
+_AMOUNT_PATTERN = re.compile(
+    rf"(?P<symbol>{_SYMBOL})?{_SPACE}(?P<low>\d[\d,]*(?:\.\d+)?){_SPACE}(?P<low_unit>[kKmM](?![a-zA-Z]))?"
+    rf"(?:{_SPACE}(?:-|–|—|to){_SPACE}(?:{_SYMBOL})?{_SPACE}(?P<high>\d[\d,]*(?:\.\d+)?){_SPACE}"
+    rf"(?P<high_unit>[kKmM](?![a-zA-Z]))?)?"
+)
+_CODE_PATTERN = re.compile(r"\b(" + '|'.join(_CURRENCIES) + r")\b", re.IGNORECASE)
+# A period only counts when it directly follows the amount, optionally after a currency code
+_PERIOD_PATTERN = re.compile(
+    rf"{_SPACE}(?:(?:{'|'.join(_CURRENCIES)})\b{_SPACE})?"
+    rf"(?:(?:/{_SPACE}|per[^\S\n]+|an?[^\S\n]+)(?P<alias>{'|'.join(sorted(_PERIOD_ALIASES, key=len, reverse=True))})"
+    rf"|(?P<adverb>{'|'.join(_PERIOD_ADVERBS)}))\b",
+    re.IGNORECASE
+)
+# "401(k)" / "403b" are retirement plans, not amounts
+_RETIREMENT_PATTERN = re.compile(r"40[13]\s*(?:\(\s*[kb]\s*\)|[kb])(?![a-z])", re.IGNORECASE)
+_UNITS = {'k': 1e3, 'K': 1e3, 'm': 1e6, 'M': 1e6}
+
+
+def _row_of(positions: np.ndarray, line_starts: np.ndarray) -> np.ndarray:
+    return np.searchsorted(line_starts, positions, side='right') - 1
+
+
+def parse_salaries(texts: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Parse a batch of salary strings in a few regex passes over one buffer.
+
+    Distinct strings are parsed once; each pattern scans the newline-joined
+    batch a single time and matches are mapped back to rows by offset. A
+    period counts only when it follows the amount ("$60/hr", "90k a year").
+    Returns arrays ``low``, ``high`` (NaN when unparsed), ``currency`` and
+    ``period`` indexes (-1 when not stated).
+    """
+    unique, inverse = np.unique(np.asarray([(t or '').replace('\n', ' ') for t in texts], dtype=object),
+                                return_inverse=True)
+    count = len(unique)
+    blob = '\n'.join(unique)
+    lengths = np.fromiter((len(text) + 1 for text in unique), dtype=np.int64, count=count)
+    line_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if count else np.zeros(0, dtype=np.int64)
+
+    low = np.full(count, np.nan)
+    high = np.full(count, np.nan)
+    currency = np.full(count, -1, dtype=np.int64)
+    period = np.full(count, -1, dtype=np.int64)
+    seen = np.zeros(count, dtype=bool)
+
+    matches = list(_AMOUNT_PATTERN.finditer(blob))
+    rows = _row_of(np.fromiter((m.start('low') for m in matches), dtype=np.int64, count=len(matches)),
+                   line_starts)
+    for row, match in zip(rows, matches):
+        if seen[row] or (not match.group('symbol') and _RETIREMENT_PATTERN.match(blob, match.start('low'))):
+            continue
+        seen[row] = True
+        low_value = float(match.group('low').replace(',', ''))
+        high_text = match.group('high')
+        high_value = float(high_text.replace(',', '')) if high_text else low_value
+        low_unit, high_unit = match.group('low_unit'), match.group('high_unit')
+        # "120-150k": a unit on the upper bound applies to both
+        low[row] = low_value * _UNITS.get(low_unit or high_unit, 1.0)
+        high[row] = high_value * _UNITS.get(high_unit or low_unit, 1.0)
+        symbol = match.group('symbol')
+        if symbol:
+            currency[row] = _CURRENCY_INDEX[CURRENCY_SYMBOLS[symbol]]
+        stated = _PERIOD_PATTERN.match(blob, match.end())
+        if stated:
+            alias = stated.group('alias') or stated.group('adverb')
+            period[row] = _PERIOD_INDEX[_PERIOD_ALIASES[alias.lower()]]
+
+    # An explicit ISO code wins over a symbol ("$120k CAD")
+    codes = list(_CODE_PATTERN.finditer(blob))
+    code_rows = _row_of(np.fromiter((m.start() for m in codes), dtype=np.int64, count=len(codes)), line_starts)
+    for row, match in zip(code_rows, codes):
+        currency[row] = _CURRENCY_INDEX[match.group(1).upper()]
+
+    return {
+        'low': low[inverse],
+        'high': high[inverse],
+        'currency': currency[inverse],
+        'period': period[inverse],
+    }
+
+
+def to_annual_usd(parsed: Dict[str, np.ndarray], default_currency: str = 'USD') -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized conversion of parsed salaries to annual USD (low, high).
+
+    Amounts with no stated period are read as annual; below ANNUAL_FLOOR
+    they are ambiguous and come back as NaN.
+    """
+    currency = np.where(parsed['currency'] >= 0, parsed['currency'], _CURRENCY_INDEX[default_currency])
+    stated = parsed['period'] >= 0
+    period = np.where(stated, parsed['period'], _PERIOD_INDEX['year'])
+    factor = _RATES[currency] * _PERIOD_FACTORS[period]
+    factor = np.where(stated | (np.nan_to_num(parsed['high'], nan=np.inf) >= ANNUAL_FLOOR), factor, np.nan)
+    return parsed['low'] * factor, parsed['high'] * factor
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def normalize_postings(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copies of ``jobs`` with ``salary_min_usd``/``salary_max_usd`` set.
+
+    Free-text ``salary`` fields ("$60/hr", "120k-150k GBP") are parsed in
+    one batch; numeric ``salary``/``salary_min``/``salary_max`` are taken as
+    amounts in ``salary_currency`` (default USD) per ``salary_period``
+    (default year).
+    """
+    texts, text_rows, text_periods = [], [], []
+    normalized = []
+    for row, job in enumerate(jobs):
+        stored = dict(job)
+        normalized.append(stored)
+        if isinstance(job.get('salary'), str):
+            period = _PERIOD_ALIASES.get((job.get('salary_period') or '').lower())
+            texts.append(f"{job['salary']} {job.get('salary_currency') or ''}")
+            text_rows.append(row)
+            text_periods.append(_PERIOD_INDEX[period] if period else -1)
+            continue
+        low = _number(job.get('salary_min'))
+        high = _number(job.get('salary_max'))
+        single = _number(job.get('salary'))
+        if single is not None:
+            low = high = single
+        if low is None and high is None:
+            continue
+        rate = CURRENCY_RATES_TO_USD.get((job.get('salary_currency') or 'USD').upper())
+        factor = PERIODS_PER_YEAR.get(_PERIOD_ALIASES.get((job.get('salary_period') or 'year').lower()))
+        if rate is None or factor is None:
+            continue
+        low, high = low if low is not None else high, high if high is not None else low
+        stored['salary_min_usd'] = round(low * rate * factor, 2)
+        stored['salary_max_usd'] = round(high * rate * factor, 2)
+
+    if texts:
+        parsed = parse_salaries(texts)
+        # A period stated in the text wins over salary_period
+        parsed['period'] = np.where(parsed['period'] >= 0, parsed['period'], text_periods)
+        low, high = to_annual_usd(parsed)
+        for row, low_usd, high_usd in zip(text_rows, low, high):
+            if not np.isnan(low_usd):
+                normalized[row]['salary_min_usd'] = round(float(low_usd), 2)
+                normalized[row]['salary_max_usd'] = round(float(high_usd), 2)
+    return normalized
+
+
+class SalaryRangeIndex:
+    """Doc ids ordered by annual USD salary bounds for range filtering.
+
+    Appends are O(1); the sorted views are rebuilt lazily on the first
+    range query after a change.
+    """
+
+    def __init__(self):
+        self._doc_ids: List[int] = []
+        self._lows: List[float] = []
+        self._highs: List[float] = []
+        self._sorted = None
+        self._lock = threading.Lock()
+
+    def add(self, doc_id: int, low: float, high: float):
+        """Index a posting's annual USD range"""
+        with self._lock:
+            self._doc_ids.append(doc_id)
+            self._lows.append(low)
+            self._highs.append(high)
+            self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def _views(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        with self._lock:
+            if self._sorted is None:
+                doc_ids = np.asarray(self._doc_ids, dtype=np.int64)
+                highs = np.asarray(self._highs)
+                order = np.argsort(highs, kind='stable')
+                self._sorted = (doc_ids[order], highs[order], np.asarray(self._lows)[order])
+            return self._sorted
+
+    def overlapping(self, minimum: float = None, maximum: float = None) -> np.ndarray:
+        """Doc ids (ascending) whose range overlaps [minimum, maximum]"""
+        doc_ids, highs, lows = self._views()
+        start = np.searchsorted(highs, minimum, side='left') if minimum is not None else 0
+        selected, selected_lows = doc_ids[start:], lows[start:]
+        if maximum is not None:
+            selected = selected[selected_lows <= maximum]
+        return np.sort(selected)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Salary Percentile Statistics
+Streaming t-digest sketches per canonical (title, metro)
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Any, Tuple, Optional
+
+from job_normalization import TermNormalizer, get_normalizer
+
+
+class TDigest:
+    """Merging t-digest (Dunning & Ertl) for streaming quantiles.
+
+    Points are buffered and merged into at most ~``compression`` centroids,
+    so memory and query cost are bounded no matter how many salaries are
+    added. Digests built on different shards merge losslessly enough for
+    percentile reporting. Reads compress the buffer too, so every method
+    holds the digest's lock; searches may read while ingest adds.
+    """
+
+    def __init__(self, compression: int = 100, buffer_size: int = 500):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self._buffer: List[Tuple[float, float]] = []
+        self._cumulative: List[float] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._lock = threading.Lock()
+
+    def add(self, value: float, weight: float = 1.0):
+        """Add an observation"""
+        value = float(value)
+        with self._lock:
+            self._buffer.append((value, weight))
+            self.count += weight
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+            if len(self._buffer) >= self.buffer_size:
+                self._compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Fold another digest into this one"""
+        with other._lock:
+            if not other.count:
+                return self
+            points = list(zip(other.means, other.weights)) + other._buffer
+            count, low, high = other.count, other.min, other.max
+        with self._lock:
+            self._buffer.extend(points)
+            self.count += count
+            self.min = min(self.min, low)
+            self.max = max(self.max, high)
+            self._compress()
+        return self
+
+    def _q_limit(self, q: float) -> float:
+        # k1 scale function: small centroids at the tails, large in the middle
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        k = min(k, self.compression / 4)
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        # Callers hold self._lock
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        means, weights = [], []
+        mean, weight = points[0]
+        q_start = 0.0
+        q_limit = self._q_limit(q_start)
+        for point_mean, point_weight in points[1:]:
+            if q_start + (weight + point_weight) / total <= q_limit:
+                weight += point_weight
+                mean += (point_mean - mean) * point_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                q_start += weight / total
+                q_limit = self._q_limit(q_start)
+                mean, weight = point_mean, point_weight
+        means.append(mean)
+        weights.append(weight)
+
+        self.means, self.weights = means, weights
+        # Cumulative weight at each centroid's midpoint, used for interpolation
+        cumulative, running = [], 0.0
+        for weight in weights:
+            cumulative.append(running + weight / 2)
+            running += weight
+        self._cumulative = cumulative
+
+    def cdf(self, value: float) -> float:
+        """Fraction of observations <= value"""
+        with self._lock:
+            self._compress()
+            return self._cdf(value)
+
+    def _cdf(self, value: float) -> float:
+        if not self.count:
+            return math.nan
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        means, cumulative = self.means, self._cumulative
+        index = bisect_left(means, value)
+        if index == 0:
+            span = means[0] - self.min
+            rank = cumulative[0] * ((value - self.min) / span if span else 1.0)
+        elif index == len(means):
+            span = self.max - means[-1]
+            tail = self.count - cumulative[-1]
+            rank = cumulative[-1] + tail * ((value - means[-1]) / span if span else 0.0)
+        else:
+            left, right = means[index - 1], means[index]
+            fraction = (value - left) / (right - left) if right > left else 0.5
+            rank = cumulative[index - 1] + fraction * (cumulative[index] - cumulative[index - 1])
+        return min(1.0, max(0.0, rank / self.count))
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q in [0, 1]"""
+        with self._lock:
+            self._compress()
+            return self._quantile(q)
+
+    def _quantile(self, q: float) -> float:
+        if not self.count:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        means, cumulative = self.means, self._cumulative
+        target = q * self.count
+        index = bisect_left(cumulative, target)
+        if index == 0:
+            span = cumulative[0]
+            return self.min + (means[0] - self.min) * (target / span if span else 1.0)
+        if index == len(means):
+            tail = self.count - cumulative[-1]
+            fraction = (target - cumulative[-1]) / tail if tail else 0.0
+            return means[-1] + (self.max - means[-1]) * fraction
+        fraction = (target - cumulative[index - 1]) / (cumulative[index] - cumulative[index - 1])
+        return means[index - 1] + fraction * (means[index] - means[index - 1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form for shipping digests between shards"""
+        with self._lock:
+            self._compress()
+            return {
+                'compression': self.compression,
+                'means': list(self.means),
+                'weights': list(self.weights),
+                'count': self.count,
+                'min': self.min,
+                'max': self.max,
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TDigest':
+        """Rebuild a digest produced by ``to_dict``"""
+        digest = cls(compression=data['compression'])
+        digest._buffer = list(zip(data['means'], data['weights']))
+        digest.count = data['count']
+        digest.min = data['min']
+        digest.max = data['max']
+        digest._compress()
+        return digest
+
+
+class SalarySketchStore:
+    """Salary t-digests keyed by canonical (title, metro)"""
+
+    def __init__(self, normalizer: TermNormalizer = None, compression: int = 100):
+        self.normalizer = normalizer or get_normalizer()
+        self.compression = compression
+        self.sketches: Dict[Tuple[str, str], TDigest] = {}
+
+    def key(self, title: str, location: str) -> Tuple[str, str]:
+        """Canonical sketch key for a title and location"""
+        return (self.normalizer.normalize_title(title or ''),
+                self.normalizer.normalize_location(location or ''))
+
+    def update(self, title: str, location: str, salary: float):
+        """Record an annual salary at ingest time"""
+        key = self.key(title, location)
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = self.sketches[key] = TDigest(self.compression)
+        sketch.add(salary)
+
+    def get(self, title: str, location: str) -> Optional[TDigest]:
+        """Sketch for a title and location, if any postings were seen"""
+        return self.sketches.get(self.key(title, location))
+
+    def percentile(self, title: str, location: str, salary: float) -> Optional[float]:
+        """Percentile (0-100) of ``salary`` among matching postings"""
+        sketch = self.get(title, location)
+        if sketch is None:
+            return None
+        return round(sketch.cdf(salary) * 100, 1)
+
+    def merge(self, other: 'SalarySketchStore') -> 'SalarySketchStore':
+        """Merge sketches from another shard"""
+        for key, sketch in other.sketches.items():
+            if key in self.sketches:
+                self.sketches[key].merge(sketch)
+            else:
+                self.sketches[key] = TDigest(sketch.compression).merge(sketch)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form keyed by 'title|metro'"""
+        return {f"{title}|{metro}": sketch.to_dict()
+                for (title, metro), sketch in self.sketches.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], normalizer: TermNormalizer = None) -> 'SalarySketchStore':
+        """Rebuild a store produced by ``to_dict``"""
+        store = cls(normalizer)
+        for key, sketch in data.items():
+            title, metro = key.rsplit('|', 1)
+            store.sketches[(title, metro)] = TDigest.from_dict(sketch)
+        return store
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+Index build, query latency, memory and tailoring throughput on a synthetic corpus, as comparable JSON
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Any
+
+import numpy as np
+import psutil
+
+from job_search_system import AlexAIJobSearchSystem
+from llm_providers import StubLLMProvider
+from search_cache import SearchResultCache
+from synthetic_corpus import QUERY_TYPES, generate_jobs, generate_queries, generate_resumes
+from tailoring_pipeline import BatchTailoringPipeline
+from tenant_indexes import estimate_index_bytes
+
+# Bump when a metric's meaning changes; results from other versions are not compared
+BENCHMARK_FORMAT_VERSION = 1
+INGEST_BATCH_SIZE = 10000
+# Cached latency is measured on one in this many queries
+WARM_SAMPLE_DIVISOR = 5
+
+
+def _rss_bytes() -> int:
+    gc.collect()
+    return psutil.Process().memory_info().rss
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, Any]:
+    """Count, mean and percentile latencies in milliseconds"""
+    if not seconds:
+        return {'count': 0}
+    millis = np.asarray(seconds) * 1000.0
+    p50, p90, p99 = np.percentile(millis, [50, 90, 99])
+    return {
+        'count': len(millis),
+        'mean_ms': round(float(millis.mean()), 4),
+        'p50_ms': round(float(p50), 4),
+        'p90_ms': round(float(p90), 4),
+        'p99_ms': round(float(p99), 4),
+        'max_ms': round(float(millis.max()), 4),
+    }
+
+
+def benchmark_index_build(system: AlexAIJobSearchSystem, postings: int, seed: int) -> Dict[str, Any]:
+    """Ingest a synthetic corpus in batches, measuring time and resident memory"""
+    jobs = generate_jobs(postings, seed)
+    rss_before = _rss_bytes()
+    elapsed = 0.0
+    while True:
+        batch = list(islice(jobs, INGEST_BATCH_SIZE))
+        if not batch:
+            break
+        # Only ingest is timed; generating the corpus is not the system's cost
+        started = time.perf_counter()
+        system.ingest_jobs(batch)
+        elapsed += time.perf_counter() - started
+    # Posting embeddings run in the background once any user has history; if
+    # they were started they are part of the build and must not skew queries
+    started = time.perf_counter()
+    system.personalization.flush()
+    elapsed += time.perf_counter() - started
+    rss_after = _rss_bytes()
+    return {
+        'postings': postings,
+        'seconds': round(elapsed, 4),
+        'postings_per_second': round(postings / elapsed, 1) if elapsed else None,
+        'rss_bytes_per_posting': round((rss_after - rss_before) / postings, 1) if postings else None,
+        'estimated_bytes_per_posting': round(estimate_index_bytes(system) / postings, 1) if postings else None,
+    }
+
+
+def benchmark_queries(system: AlexAIJobSearchSystem, queries: int, seed: int, limit: int = 20,
+                      repeat: int = 3) -> Dict[str, Any]:
+    """Latency percentiles per query type with the result cache off, plus a warm-cache pass.
+
+    Each query runs ``repeat`` times and its fastest run counts, which keeps
+    scheduler noise on shared machines out of release-to-release comparisons.
+    """
+    requests = generate_queries(queries, seed)
+    cache = system.search_cache
+    system.search_cache = SearchResultCache(max_entries=0)
+    timings: Dict[str, List[float]] = {query_type: [] for query_type in QUERY_TYPES}
+    results: Dict[str, List[int]] = {query_type: [] for query_type in QUERY_TYPES}
+    try:
+        for request in requests:
+            fastest = float('inf')
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                response = system.search_jobs(request['query'], location=request['location'],
+                                              filters=request['filters'], limit=limit)
+                fastest = min(fastest, time.perf_counter() - started)
+            timings[request['type']].append(fastest)
+            results[request['type']].append(response['total_count'])
+    finally:
+        system.search_cache = cache
+
+    # A sample of the requests once to fill the cache, then timed again
+    warm, sample = [], requests[:max(1, len(requests) // WARM_SAMPLE_DIVISOR)]
+    for request in sample:
+        system.search_jobs(request['query'], location=request['location'], filters=request['filters'], limit=limit)
+    for request in sample:
+        started = time.perf_counter()
+        system.search_jobs(request['query'], location=request['location'], filters=request['filters'], limit=limit)
+        warm.append(time.perf_counter() - started)
+
+    summary = {}
+    for query_type, seconds in timings.items():
+        summary[query_type] = dict(latency_summary(seconds),
+                                   mean_matches=round(float(np.mean(results[query_type])), 1)
+                                   if results[query_type] else 0)
+    summary['cached'] = latency_summary(warm)
+    return summary
+
+
+def benchmark_tailoring(system: AlexAIJobSearchSystem, tailorings: int, seed: int,
+                        latency: float = 0.0) -> Dict[str, Any]:
+    """Batch tailoring throughput against the stub provider (local overhead unless ``latency`` is set)"""
+    if not tailorings:
+        return {'requests': 0}
+    resumes = generate_resumes(max(1, tailorings // 10), seed)
+    jobs = list(generate_jobs(tailorings, seed + 1))
+    requests = [{'job_description': job['description'], 'resume_data': resumes[index % len(resumes)]}
+                for index, job in enumerate(jobs)]
+    pipeline = BatchTailoringPipeline(system, {'stub': StubLLMProvider(latency=latency)})
+    started = time.perf_counter()
+    results = pipeline.run(requests)
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': len(requests),
+        'seconds': round(elapsed, 4),
+        'tailorings_per_second': round(len(requests) / elapsed, 1) if elapsed else None,
+        'failed': sum(1 for result in results if result['status'] != 'tailored'),
+        'prompt_tokens_saved': pipeline.stats['prompt_tokens_saved'],
+    }
+
+
+def run_benchmark(postings: int = 10000, queries: int = 500, tailorings: int = 200, seed: int = 7,
+                  provider_latency: float = 0.0, repeat: int = 3) -> Dict[str, Any]:
+    """Every benchmark on a fresh system, as one JSON-serializable result"""
+    system = AlexAIJobSearchSystem()
+    return {
+        'benchmark_format_version': BENCHMARK_FORMAT_VERSION,
+        'system_version': system.version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'postings': postings, 'queries': queries, 'tailorings': tailorings, 'seed': seed,
+                   'provider_latency': provider_latency, 'repeat': repeat},
+        'index_build': benchmark_index_build(system, postings, seed),
+        'queries': benchmark_queries(system, queries, seed, repeat=repeat),
+        'tailoring': benchmark_tailoring(system, tailorings, seed, provider_latency),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def _direction(metric: str) -> int:
+    """+1 when higher is better, -1 when lower is better, 0 when not a performance metric"""
+    if metric.endswith('_per_second'):
+        return 1
+    if metric.endswith(('_ms', '.seconds', '_bytes_per_posting')):
+        return -1
+    return 0
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.10) -> Dict[str, Any]:
+    """Metrics that got worse (or better) than ``baseline`` by more than ``tolerance``"""
+    if baseline.get('benchmark_format_version') != current.get('benchmark_format_version'):
+        raise ValueError("Benchmark results use different formats and cannot be compared")
+    if baseline.get('config') != current.get('config'):
+        raise ValueError("Benchmark results were produced with different configurations")
+    old, new = _flatten(baseline), _flatten(current)
+    regressions, improvements = [], []
+    for metric, before in old.items():
+        direction = _direction(metric)
+        after = new.get(metric)
+        if not direction or after is None or not before:
+            continue
+        change = (after - before) / abs(before)
+        entry = {'metric': metric, 'baseline': before, 'current': after, 'change': round(change, 4)}
+        if change * direction < -tolerance:
+            regressions.append(entry)
+        elif change * direction > tolerance:
+            improvements.append(entry)
+    return {
+        'baseline_version': baseline.get('system_version'),
+        'current_version': current.get('system_version'),
+        'tolerance': tolerance,
+        'regressions': regressions,
+        'improvements': improvements,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark job search on a synthetic corpus')
+    parser.add_argument('--postings', type=int, default=10000, help='10k to 5M postings')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--tailorings', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--provider-latency', type=float, default=0.0,
+                        help='Simulated LLM latency in seconds per call')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per query; the fastest counts')
+    parser.add_argument('--output', help='Write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='Earlier results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.postings, args.queries, args.tailorings, args.seed, args.provider_latency,
+                            args.repeat)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.baseline:
+        with open(args.baseline) as handle:
+            comparison = compare_results(json.load(handle), results, args.tolerance)
+        print(json.dumps(comparison, indent=2), file=sys.stderr)
+        return 1 if comparison['regressions'] else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
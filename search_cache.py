@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Search Result Cache
+LRU cache of ranked search results, invalidated by index generation
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class SearchResultCache:
+    """Thread-safe LRU of ranked (doc_id, score) lists.
+
+    Entries are tagged with the index generation they were computed against;
+    any lookup after the index changes clears the cache, so stale rankings
+    are never served.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: 'OrderedDict[tuple, Tuple[List[Tuple[int, float]], int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_generation(self, generation: int):
+        if generation != self.generation:
+            self._entries.clear()
+            self.generation = generation
+
+    def get(self, key: tuple, generation: int) -> Optional[Tuple[List[Tuple[int, float]], int]]:
+        """Cached (ranked matches, total count) for a search key"""
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, generation: int, matches: List[Tuple[int, float]], total: int):
+        """Store ranked matches computed against ``generation``"""
+        with self._lock:
+            self._check_generation(generation)
+            self._entries[key] = (matches, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self._entries),
+            'generation': self.generation
+        }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Incremental Section Tailoring
+Re-tailors only the resume sections whose inputs changed
+"""
+
+import hashlib
+import json
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, Optional
+
+from job_normalization import SKILL_SYNONYMS
+from llm_providers import LLMProvider
+from tailoring_cache import TailoringCache
+
+# Bump whenever SECTION_PROMPT changes so cached sections are not reused
+SECTION_PROMPT_VERSION = "2"
+
+SECTION_PROMPT = """You are an expert resume writer. Rewrite only the requested resume sections so they target the job.
+Keep every claim truthful. Respond with a JSON object whose keys are exactly: {sections}.
+
+Job focus:
+{job_features}
+
+Resume fields:
+{resume_fields}
+"""
+
+# Each tailored section lists the resume fields and job-description features
+# it reads. ``experience[].title`` means the title of every experience entry,
+# so editing a bullet's description does not invalidate the summary.
+# ``experience[*]`` splits a section into one unit per entry that reads only
+# that entry, so editing one bullet re-tailors only its own entry.
+SECTION_DEPENDENCIES = {
+    'summary': {
+        'resume': ['name', 'summary', 'skills', 'experience[].title', 'experience[].company'],
+        'job': ['keywords', 'skills'],
+    },
+    'experience': {
+        'resume': ['experience[*]'],
+        'job': ['keywords', 'skills'],
+    },
+    'skills': {
+        'resume': ['skills'],
+        'job': ['skills'],
+    },
+}
+
+
+def resolve_field(data: Any, path: str) -> Any:
+    """Value at a dotted path; ``name[]`` maps the rest of the path over a list"""
+    if not path:
+        return data
+    head, _, rest = path.partition('.')
+    if head.endswith('[]'):
+        items = data.get(head[:-2]) if isinstance(data, dict) else None
+        return [resolve_field(item, rest) for item in items or []]
+    value = data.get(head) if isinstance(data, dict) else None
+    return resolve_field(value, rest) if rest else value
+
+
+def section_units(resume_data: Dict, dependencies: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, Any]]:
+    """Tailoring units and the resume inputs each reads, in section order.
+
+    A section is one unit unless one of its paths ends in ``[*]``; then it
+    has one unit per list entry, named ``section[i]``.
+    """
+    units = {}
+    for section, deps in dependencies.items():
+        paths = deps.get('resume', [])
+        shared = {path: resolve_field(resume_data, path) for path in paths if not path.endswith('[*]')}
+        per_entry = [path for path in paths if path.endswith('[*]')]
+        if not per_entry:
+            units[section] = shared
+            continue
+        # The entry sits under its position-free path, so its key ignores order
+        entries = resolve_field(resume_data, per_entry[0][:-3]) or []
+        for index, entry in enumerate(entries):
+            units[f"{section}[{index}]"] = dict(shared, **{per_entry[0]: entry})
+    return units
+
+
+def _unit_section(unit: str) -> str:
+    return unit.partition('[')[0]
+
+
+def _fingerprint(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IncrementalTailor:
+    """Tailors resumes section by section with per-section caching.
+
+    Each unit's cache key is a fingerprint of exactly the inputs listed in
+    ``SECTION_DEPENDENCIES``. On every call only units whose fingerprint is
+    missing are regenerated, all together in a single LLM call. Per-entry
+    units are keyed by the entry's content, not its position, so reordering
+    experience reuses every entry.
+    """
+
+    def __init__(self, system, provider: LLMProvider = None, cache: TailoringCache = None,
+                 dependencies: Dict[str, Dict[str, List[str]]] = None,
+                 keyword_count: int = 20, cache_size: int = 50000):
+        self.system = system
+        self.provider = provider or system.llm_provider
+        if self.provider is None:
+            raise ValueError("IncrementalTailor requires an LLM provider")
+        self.cache = cache
+        self.dependencies = dependencies or SECTION_DEPENDENCIES
+        self.keyword_count = keyword_count
+        self.cache_size = cache_size
+        self._sections: 'OrderedDict[str, str]' = OrderedDict()
+        self.stats = {'calls': 0, 'llm_calls': 0, 'sections_reused': 0, 'sections_recomputed': 0}
+
+    def job_features(self, job_description: str) -> Dict[str, Any]:
+        """Job-description features sections may depend on"""
+        terms = self.system.normalizer.canonical_terms(job_description or '')
+        text = ' %s ' % ' '.join(terms)
+        counts = Counter(term for term in terms if len(term) > 2)
+        return {
+            'skills': sorted(skill for skill in SKILL_SYNONYMS if f' {skill} ' in text),
+            'keywords': sorted(term for term, _ in counts.most_common(self.keyword_count)),
+        }
+
+    def section_fingerprints(self, resume_data: Dict, features: Dict[str, Any]) -> Dict[str, str]:
+        """Cache key for each unit given the current inputs"""
+        fingerprints = {}
+        for unit, resume_inputs in section_units(resume_data, self.dependencies).items():
+            section = _unit_section(unit)
+            job_inputs = {name: features.get(name) for name in self.dependencies[section].get('job', [])}
+            fingerprints[unit] = _fingerprint(
+                section, self.provider.model, SECTION_PROMPT_VERSION, resume_inputs, job_inputs
+            )
+        return fingerprints
+
+    def _get(self, key: str) -> Optional[str]:
+        text = self._sections.get(key)
+        if text is not None:
+            self._sections.move_to_end(key)
+            return text
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._put(key, cached['text'], persist=False)
+                return cached['text']
+        return None
+
+    def _put(self, key: str, text: str, persist: bool = True):
+        self._sections[key] = text
+        self._sections.move_to_end(key)
+        while len(self._sections) > self.cache_size:
+            self._sections.popitem(last=False)
+        if persist and self.cache is not None:
+            self.cache.put(key, {'text': text})
+
+    def build_prompt(self, units: List[str], resume_data: Dict, features: Dict[str, Any]) -> str:
+        """Prompt asking only for ``units``, with only the fields they read"""
+        inputs = section_units(resume_data, self.dependencies)
+        resume_fields, job_fields = {}, {}
+        for unit in units:
+            for path, value in inputs[unit].items():
+                # A per-entry unit shows only its own entry, under its unit name
+                resume_fields[unit if path.endswith('[*]') else path] = value
+            for name in self.dependencies[_unit_section(unit)].get('job', []):
+                job_fields[name] = features.get(name)
+        return SECTION_PROMPT.format(
+            sections=', '.join(units),
+            job_features=json.dumps(job_fields, sort_keys=True, indent=2),
+            resume_fields=json.dumps(resume_fields, sort_keys=True, indent=2, default=str)
+        )
+
+    def tailor(self, job_description: str, resume_data: Dict) -> Dict[str, Any]:
+        """Tailor a resume, regenerating only invalidated sections and experience entries"""
+        self.stats['calls'] += 1
+        features = self.job_features(job_description)
+        fingerprints = self.section_fingerprints(resume_data, features)
+
+        unit_texts, stale = {}, []
+        for unit, key in fingerprints.items():
+            text = self._get(key)
+            if text is None:
+                stale.append(unit)
+            else:
+                unit_texts[unit] = text
+        self.stats['sections_reused'] += len(unit_texts)
+
+        if stale:
+            self.stats['llm_calls'] += 1
+            self.stats['sections_recomputed'] += len(stale)
+            completion = self.provider.complete(self.build_prompt(stale, resume_data, features))
+            generated = self.system.parse_tailored_sections(completion)
+            for unit in stale:
+                unit_texts[unit] = generated.get(unit, '')
+                # A unit the model skipped is retried on the next call
+                if unit in generated:
+                    self._put(fingerprints[unit], generated[unit])
+
+        # Per-entry units are joined back into their section, in entry order
+        tailored_sections = {}
+        for unit in fingerprints:
+            section = _unit_section(unit)
+            if section in tailored_sections:
+                tailored_sections[section] += '\n\n' + unit_texts[unit]
+            else:
+                tailored_sections[section] = unit_texts[unit]
+        result = self.system.compose_tailored_resume(job_description, resume_data, tailored_sections)
+        result['recomputed_sections'] = stale
+        return result
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Semantic Tailoring Cache
+Reuses tailoring results for near-duplicate job descriptions
+"""
+
+import random
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from job_normalization import TermNormalizer, get_normalizer
+
+
+class HashingEmbedder:
+    """Local bag-of-ngrams embedding using the signed hashing trick.
+
+    Terms are canonicalized first, so "Sr. SWE" and "Senior Software
+    Engineer" land on the same features. crc32 keeps the hash stable across
+    processes, unlike the builtin ``hash``.
+    """
+
+    def __init__(self, dim: int = 512, normalizer: TermNormalizer = None):
+        self.dim = dim
+        self.normalizer = normalizer or get_normalizer()
+
+    def _features(self, text: str) -> List[str]:
+        terms = list(self.normalizer.canonical_terms(text or ''))
+        return terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+    def embed(self, text: str) -> np.ndarray:
+        """Unit-length float32 vector for ``text``"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            bucket = zlib.crc32(feature.encode('utf-8'))
+            vector[bucket % self.dim] += 1.0 if bucket & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class _Partition:
+    """Embeddings and results for one (model, template, resume) combination"""
+
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.sections: List[Dict[str, str]] = []
+
+
+class SemanticTailoringCache:
+    """Similarity-threshold cache in front of the LLM.
+
+    Results are only ever reused for the same resume, model and prompt
+    template; within that partition the most similar prior job description
+    wins if its cosine similarity clears ``threshold``. A ``verify_rate``
+    fraction of hits is turned into a real LLM call, and the fresh result is
+    compared with the cached one to estimate precision.
+    """
+
+    def __init__(self, threshold: float = 0.92, embedder: HashingEmbedder = None,
+                 max_partitions: int = 10000, max_entries_per_partition: int = 256,
+                 verify_rate: float = 0.0, acceptance: float = 0.8):
+        self.threshold = threshold
+        self.embedder = embedder or HashingEmbedder()
+        self.max_partitions = max_partitions
+        self.max_entries_per_partition = max_entries_per_partition
+        self.verify_rate = verify_rate
+        self.acceptance = acceptance
+        self._partitions: 'OrderedDict[Tuple[str, str, str], _Partition]' = OrderedDict()
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.verified = 0
+        self.verified_accepted = 0
+        self._hit_similarity_total = 0.0
+
+    def lookup(self, partition_key: Tuple[str, str, str], job_description: str,
+               request_key: str = None) -> Optional[Dict[str, str]]:
+        """Sections from the most similar prior job description, if close enough"""
+        query = self.embedder.embed(job_description)
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if partition is None or not partition.sections:
+                self.misses += 1
+                return None
+            self._partitions.move_to_end(partition_key)
+            similarities = partition.vectors @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            sections = partition.sections[best]
+            if request_key and self.verify_rate and random.random() < self.verify_rate:
+                # Force a real call; put() will score the cached answer against it
+                self._pending[request_key] = sections
+                return None
+            self.hits += 1
+            self._hit_similarity_total += similarity
+            return sections
+
+    def discard(self, request_key: str):
+        """Forget a verification sample whose LLM call never produced a result"""
+        if not self._pending:
+            return
+        with self._lock:
+            self._pending.pop(request_key, None)
+
+    def _text_similarity(self, a: Dict[str, str], b: Dict[str, str]) -> float:
+        left = self.embedder.embed(' '.join(a[k] for k in sorted(a)))
+        right = self.embedder.embed(' '.join(b[k] for k in sorted(b)))
+        return float(left @ right)
+
+    def put(self, partition_key: Tuple[str, str, str], job_description: str,
+            sections: Dict[str, str], request_key: str = None):
+        """Record a fresh tailoring result"""
+        vector = self.embedder.embed(job_description)
+        with self._lock:
+            cached = self._pending.pop(request_key, None) if request_key else None
+            if cached is not None:
+                self.verified += 1
+                if self._text_similarity(cached, sections) >= self.acceptance:
+                    self.verified_accepted += 1
+
+            partition = self._partitions.get(partition_key)
+            if partition is None:
+                partition = self._partitions[partition_key] = _Partition(self.embedder.dim)
+                while len(self._partitions) > self.max_partitions:
+                    self._partitions.popitem(last=False)
+            self._partitions.move_to_end(partition_key)
+            partition.vectors = np.vstack([partition.vectors, vector[np.newaxis, :]])
+            partition.sections.append(sections)
+            overflow = len(partition.sections) - self.max_entries_per_partition
+            if overflow > 0:
+                partition.vectors = partition.vectors[overflow:]
+                partition.sections = partition.sections[overflow:]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and sampled precision of near-duplicate reuse"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'mean_hit_similarity': round(self._hit_similarity_total / self.hits, 4) if self.hits else None,
+            'verified': self.verified,
+            'precision': round(self.verified_accepted / self.verified, 4) if self.verified else None,
+            'threshold': self.threshold,
+            'partitions': len(self._partitions)
+        }
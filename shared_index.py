@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Index Replicas
+One builder publishes the job store and postings; pre-forked workers attach read-only
+"""
+
+import json
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+
+import numpy as np
+
+from company_resolution import CompanyResolver
+from job_normalization import TermNormalizer, get_normalizer
+from job_search_system import AlexAIJobSearchSystem, matches_filters, salary_percentile_report, search_key
+from ranking_features import FeatureStore, rerank_head
+from salary_statistics import SalarySketchStore
+from search_cache import SearchResultCache
+
+_ALIGNMENT = 8
+# Control segment: one little-endian int64 holding the current publish sequence
+_CONTROL_FORMAT = '<q'
+# Segments created by a publisher in this process; those stay tracked
+_OWNED_SEGMENTS = set()
+
+
+def _segment_name(prefix: str, sequence: int) -> str:
+    return f"{prefix}-{sequence}"
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    segment = shared_memory.SharedMemory(name=name)
+    # Attaching registers the segment with this process' resource tracker,
+    # which would unlink it when the worker exits; only the builder owns it
+    if name in _OWNED_SEGMENTS:
+        return segment
+    try:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except Exception:
+        pass
+    return segment
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+    _OWNED_SEGMENTS.add(name)
+    return segment
+
+
+def _unlink(segment: shared_memory.SharedMemory):
+    segment.close()
+    segment.unlink()
+    _OWNED_SEGMENTS.discard(segment.name)
+
+
+def _columnar_index(system) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Flatten the job store and postings into typed arrays (CSR postings)"""
+    terms = sorted(system.job_index)
+    posting_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(system.job_index[term]) for term in terms], out=posting_offsets[1:])
+    posting_docs = np.empty(posting_offsets[-1], dtype=np.int32)
+    posting_freqs = np.empty(posting_offsets[-1], dtype=np.int32)
+    for position, term in enumerate(terms):
+        postings = system.job_index[term]
+        start, end = posting_offsets[position], posting_offsets[position + 1]
+        posting_docs[start:end] = np.fromiter(postings.keys(), dtype=np.int32, count=len(postings))
+        posting_freqs[start:end] = np.fromiter(postings.values(), dtype=np.int32, count=len(postings))
+
+    encoded_jobs = [json.dumps(job, default=str, separators=(',', ':')).encode('utf-8')
+                    for job in system.job_database]
+    job_offsets = np.zeros(len(encoded_jobs) + 1, dtype=np.int64)
+    np.cumsum([len(job) for job in encoded_jobs], out=job_offsets[1:])
+
+    # Posting ids sorted for binary search, so workers need no id dictionary
+    ids = [str(job['id']).encode('utf-8') for job in system.job_database]
+    id_docs = np.asarray(sorted(range(len(ids)), key=ids.__getitem__), dtype=np.int32)
+    id_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum([len(ids[doc_id]) for doc_id in id_docs], out=id_offsets[1:])
+
+    arrays = {
+        'terms': np.frombuffer('\x00'.join(terms).encode('utf-8'), dtype=np.uint8),
+        'posting_offsets': posting_offsets,
+        'posting_docs': posting_docs,
+        'posting_freqs': posting_freqs,
+        'doc_lengths': np.asarray(system.doc_lengths, dtype=np.int32),
+        'job_offsets': job_offsets,
+        'jobs': np.frombuffer(b''.join(encoded_jobs), dtype=np.uint8),
+        'id_text': np.frombuffer(b''.join(ids[doc_id] for doc_id in id_docs), dtype=np.uint8),
+        'id_offsets': id_offsets,
+        'id_docs': id_docs,
+        'companies': np.frombuffer(pickle.dumps(system.companies.to_dict()), dtype=np.uint8),
+        'salary_sketches': np.frombuffer(pickle.dumps(system.salary_sketches.to_dict()), dtype=np.uint8),
+        'company_postings': system.features.company_postings,
+    }
+    # Reranker feature columns, so replicas can rescore like the builder
+    for name in FeatureStore.COLUMNS:
+        arrays[f'feature_{name}'] = system.features.columns[name][:len(system.job_database)]
+    header = {
+        'index_generation': system.index_generation,
+        'doc_count': len(system.job_database),
+        'term_count': len(terms),
+        'total_terms': system.total_terms,
+    }
+    return header, arrays
+
+
+class SharedIndexPublisher:
+    """Publishes index generations into shared memory.
+
+    Each publish writes a complete new segment and only then bumps the
+    sequence in the control segment, so workers swap atomically from one
+    complete generation to the next. Superseded segments are unlinked;
+    workers still attached keep their mapping until they move on.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.sequence = 0
+        self._segments: Dict[int, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
+        try:
+            self.control = _create(f"{prefix}-ctl", struct.calcsize(_CONTROL_FORMAT))
+        except FileExistsError:
+            # A previous builder died without cleaning up; take the segment over
+            self.control = shared_memory.SharedMemory(name=f"{prefix}-ctl")
+            _OWNED_SEGMENTS.add(self.control.name)
+            self.sequence = struct.unpack_from(_CONTROL_FORMAT, self.control.buf)[0]
+
+    def attach(self, system) -> 'SharedIndexPublisher':
+        """Republish after every index refresh"""
+        system.on_index_refresh(self.publish)
+        return self
+
+    def publish(self, system) -> Dict[str, Any]:
+        """Write the system's current index as a new generation"""
+        started = time.time()
+        with system.index_lock:
+            header, arrays = _columnar_index(system)
+
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            offset += -offset % _ALIGNMENT
+            layout[name] = [offset, array.dtype.str, int(array.size)]
+            offset += array.nbytes
+        header['arrays'] = layout
+        encoded_header = json.dumps(header).encode('utf-8')
+        data_start = 8 + len(encoded_header)
+        data_start += -data_start % _ALIGNMENT
+
+        with self._lock:
+            sequence = self.sequence + 1
+            name = _segment_name(self.prefix, sequence)
+            try:
+                segment = _create(name, max(data_start + offset, 1))
+            except FileExistsError:
+                _unlink(shared_memory.SharedMemory(name=name))
+                segment = _create(name, max(data_start + offset, 1))
+            struct.pack_into('<Q', segment.buf, 0, len(encoded_header))
+            segment.buf[8:8 + len(encoded_header)] = encoded_header
+            for array_name, array in arrays.items():
+                start = data_start + layout[array_name][0]
+                segment.buf[start:start + array.nbytes] = array.tobytes()
+
+            struct.pack_into(_CONTROL_FORMAT, self.control.buf, 0, sequence)
+            self.sequence = sequence
+            self._segments[sequence] = segment
+            for old in [s for s in self._segments if s < sequence]:
+                _unlink(self._segments.pop(old))
+        return {
+            'segment': name,
+            'index_generation': header['index_generation'],
+            'documents': header['doc_count'],
+            'bytes': segment.size,
+            'seconds': round(time.time() - started, 3),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def close(self):
+        """Unlink every segment this builder owns"""
+        with self._lock:
+            for segment in self._segments.values():
+                _unlink(segment)
+            self._segments.clear()
+            _unlink(self.control)
+
+
+class _SharedIndexView:
+    """Read-only arrays over one attached generation.
+
+    ``readers`` counts searches in progress; a retired view is closed by
+    whichever of the replica's refresh or the last reader finishes later.
+    """
+
+    def __init__(self, name: str, sequence: int, normalizer: TermNormalizer):
+        self.segment = _attach(name)
+        self.sequence = sequence
+        self.normalizer = normalizer
+        self.readers = 0
+        self.retired = False
+        buffer = self.segment.buf
+        (header_length,) = struct.unpack_from('<Q', buffer, 0)
+        self.header = json.loads(bytes(buffer[8:8 + header_length]))
+        data_start = 8 + header_length
+        data_start += -data_start % _ALIGNMENT
+        self.arrays = {}
+        for array_name, (offset, dtype, count) in self.header['arrays'].items():
+            array = np.ndarray((count,), dtype=np.dtype(dtype), buffer=buffer, offset=data_start + offset)
+            array.flags.writeable = False
+            self.arrays[array_name] = array
+        terms = self.arrays['terms'].tobytes().decode('utf-8')
+        # The term dictionary is the only per-worker copy; postings stay shared
+        self.term_ids = {term: i for i, term in enumerate(terms.split('\x00'))} if terms else {}
+        self.doc_count = self.header['doc_count']
+        self.average_length = self.header['total_terms'] / self.doc_count if self.doc_count else 0.0
+        self._companies: Optional[CompanyResolver] = None
+        self._salary_sketches: Optional[SalarySketchStore] = None
+        self._features: Optional[FeatureStore] = None
+
+    @property
+    def companies(self) -> CompanyResolver:
+        if self._companies is None:
+            self._companies = CompanyResolver.from_dict(pickle.loads(self.arrays['companies'].tobytes()))
+        return self._companies
+
+    @property
+    def salary_sketches(self) -> SalarySketchStore:
+        if self._salary_sketches is None:
+            self._salary_sketches = SalarySketchStore.from_dict(
+                pickle.loads(self.arrays['salary_sketches'].tobytes()), self.normalizer
+            )
+        return self._salary_sketches
+
+    @property
+    def features(self) -> FeatureStore:
+        if self._features is None:
+            self._features = FeatureStore.from_columns(
+                {name: self.arrays[f'feature_{name}'] for name in FeatureStore.COLUMNS},
+                self.arrays['company_postings'], _TitleTerms(self)
+            )
+        return self._features
+
+    def job(self, doc_id: int) -> Dict[str, Any]:
+        offsets = self.arrays['job_offsets']
+        return json.loads(self.arrays['jobs'][offsets[doc_id]:offsets[doc_id + 1]].tobytes())
+
+    def _id_at(self, position: int) -> bytes:
+        offsets = self.arrays['id_offsets']
+        return self.arrays['id_text'][offsets[position]:offsets[position + 1]].tobytes()
+
+    def doc_id(self, job_id: str) -> Optional[int]:
+        """Doc id of a posting id, by binary search over the sorted ids"""
+        target = str(job_id).encode('utf-8')
+        low, high = 0, self.doc_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.doc_count and self._id_at(low) == target:
+            return int(self.arrays['id_docs'][low])
+        return None
+
+    def close(self):
+        self.arrays = {}
+        self._features = None
+        try:
+            self.segment.close()
+        except BufferError:
+            # A caller still holds an array; the mapping is freed with it
+            pass
+
+
+class _TitleTerms:
+    """Canonical title terms per doc id, decoded from the shared postings on demand"""
+
+    def __init__(self, view: _SharedIndexView):
+        self.view = view
+
+    def __len__(self) -> int:
+        return self.view.doc_count
+
+    def __getitem__(self, doc_id: int) -> frozenset:
+        return frozenset((self.view.job(doc_id).get('canonical_title') or '').split())
+
+
+class SharedIndexReplica:
+    """Read-only search over the newest generation published under ``prefix``.
+
+    ``search_jobs``, ``iter_search``, ``get_job`` and ``salary_percentile``
+    match AlexAIJobSearchSystem. Each call checks the control segment (one
+    8-byte read) and swaps to a newer generation first; a generation stays
+    mapped until the last call reading it returns. Results are reranked when
+    a reranker is set but never personalized, since user vectors live in the
+    process that records interactions.
+    """
+
+    BM25_K1 = AlexAIJobSearchSystem.BM25_K1
+    BM25_B = AlexAIJobSearchSystem.BM25_B
+    CACHED_RESULTS = AlexAIJobSearchSystem.CACHED_RESULTS
+    RERANK_DEPTH = AlexAIJobSearchSystem.RERANK_DEPTH
+
+    def __init__(self, prefix: str, normalizer: TermNormalizer = None, reranker=None):
+        self.prefix = prefix
+        self.normalizer = normalizer or get_normalizer()
+        self.reranker = reranker
+        self.search_cache = SearchResultCache()
+        self.control = _attach(f"{prefix}-ctl")
+        self.sequence = 0
+        self._view: Optional[_SharedIndexView] = None
+        self._lock = threading.Lock()
+        self._reranker_version = 0
+        self._refresh_listeners: List[Callable[['SharedIndexReplica'], None]] = []
+        self.refresh()
+
+    @property
+    def index_generation(self) -> int:
+        return self._view.header['index_generation'] if self._view else 0
+
+    def on_index_refresh(self, listener: Callable[['SharedIndexReplica'], None]):
+        """Register a callback run after the replica moves to a new generation"""
+        self._refresh_listeners.append(listener)
+
+    def set_reranker(self, reranker):
+        """Rescore the top BM25 candidates like AlexAIJobSearchSystem.set_reranker (None disables)"""
+        with self._lock:
+            self.reranker = reranker
+            self._reranker_version += 1
+
+    def _retire(self, view: _SharedIndexView):
+        # Called with the lock held
+        view.retired = True
+        if not view.readers:
+            view.close()
+
+    def refresh(self) -> bool:
+        """Attach the latest published generation; True if it changed"""
+        sequence = struct.unpack_from(_CONTROL_FORMAT, self.control.buf)[0]
+        if sequence == self.sequence:
+            return False
+        with self._lock:
+            changed = False
+            while sequence != self.sequence:
+                try:
+                    view = _SharedIndexView(_segment_name(self.prefix, sequence), sequence, self.normalizer)
+                except FileNotFoundError:
+                    # Superseded between reading the control block and attaching
+                    sequence = struct.unpack_from(_CONTROL_FORMAT, self.control.buf)[0]
+                    continue
+                previous, self._view, self.sequence = self._view, view, sequence
+                if previous is not None:
+                    self._retire(previous)
+                changed = True
+        if changed:
+            for listener in self._refresh_listeners:
+                listener(self)
+        return changed
+
+    @contextmanager
+    def _reading(self) -> Iterator[Optional[_SharedIndexView]]:
+        """The current view, kept mapped until the block exits; None before the first publish"""
+        self.refresh()
+        with self._lock:
+            view = self._view
+            if view is not None:
+                view.readers += 1
+        if view is None:
+            yield None
+            return
+        try:
+            yield view
+        finally:
+            with self._lock:
+                view.readers -= 1
+                if view.retired and not view.readers:
+                    view.close()
+
+    def parse_query(self, query: str) -> List[str]:
+        """Canonical, de-duplicated query terms"""
+        return list(dict.fromkeys(self.normalizer.canonical_terms(query or '')))
+
+    def _score_terms(self, view: _SharedIndexView, terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = view.arrays['posting_offsets']
+        doc_chunks, weight_chunks = [], []
+        for term in terms:
+            term_id = view.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = offsets[term_id], offsets[term_id + 1]
+            docs = view.arrays['posting_docs'][start:end]
+            frequencies = view.arrays['posting_freqs'][start:end].astype(np.float64)
+            idf = np.log(1 + (view.doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            length_norm = 1 - self.BM25_B + self.BM25_B * view.arrays['doc_lengths'][docs] / view.average_length
+            doc_chunks.append(docs)
+            weight_chunks.append(idf * frequencies * (self.BM25_K1 + 1) / (frequencies + self.BM25_K1 * length_norm))
+        if not doc_chunks:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        doc_ids, inverse = np.unique(np.concatenate(doc_chunks), return_inverse=True)
+        return doc_ids, np.bincount(inverse, weights=np.concatenate(weight_chunks))
+
+    def _rank(self, view: _SharedIndexView, terms: List[str], location: str,
+              filters: Dict) -> List[Tuple[int, float]]:
+        if terms:
+            doc_ids, scores = self._score_terms(view, terms)
+            order = np.lexsort((doc_ids, -scores))
+            ranked = list(zip(doc_ids[order].tolist(), scores[order].tolist()))
+        else:
+            ranked = [(doc_id, 0.0) for doc_id in range(view.doc_count)]
+        if location or filters:
+            ranked = [(doc_id, score) for doc_id, score in ranked
+                      if self._matches_filters(view, view.job(doc_id), location, filters)]
+        reranker = self.reranker
+        if reranker is not None and terms and ranked:
+            ranked = rerank_head(reranker, view.features, view.salary_sketches, view.job,
+                                 ranked, terms, self.RERANK_DEPTH)
+        return ranked
+
+    def search_jobs(self, query: str, location: str = None, filters: Dict = None,
+                    limit: int = 20, user_id: str = None) -> Dict[str, Any]:
+        """Search the shared index; ``user_id`` is accepted but results are not personalized"""
+        filters = filters or {}
+        terms = self.parse_query(query)
+        key = search_key(terms, location, filters)
+        with self._reading() as view:
+            if view is None:
+                return self._empty_results(query, terms, location, filters)
+            generation = (view.sequence, self._reranker_version)
+            cached = self.search_cache.get(key, generation) if limit <= self.CACHED_RESULTS else None
+            if cached is not None:
+                ranked, total_count = cached
+            else:
+                ranked = self._rank(view, terms, location, filters)
+                total_count = len(ranked)
+                if limit <= self.CACHED_RESULTS:
+                    self.search_cache.put(key, generation, ranked[:self.CACHED_RESULTS], total_count)
+            results = [dict(view.job(doc_id), score=round(score, 4)) for doc_id, score in ranked[:limit]]
+            index_generation = view.header['index_generation']
+
+        return {
+            'query': query,
+            'parsed_query': terms,
+            'location': location,
+            'filters': filters,
+            'results': results,
+            'total_count': total_count,
+            'personalized': False,
+            'index_generation': index_generation,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _empty_results(query: str, terms: List[str], location: str, filters: Dict) -> Dict[str, Any]:
+        # Nothing has been published yet
+        return {
+            'query': query,
+            'parsed_query': terms,
+            'location': location,
+            'filters': filters,
+            'results': [],
+            'total_count': 0,
+            'personalized': False,
+            'index_generation': 0,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def iter_search(self, query: str, location: str = None, filters: Dict = None,
+                    ranked: bool = True) -> Iterator[Tuple[Dict[str, Any], float]]:
+        """Lazily yield (posting, score) for every match, from one generation throughout"""
+        filters = filters or {}
+        terms = self.parse_query(query)
+        with self._reading() as view:
+            if view is None:
+                return
+            if ranked:
+                for doc_id, score in self._rank(view, terms, location, filters):
+                    yield view.job(doc_id), score
+                return
+            if terms:
+                # Postings are merged in doc order, so this needs no sort
+                doc_ids, scores = self._score_terms(view, terms)
+                candidates = zip(doc_ids.tolist(), scores.tolist())
+            else:
+                candidates = ((doc_id, 0.0) for doc_id in range(view.doc_count))
+            for doc_id, score in candidates:
+                job = view.job(doc_id)
+                if self._matches_filters(view, job, location, filters):
+                    yield job, score
+
+    def _matches_filters(self, view: _SharedIndexView, job: Dict, location: str, filters: Dict) -> bool:
+        # Same rules as the builder; the resolver comes from the attached generation
+        return matches_filters(job, location, filters, view.companies, self.normalizer)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Stored posting by id"""
+        with self._reading() as view:
+            doc_id = view.doc_id(job_id) if view is not None else None
+            return view.job(doc_id) if doc_id is not None else None
+
+    def salary_percentile(self, title: str, location: str, salary: float) -> Dict[str, Any]:
+        """Where a salary falls among the published postings for the same title and metro"""
+        with self._reading() as view:
+            sketches = view.salary_sketches if view is not None else SalarySketchStore(self.normalizer)
+            return salary_percentile_report(sketches, title, location, salary)
+
+    def close(self):
+        """Detach from shared memory (segments stay owned by the builder)"""
+        with self._lock:
+            if self._view is not None:
+                self._retire(self._view)
+                self._view = None
+            self.control.close()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Synthetic Job Corpus
+Deterministic postings, resumes and search queries for benchmarks and tests
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Any
+
+# Spelling variants are deliberate: the corpus should exercise title, skill,
+# company and location normalization the way scraped postings do
+TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Sr. Software Engineer', 'Software Engineer II',
+    'Backend Developer', 'Back-End Engineer', 'Frontend Engineer', 'Full Stack Developer',
+    'Data Engineer', 'Senior Data Engineer', 'Data Scientist', 'ML Engineer', 'Machine Learning Engineer',
+    'SRE', 'Site Reliability Engineer', 'DevOps Engineer', 'Product Manager', 'Engineering Manager',
+    'Staff Engineer', 'Principal Engineer', 'Data Analyst', 'QA Engineer', 'Mobile Developer',
+    'Security Engineer', 'Solutions Architect',
+]
+SKILLS = [
+    'Python', 'JavaScript', 'JS', 'TypeScript', 'Java', 'Go', 'Golang', 'SQL', 'PostgreSQL', 'Postgres',
+    'AWS', 'GCP', 'Docker', 'Kubernetes', 'K8s', 'React', 'React.js', 'Node.js', 'Terraform', 'Kafka',
+    'Spark', 'Airflow', 'Snowflake', 'dbt', 'Redis', 'GraphQL', 'Rust', 'C++', 'Scala', 'ML',
+    'Machine Learning', 'TensorFlow', 'PyTorch', 'CI', 'Linux', 'Swift', 'Kotlin', 'Figma',
+]
+COMPANY_NAMES = [
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Soylent',
+    'Cyberdyne', 'Tyrell', 'Wonka', 'Vandelay', 'Pied Piper', 'Massive Dynamic', 'Aperture', 'Black Mesa',
+    'Oscorp', 'Gringotts', 'Monarch', 'Dunder Mifflin',
+]
+COMPANY_SUFFIXES = ['', ' Inc', ' Inc.', ', Inc.', ' LLC', ' Corp', ' Corporation', ' Labs']
+LOCATIONS = [
+    'San Francisco, CA', 'SF', 'Bay Area', 'New York, NY', 'NYC', 'Brooklyn, NY', 'Seattle, WA',
+    'Bellevue, WA', 'Austin, TX', 'Boston, MA', 'Cambridge, MA', 'Chicago, IL', 'Denver, CO',
+    'Los Angeles, CA', 'Washington, DC', 'Remote', 'London, UK', 'Berlin, Germany', 'Toronto, ON',
+]
+# (format, low, high) in the currency/period the format implies
+SALARY_FORMATS = [
+    ('${low:,} - ${high:,}', 80000, 220000),
+    ('${low}k-${high}k', 80, 220),
+    ('{low}k-{high}k GBP', 50, 140),
+    ('€{low:,}/month', 4000, 11000),
+    ('${low}/hr', 35, 140),
+    ('C${low}k - C${high}k', 70, 190),
+]
+TEAMS = ['Payments', 'Platform', 'Growth', 'Search', 'Infrastructure', 'Analytics', 'Identity', 'Checkout']
+DESCRIPTION_FRAGMENTS = [
+    "We are looking for a {title} to join our {team} team.",
+    "You will design, build and operate services used by millions of customers.",
+    "Requirements: {years}+ years of experience with {skill_a} and {skill_b}.",
+    "Experience with {skill_c} in production is a strong plus.",
+    "You will collaborate with product, design and data science on customer-facing features.",
+    "Responsibilities include code reviews, mentoring and writing technical designs.",
+    "Our stack includes {skill_a}, {skill_c}, {skill_d} and a lot of automation.",
+    "Familiarity with observability tooling and on-call rotations is expected.",
+]
+BOILERPLATE_FRAGMENTS = [
+    "We offer medical, dental and vision insurance, a 401(k) match and unlimited PTO.",
+    "We are an equal opportunity employer and do not discriminate on the basis of race, gender identity "
+    "or sexual orientation.",
+    "If you need a reasonable accommodation during the application process, please let us know.",
+    "We do not accept unsolicited resumes from recruitment agencies.",
+]
+QUERY_TYPES = ['keyword', 'multi_term', 'filtered', 'location', 'salary_browse']
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def _zipf_weights(count: int, exponent: float = 1.0) -> List[float]:
+    """Cumulative rank weights, so a few skills and titles dominate like in real postings"""
+    return list(accumulate(1.0 / (rank + 1) ** exponent for rank in range(count)))
+
+
+_TITLE_WEIGHTS = _zipf_weights(len(TITLES), 0.8)
+_SKILL_WEIGHTS = _zipf_weights(len(SKILLS), 0.9)
+_COMPANY_WEIGHTS = _zipf_weights(len(COMPANY_NAMES), 1.1)
+_LOCATION_WEIGHTS = _zipf_weights(len(LOCATIONS), 0.7)
+
+
+def _salary(rng: random.Random) -> str:
+    template, low_bound, high_bound = rng.choice(SALARY_FORMATS)
+    low = rng.randint(low_bound, (low_bound + high_bound) // 2)
+    high = rng.randint(low, high_bound)
+    if low_bound >= 1000:
+        # Round large figures the way postings state them
+        low, high = round(low, -3), round(high, -3)
+    return template.format(low=low, high=high)
+
+
+def generate_jobs(count: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` postings; the same seed always yields the same corpus.
+
+    Postings are generated lazily, so millions can be streamed into an
+    index or a file without holding them all.
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        title = rng.choices(TITLES, cum_weights=_TITLE_WEIGHTS)[0]
+        skills = list(dict.fromkeys(rng.choices(SKILLS, cum_weights=_SKILL_WEIGHTS, k=rng.randint(3, 8))))
+        padded = skills + rng.sample(SKILLS, 4)
+        values = {
+            'title': title, 'team': rng.choice(TEAMS), 'years': rng.randint(2, 8),
+            'skill_a': padded[0], 'skill_b': padded[1], 'skill_c': padded[2], 'skill_d': padded[3],
+        }
+        fragments = rng.sample(DESCRIPTION_FRAGMENTS, rng.randint(3, len(DESCRIPTION_FRAGMENTS)))
+        fragments += rng.sample(BOILERPLATE_FRAGMENTS, rng.randint(0, len(BOILERPLATE_FRAGMENTS)))
+        company = rng.choices(COMPANY_NAMES, cum_weights=_COMPANY_WEIGHTS)[0] + rng.choice(COMPANY_SUFFIXES)
+        location = rng.choices(LOCATIONS, cum_weights=_LOCATION_WEIGHTS)[0]
+        job = {
+            'id': f"synthetic_{seed}_{index}",
+            'title': title,
+            'company': company,
+            'location': location,
+            'remote': location == 'Remote' or rng.random() < 0.15,
+            'skills': skills,
+            'description': ' '.join(fragment.format(**values) for fragment in fragments),
+            'posted_at': (EPOCH - timedelta(minutes=rng.randint(0, 60 * 24 * 90))).isoformat(),
+            'company_rating': round(rng.uniform(2.5, 5.0), 1),
+        }
+        if rng.random() < 0.7:
+            job['salary'] = _salary(rng)
+        yield job
+
+
+def generate_resumes(count: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """Candidate resumes in the structure ``tailor_resume`` and matching expect"""
+    rng = random.Random(seed)
+    resumes = []
+    for index in range(count):
+        skills = list(dict.fromkeys(rng.choices(SKILLS, cum_weights=_SKILL_WEIGHTS, k=rng.randint(4, 10))))
+        titles = rng.sample(TITLES, 2)
+        resumes.append({
+            'name': f"Candidate {index}",
+            'summary': f"{titles[0]} with {rng.randint(2, 15)} years building {rng.choice(TEAMS).lower()} "
+                       f"systems in {skills[0]} and {skills[-1]}.",
+            'skills': skills,
+            'experience': [
+                {'title': role, 'company': rng.choice(COMPANY_NAMES),
+                 'description': f"Built and ran {rng.choice(TEAMS).lower()} services with "
+                                f"{', '.join(rng.sample(skills, min(3, len(skills))))}."}
+                for role in titles
+            ],
+        })
+    return resumes
+
+
+def generate_queries(count: int, seed: int = 13) -> List[Dict[str, Any]]:
+    """Search requests spread evenly over QUERY_TYPES, each tagged with its type"""
+    rng = random.Random(seed)
+    queries = []
+    for index in range(count):
+        query_type = QUERY_TYPES[index % len(QUERY_TYPES)]
+        skill = rng.choices(SKILLS, cum_weights=_SKILL_WEIGHTS)[0]
+        title = rng.choices(TITLES, cum_weights=_TITLE_WEIGHTS)[0]
+        request = {'type': query_type, 'query': skill, 'location': None, 'filters': {}}
+        if query_type == 'multi_term':
+            request['query'] = f"{title} {skill}"
+        elif query_type == 'filtered':
+            request['query'] = title
+            request['filters'] = {'skills': [skill], 'remote': rng.random() < 0.5}
+        elif query_type == 'location':
+            request['query'] = title
+            request['location'] = rng.choices(LOCATIONS, cum_weights=_LOCATION_WEIGHTS)[0].split(',')[0]
+        elif query_type == 'salary_browse':
+            request['query'] = ''
+            request['filters'] = {'min_salary': rng.randrange(80000, 200000, 10000)}
+        queries.append(request)
+    return queries
+
+
+def write_jsonl(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """Stream records to a JSON Lines file, returning how many were written"""
+    written = 0
+    with open(path, 'w') as handle:
+        for record in records:
+            handle.write(json.dumps(record) + '\n')
+            written += 1
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a deterministic synthetic job corpus as JSON Lines')
+    parser.add_argument('--postings', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', default='synthetic_jobs.jsonl')
+    args = parser.parse_args()
+    print(json.dumps({'output': args.output,
+                      'postings': write_jsonl(args.output, generate_jobs(args.postings, args.seed))}))
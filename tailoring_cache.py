@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tailoring Response Cache
+Content-addressed SQLite cache for LLM tailoring results with LRU eviction
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+def normalize_job_description(job_description: str) -> str:
+    """Whitespace- and case-insensitive form used for cache keys"""
+    return ' '.join((job_description or '').split()).lower()
+
+
+def resume_hash(resume_data: Dict) -> str:
+    """Stable hash of structured resume data"""
+    payload = json.dumps(resume_data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def tailoring_cache_key(model: str, template_version: str, job_description: str,
+                        resume_data: Dict) -> str:
+    """Content address of a tailoring request"""
+    parts = [model, template_version, normalize_job_description(job_description), resume_hash(resume_data)]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class TailoringCache:
+    """Persistent LRU cache of tailored sections keyed by content hash.
+
+    Entries live in a single SQLite file. Total payload size is bounded by
+    ``max_bytes``; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str = 'tailoring_cache.sqlite3', max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tailoring_cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_tailoring_cache_last_access ON tailoring_cache (last_access)'
+        )
+        self._conn.commit()
+        self.total_bytes = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM tailoring_cache'
+        ).fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Cached tailored sections, refreshing the entry's recency"""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM tailoring_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE tailoring_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, sections: Dict[str, str]):
+        """Store tailored sections, evicting LRU entries past the size budget"""
+        value = json.dumps(sections, sort_keys=True)
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM tailoring_cache WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO tailoring_cache (key, value, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, value, size, time.time())
+            )
+            self.total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM tailoring_cache ORDER BY last_access LIMIT 64'
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute('DELETE FROM tailoring_cache WHERE key = ?', (key,))
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate and size metrics"""
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM tailoring_cache').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
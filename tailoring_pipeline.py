@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Batch Resume Tailoring Pipeline
+Bounded-concurrency asyncio tailoring with rate limits, retries and coalescing
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Dict, List, Any
+
+from llm_providers import LLMProvider, TransientLLMError
+
+
+class AsyncRateLimiter:
+    """Token bucket limiting how fast requests start against one provider"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be issued"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimiter:
+    """Blocking token bucket for synchronous callers; a batch may take several tokens at once"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int = 1):
+        """Wait until ``count`` requests may be issued"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going into debt makes later callers wait for this batch too
+            self._tokens -= count
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt + 1``"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class BatchTailoringPipeline:
+    """Tailors many (job description, resume) pairs concurrently.
+
+    A global semaphore bounds in-flight LLM calls, each provider gets its own
+    token bucket, transient errors are retried with full-jitter exponential
+    backoff, and identical prompts in flight at the same time share a single
+    provider call.
+    """
+
+    def __init__(self, system, providers: Dict[str, LLMProvider], default_provider: str = None,
+                 max_concurrency: int = 32, max_retries: int = 4,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        if not providers:
+            raise ValueError("At least one provider is required")
+        self.system = system
+        self.providers = providers
+        self.default_provider = default_provider or next(iter(providers))
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = {
+            'requested': 0,
+            'completed': 0,
+            'failed': 0,
+            'provider_calls': 0,
+            'retries': 0,
+            'coalesced': 0,
+            'cache_hits': 0,
+            'prompt_tokens_saved': 0
+        }
+        self._reset_loop_state()
+
+    def _reset_loop_state(self):
+        # asyncio primitives are bound to the running loop, so they are
+        # created lazily per batch run.
+        self._semaphore = None
+        self._limiters = {}
+        self._in_flight = {}
+
+    def _ensure_loop_state(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._limiters = {
+                name: AsyncRateLimiter(provider.requests_per_second)
+                for name, provider in self.providers.items()
+                if provider.requests_per_second
+            }
+
+    def _backoff(self, attempt: int) -> float:
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+
+    async def _call_provider(self, provider_name: str, prompt: str) -> str:
+        provider = self.providers[provider_name]
+        limiter = self._limiters.get(provider_name)
+        attempt = 0
+        while True:
+            # Wait on the provider's bucket before taking a global slot, so a
+            # throttled provider cannot hold slots other providers could use
+            if limiter is not None:
+                await limiter.acquire()
+            async with self._semaphore:
+                self.stats['provider_calls'] += 1
+                try:
+                    return await provider.acomplete(prompt)
+                except TransientLLMError:
+                    if attempt >= self.max_retries:
+                        raise
+            # Back off outside the semaphore so waiting retries free their slot
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+            self.stats['retries'] += 1
+
+    async def _complete(self, provider_name: str, prompt: str) -> str:
+        provider = self.providers[provider_name]
+        key = hashlib.sha256(f"{provider_name}\0{provider.model}\0{prompt}".encode('utf-8')).hexdigest()
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(task)
+        task = asyncio.ensure_future(self._call_provider(provider_name, prompt))
+        self._in_flight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._in_flight.pop(key, None)
+
+    async def tailor_one(self, job_description: str, resume_data: Dict,
+                         provider: str = None) -> Dict[str, Any]:
+        """Tailor a single resume; failures are reported, not raised"""
+        self._ensure_loop_state()
+        self.stats['requested'] += 1
+        provider_name = provider or self.default_provider
+        provider_obj = self.providers[provider_name]
+        compaction = None
+        sections = self.system.lookup_tailoring(job_description, resume_data, provider_obj)
+        if sections is not None:
+            self.stats['cache_hits'] += 1
+        else:
+            compaction = self.system.compact_job_description(job_description, resume_data)
+            prompt = self.system.build_tailoring_prompt(job_description, resume_data, compaction)
+            self.stats['prompt_tokens_saved'] += compaction['tokens_saved']
+            try:
+                completion = await self._complete(provider_name, prompt)
+                sections = self.system.parse_tailored_sections(completion)
+                self.system.store_tailoring(job_description, resume_data, provider_obj, sections)
+            except Exception as e:
+                self.stats['failed'] += 1
+                result = self.system.compose_tailored_resume(job_description, resume_data)
+                result.update({'status': 'failed', 'error': str(e), 'provider': provider_name})
+                return result
+            finally:
+                self.system.release_tailoring(job_description, resume_data, provider_obj)
+        self.stats['completed'] += 1
+        result = self.system.compose_tailored_resume(job_description, resume_data, sections)
+        result.update({'status': 'tailored', 'provider': provider_name})
+        if compaction is not None:
+            result['prompt_tokens_saved'] = compaction['tokens_saved']
+        return result
+
+    async def tailor_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tailor a batch of {'job_description', 'resume_data', 'provider'} requests, preserving order"""
+        self._reset_loop_state()
+        self._ensure_loop_state()
+        return await asyncio.gather(*[
+            self.tailor_one(item['job_description'], item['resume_data'], item.get('provider'))
+            for item in requests
+        ])
+
+    def run(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Blocking entry point for scripts and overnight jobs"""
+        return asyncio.run(self.tailor_batch(requests))
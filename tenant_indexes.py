@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Multi-Tenant Job Indexes
+Per-tenant search systems with lazy loading, LRU unloading and query quotas
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional
+
+from index_snapshot import IndexSnapshotter
+
+# Rough per-object costs used to estimate a tenant's resident index size
+POSTING_BYTES = 96
+TERM_BYTES = 160
+DOC_OVERHEAD_BYTES = 400
+
+# A leading alphanumeric rules out '.', '..' and hidden directories
+_TENANT_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9_.-]{0,63}')
+
+
+class TenantQuotaExceeded(Exception):
+    """Raised when a tenant already has its maximum number of queries in flight"""
+
+
+def estimate_index_bytes(system) -> int:
+    """Approximate memory held by a system's job store and index"""
+    postings = sum(len(docs) for docs in system.job_index.values())
+    stored = sum(len(str(value)) for job in system.job_database for value in job.values())
+    return (postings * POSTING_BYTES + len(system.job_index) * TERM_BYTES
+            + len(system.job_database) * DOC_OVERHEAD_BYTES + stored)
+
+
+class _Tenant:
+    """A loaded tenant and its bookkeeping"""
+
+    def __init__(self, system):
+        self.system = system
+        self.bytes = estimate_index_bytes(system)
+        self.dirty = False
+        self.active = 0
+
+
+class TenantIndexManager:
+    """Isolated ``AlexAIJobSearchSystem`` per tenant.
+
+    Tenants are loaded on first use, from their latest snapshot under
+    ``snapshot_root/<tenant>`` when one exists. When the estimated size of
+    loaded tenants exceeds ``memory_budget_bytes``, the least recently used
+    idle tenants are snapshotted (if changed) and unloaded. Unloading needs
+    ``snapshot_root``; without it tenants stay resident.
+
+    Each tenant may run at most ``max_concurrent_queries`` searches at once
+    (overridable per tenant through ``quotas``). Callers over the quota wait
+    up to ``queue_timeout`` seconds and then get TenantQuotaExceeded, so a
+    heavy tenant queues behind itself rather than slowing everyone else.
+    """
+
+    def __init__(self, system_factory: Callable[[], Any], snapshot_root: str = None,
+                 memory_budget_bytes: int = 512 * 1024 * 1024, max_concurrent_queries: int = 4,
+                 quotas: Dict[str, int] = None, queue_timeout: float = 0.5, snapshot_keep: int = 2):
+        self.system_factory = system_factory
+        self.snapshot_root = snapshot_root
+        self.memory_budget_bytes = memory_budget_bytes
+        self.max_concurrent_queries = max_concurrent_queries
+        self.quotas = dict(quotas or {})
+        self.queue_timeout = queue_timeout
+        self.snapshot_keep = snapshot_keep
+        self._tenants: 'OrderedDict[str, _Tenant]' = OrderedDict()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+        self.rejected: Dict[str, int] = {}
+
+    @staticmethod
+    def validate_tenant(tenant_id: str) -> str:
+        """Tenant ids double as directory names, so keep them to a safe alphabet"""
+        if not isinstance(tenant_id, str) or not _TENANT_PATTERN.fullmatch(tenant_id):
+            raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+        return tenant_id
+
+    def _snapshotter(self, tenant_id: str) -> Optional[IndexSnapshotter]:
+        if not self.snapshot_root:
+            return None
+        root = os.path.realpath(self.snapshot_root)
+        path = os.path.realpath(os.path.join(root, self.validate_tenant(tenant_id)))
+        if os.path.dirname(path) != root:
+            raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+        return IndexSnapshotter(path, keep=self.snapshot_keep)
+
+    def _semaphore(self, tenant_id: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(tenant_id)
+            if semaphore is None:
+                limit = self.quotas.get(tenant_id, self.max_concurrent_queries)
+                semaphore = self._semaphores[tenant_id] = threading.BoundedSemaphore(limit)
+            return semaphore
+
+    def _acquire(self, tenant_id: str) -> _Tenant:
+        """Load (if needed), pin and LRU-touch a tenant"""
+        tenant_id = self.validate_tenant(tenant_id)
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is not None:
+                tenant.active += 1
+                self._tenants.move_to_end(tenant_id)
+                return tenant
+            load_lock = self._load_locks.setdefault(tenant_id, threading.Lock())
+
+        # Loads of different tenants proceed in parallel; one loader per tenant
+        with load_lock:
+            with self._lock:
+                tenant = self._tenants.get(tenant_id)
+                if tenant is not None:
+                    tenant.active += 1
+                    self._tenants.move_to_end(tenant_id)
+                    return tenant
+            system = self.system_factory()
+            snapshotter = self._snapshotter(tenant_id)
+            if snapshotter is not None and snapshotter.latest():
+                snapshotter.restore(system)
+            tenant = _Tenant(system)
+            tenant.active = 1
+            with self._lock:
+                self._tenants[tenant_id] = tenant
+                self.loads += 1
+        self._enforce_budget()
+        return tenant
+
+    def _release(self, tenant: _Tenant):
+        with self._lock:
+            tenant.active -= 1
+
+    def _enforce_budget(self):
+        if not self.snapshot_root:
+            return
+        while True:
+            with self._lock:
+                if self.resident_bytes() <= self.memory_budget_bytes:
+                    return
+                victim = None
+                # Never unload the most recent tenant or one with work in flight
+                for tenant_id, tenant in list(self._tenants.items())[:-1]:
+                    load_lock = self._load_locks.setdefault(tenant_id, threading.Lock())
+                    if tenant.active == 0 and load_lock.acquire(blocking=False):
+                        victim = tenant_id
+                        break
+                if victim is None:
+                    return
+                tenant = self._tenants.pop(victim)
+                self.evictions += 1
+            # The load lock stays held until the snapshot is on disk, so a
+            # concurrent reload waits for it instead of reading a stale one
+            try:
+                if tenant.dirty:
+                    self._snapshotter(victim).snapshot(tenant.system)
+            finally:
+                load_lock.release()
+
+    def resident_bytes(self) -> int:
+        """Estimated size of all loaded tenants"""
+        return sum(tenant.bytes for tenant in self._tenants.values())
+
+    def system(self, tenant_id: str):
+        """The tenant's search system, loading it if needed"""
+        tenant = self._acquire(tenant_id)
+        self._release(tenant)
+        return tenant.system
+
+    def ingest_jobs(self, tenant_id: str, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add postings to one tenant's private index"""
+        tenant = self._acquire(tenant_id)
+        try:
+            result = tenant.system.ingest_jobs(jobs)
+            tenant.bytes = estimate_index_bytes(tenant.system)
+            tenant.dirty = True
+        finally:
+            self._release(tenant)
+        self._enforce_budget()
+        return dict(result, tenant_id=tenant_id)
+
+    def search_jobs(self, tenant_id: str, query: str, location: str = None, filters: Dict = None,
+                    limit: int = 20, user_id: str = None) -> Dict[str, Any]:
+        """Search one tenant's postings within its concurrency quota"""
+        semaphore = self._semaphore(self.validate_tenant(tenant_id))
+        if not semaphore.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected[tenant_id] = self.rejected.get(tenant_id, 0) + 1
+            raise TenantQuotaExceeded(f"Tenant {tenant_id} has too many concurrent queries")
+        try:
+            tenant = self._acquire(tenant_id)
+            try:
+                results = tenant.system.search_jobs(query, location=location, filters=filters, limit=limit,
+                                                    user_id=user_id)
+            finally:
+                self._release(tenant)
+        finally:
+            semaphore.release()
+        return dict(results, tenant_id=tenant_id)
+
+    def snapshot_all(self) -> List[Dict[str, Any]]:
+        """Persist every changed loaded tenant"""
+        if not self.snapshot_root:
+            return []
+        with self._lock:
+            dirty = [(tenant_id, tenant) for tenant_id, tenant in self._tenants.items() if tenant.dirty]
+        written = []
+        for tenant_id, tenant in dirty:
+            written.append(dict(self._snapshotter(tenant_id).snapshot(tenant.system), tenant_id=tenant_id))
+            tenant.dirty = False
+        return written
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Residency, eviction and quota counters"""
+        with self._lock:
+            tenants = {
+                tenant_id: {
+                    'documents': len(tenant.system.job_database),
+                    'estimated_bytes': tenant.bytes,
+                    'active_queries': tenant.active,
+                    'dirty': tenant.dirty,
+                }
+                for tenant_id, tenant in self._tenants.items()
+            }
+            return {
+                'loaded_tenants': tenants,
+                'resident_bytes': self.resident_bytes(),
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'loads': self.loads,
+                'evictions': self.evictions,
+                'rejected_queries': dict(self.rejected),
+                'timestamp': datetime.now().isoformat()
+            }
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Text Analysis
+Configurable analyzer chain (NFKC, lowercase, stop words, light stemming) shared by indexing and queries
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Optional
+
+# Only words that never carry meaning in a posting; "it", "go" and single
+# letters stay because they name departments, languages and levels.
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in',
+    'into', 'is', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'was',
+    'we', 'will', 'with', 'you', 'your',
+])
+
+_ASCII_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.+#-][a-z0-9+#]*)*")
+_UNICODE_TOKEN_PATTERN = re.compile(r"[^\W_]+(?:[.+#-](?:[^\W_]|[+#])*)*")
+_SIBILANT_PLURALS = ('sses', 'xes', 'ches', 'shes', 'zes')
+
+
+def light_stem(token: str) -> str:
+    """English plural stripping: 'databases' -> 'database', 'libraries' -> 'library'.
+
+    Deliberately conservative (no -ing/-ed rules) so skill and product names
+    survive; tokens with digits or symbols and short tokens are untouched.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith('ies') and len(token) > 4 and token[-4] not in 'ae':
+        return token[:-3] + 'y'
+    if token.endswith(_SIBILANT_PLURALS):
+        return token[:-2]
+    if token.endswith('s') and token[-2] not in 'sui':
+        return token[:-1]
+    return token
+
+
+class Analyzer:
+    """Text -> index terms, applying each enabled step in order.
+
+    Steps: NFKC normalization, lowercasing, tokenization, stop-word removal
+    and light stemming. ASCII input skips NFKC (it is already normalized)
+    and uses a cheaper tokenizer. Per-token work (stop-word check and
+    stemming) goes through an LRU cache, since a corpus repeats a small
+    vocabulary millions of times. ``protected`` tokens are never stemmed.
+    """
+
+    def __init__(self, unicode_normalize: bool = True, lowercase: bool = True,
+                 stop_words: Iterable[str] = STOP_WORDS, stem: bool = True,
+                 protected: Iterable[str] = (), cache_size: int = 65536):
+        self.unicode_normalize = unicode_normalize
+        self.lowercase = lowercase
+        self.stop_words = frozenset(stop_words or ())
+        self.stem = stem
+        self.protected = frozenset(protected)
+        self.term = lru_cache(maxsize=cache_size)(self._term)
+
+    def _term(self, token: str) -> Optional[str]:
+        """Index term for one token, or None for a stop word"""
+        token = token.rstrip('.-')
+        if not token or token in self.stop_words:
+            return None
+        if self.stem and token not in self.protected:
+            return light_stem(token)
+        return token
+
+    def tokens(self, text: str) -> List[str]:
+        """Raw tokens after normalization and case folding"""
+        if not text:
+            return []
+        if text.isascii():
+            return _ASCII_TOKEN_PATTERN.findall(text.lower() if self.lowercase else text)
+        if self.unicode_normalize:
+            text = unicodedata.normalize('NFKC', text)
+        return _UNICODE_TOKEN_PATTERN.findall(text.lower() if self.lowercase else text)
+
+    def analyze(self, text: str) -> List[str]:
+        """Index terms for ``text``"""
+        term = self.term
+        return [t for t in map(term, self.tokens(text)) if t]
+
+    def cache_info(self) -> Dict[str, int]:
+        """LRU statistics for the per-token cache"""
+        info = self.term.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
+
+_BENCHMARK_FRAGMENTS = [
+    "We are looking for a {level} {role} to join our {team} team in {city}.",
+    "You will design, build and operate services that process millions of events per day.",
+    "Requirements: {years}+ years of experience with {skill_a}, {skill_b} and {skill_c}.",
+    "Experience with distributed systems, cloud infrastructure and CI/CD pipelines is a plus.",
+    "You'll collaborate with product managers, designers and data scientists on customer-facing features.",
+    "Nice to have: familiarity with {skill_b}, observability tooling and on-call rotations.",
+    "We offer competitive salary, equity, 401(k) matching and a flexible hybrid schedule.",
+    "Responsibilities include code reviews, mentoring engineers and writing technical designs.",
+    "Our stack: {skill_a}, {skill_c}, PostgreSQL, Redis, Kafka and Kubernetes on AWS.",
+    "Équipe internationale — travail à distance possible, déplacements occasionnels à Zürich.",
+]
+_BENCHMARK_VALUES = {
+    'level': ['Senior', 'Sr.', 'Staff', 'Junior', 'Lead', 'Principal'],
+    'role': ['Software Engineer', 'Data Engineer', 'Backend Developer', 'SRE', 'ML Engineer',
+             'Frontend Engineer', 'Data Scientist', 'Product Manager'],
+    'team': ['Payments', 'Platform', 'Growth', 'Search', 'Infrastructure', 'Analytics'],
+    'city': ['Austin, TX', 'New York, NY', 'San Francisco', 'Seattle', 'Remote'],
+    'years': ['2', '3', '5', '7'],
+    'skill_a': ['Python', 'Go', 'Java', 'TypeScript', 'Scala', 'C++'],
+    'skill_b': ['React', 'Spark', 'Terraform', 'Airflow', 'Node.js', 'GraphQL'],
+    'skill_c': ['SQL', 'Docker', 'gRPC', 'Snowflake', 'dbt', 'Kafka'],
+}
+
+
+def sample_job_descriptions(count: int = 2000, seed: int = 7) -> List[str]:
+    """Synthetic job descriptions with realistic vocabulary and some non-ASCII text"""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        values = {key: rng.choice(options) for key, options in _BENCHMARK_VALUES.items()}
+        fragments = rng.sample(_BENCHMARK_FRAGMENTS, rng.randint(5, len(_BENCHMARK_FRAGMENTS)))
+        documents.append(' '.join(fragment.format(**values) for fragment in fragments))
+    return documents
+
+
+def benchmark(analyzer: Analyzer = None, documents: List[str] = None, repeat: int = 3) -> Dict[str, Any]:
+    """Tokens/sec for the analyzer on a job-description corpus, cold and warm cache"""
+    analyzer = analyzer or Analyzer()
+    documents = documents or sample_job_descriptions()
+    tokens = sum(len(analyzer.tokens(document)) for document in documents)
+    analyzer.term.cache_clear()
+    started = time.perf_counter()
+    for document in documents:
+        analyzer.analyze(document)
+    cold = time.perf_counter() - started
+    warm_times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for document in documents:
+            analyzer.analyze(document)
+        warm_times.append(time.perf_counter() - started)
+    warm = min(warm_times)
+    uncached = Analyzer(analyzer.unicode_normalize, analyzer.lowercase, analyzer.stop_words,
+                        analyzer.stem, analyzer.protected, cache_size=0)
+    started = time.perf_counter()
+    for document in documents:
+        uncached.analyze(document)
+    baseline = time.perf_counter() - started
+    return {
+        'documents': len(documents),
+        'tokens': tokens,
+        'cold_tokens_per_second': int(tokens / cold) if cold else None,
+        'warm_tokens_per_second': int(tokens / warm) if warm else None,
+        'uncached_tokens_per_second': int(tokens / baseline) if baseline else None,
+        'cache': analyzer.cache_info(),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Analyzer throughput benchmark')
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--corpus', help='JSON Lines postings; their descriptions replace the synthetic corpus')
+    args = parser.parse_args()
+    corpus = None
+    if args.corpus:
+        with open(args.corpus) as handle:
+            corpus = [json.loads(line).get('description') or '' for line in handle if line.strip()]
+    print(json.dumps(benchmark(documents=corpus or sample_job_descriptions(args.documents)), indent=2))